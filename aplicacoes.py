@@ -5,23 +5,87 @@ Módulo com diferentes aplicações práticas do Algoritmo de Dijkstra
 Demonstra casos de uso reais além do caminho mínimo simples
 """
 
-from typing import Dict, List, Tuple, Optional
-from dijkstra import Dijkstra
-from grafo import Grafo
+import math
+import time
+from typing import Dict, List, Tuple, Optional, Union
+import numpy as np
+from dijkstra import Dijkstra, SEM_CAMINHO
+from grafo import Grafo, GrafoCSR
+from paralelo import intermediacao_paralela, matriz_todos_pares_paralela, resumo_distancias_paralelo
 
 
 class AplicacoesDijkstra:
     """Classe com diferentes aplicações práticas do algoritmo de Dijkstra."""
     
-    def __init__(self, grafo: Grafo):
+    def __init__(self, grafo: Union[Grafo, GrafoCSR], num_processos: int = 1):
         """
         Inicializa as aplicações com um grafo.
         
         Args:
-            grafo: Instância da classe Grafo
+            grafo: Instância da classe Grafo (ou sua forma compilada GrafoCSR)
+            num_processos: Processos usados nos cálculos entre todos os pares
+                (1 = no próprio processo; None = um por CPU)
         """
         self.grafo = grafo
         self.dijkstra = Dijkstra(grafo)
+        self.num_processos = num_processos
+        
+        # Matriz de distâncias entre todos os pares, calculada uma vez por versão do grafo
+        self._matriz_todos_pares: Optional[np.ndarray] = None
+        self._csr_todos_pares = None
+        # Resumo por vértice (soma, alcançáveis, excentricidade), também por versão do grafo
+        self._resumo_distancias: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._csr_resumo = None
+    
+    def matriz_todos_pares(self) -> np.ndarray:
+        """
+        Retorna a matriz V x V (int32) de distâncias mínimas entre todos os pares.
+        
+        É calculada na primeira chamada e reaproveitada até o grafo mudar (a
+        forma compilada do grafo muda a cada aresta adicionada).
+        
+        Returns:
+            Matriz com SEM_CAMINHO nos pares sem caminho
+        """
+        csr = self.grafo.compilar()
+        if self._matriz_todos_pares is None or self._csr_todos_pares is not csr:
+            if self.num_processos == 1:
+                self._matriz_todos_pares = self.dijkstra.matriz_todos_pares()
+            else:
+                self._matriz_todos_pares = matriz_todos_pares_paralela(self.grafo, self.num_processos,
+                                                                       fila=self.dijkstra.fila)
+            self._csr_todos_pares = csr
+        return self._matriz_todos_pares
+    
+    def resumo_distancias(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Retorna, para cada vértice, a soma das distâncias aos vértices que ele
+        alcança, quantos alcança (incluindo ele mesmo) e sua excentricidade.
+        
+        Vem da matriz entre todos os pares se ela já estiver calculada; senão é
+        calculado direto, sem guardar a matriz V x V. Fica guardado até o grafo mudar.
+        
+        Returns:
+            Tupla (somas, contagens, excentricidades), arrays indexados pelo vértice
+        """
+        csr = self.grafo.compilar()
+        if self._resumo_distancias is None or self._csr_resumo is not csr:
+            if self._matriz_todos_pares is not None and self._csr_todos_pares is csr:
+                matriz = self._matriz_todos_pares
+                alcancaveis = matriz != SEM_CAMINHO
+                self._resumo_distancias = (
+                    matriz.sum(axis=1, dtype=np.int64, where=alcancaveis),
+                    alcancaveis.sum(axis=1),
+                    # Cada vértice alcança a si mesmo (distância 0): o máximo ignora SEM_CAMINHO
+                    matriz.max(axis=1, initial=0).astype(np.int64),
+                )
+            elif self.num_processos == 1:
+                self._resumo_distancias = self.dijkstra.resumo_distancias()
+            else:
+                self._resumo_distancias = resumo_distancias_paralelo(self.grafo, self.num_processos,
+                                                                     fila=self.dijkstra.fila)
+            self._csr_resumo = csr
+        return self._resumo_distancias
     
     # ============================================
     # 1. ROTEAMENTO DE REDES (Network Routing)
@@ -47,10 +111,11 @@ class AplicacoesDijkstra:
             }
         
         # Calcular latência por hop
+        csr = self.grafo.compilar()
         hops = []
         for i in range(len(caminho) - 1):
             v1, v2 = caminho[i], caminho[i + 1]
-            peso = self.grafo.obter_peso(v1, v2)
+            peso = csr.obter_peso(v1, v2)
             hops.append({
                 'de': v1,
                 'para': v2,
@@ -69,26 +134,36 @@ class AplicacoesDijkstra:
     # ============================================
     # 2. ANÁLISE DE CENTRALIDADE (Centrality Analysis)
     # ============================================
-    def encontrar_vertice_mais_central(self) -> Dict:
+    def encontrar_vertice_mais_central(self, aproximado: bool = False, amostras: int = 64,
+                                       tempo_limite: Optional[float] = None, top_k: int = 10,
+                                       confianca: float = 0.95, semente: Optional[int] = None) -> Dict:
         """
         Encontra o vértice mais central do grafo.
         Centralidade = menor soma de distâncias para todos os outros vértices.
         
+        Args:
+            aproximado: Se True, estima as somas a partir de algumas origens
+                sorteadas (ver _estimar_centralidade) em vez de uma busca por vértice
+            amostras: Número de origens sorteadas (modo aproximado)
+            tempo_limite: Se informado, sorteia origens até esgotar este tempo
+                em segundos, em vez de usar um número fixo; a busca em andamento
+                sempre termina (modo aproximado)
+            top_k: Tamanho do ranking com intervalos de confiança (modo aproximado)
+            confianca: Nível de confiança dos intervalos (modo aproximado)
+            semente: Semente do sorteio das origens (modo aproximado)
+            
         Returns:
             Dicionário com informações do vértice mais central
         """
-        melhor_vertice = None
-        menor_soma = float('inf')
-        distancias_totais = {}
-        
-        for vertice in self.grafo.vertices:
-            distancias = self.dijkstra.obter_distancias_minimas(vertice)
-            soma = sum(distancias.values())
-            distancias_totais[vertice] = soma
-            
-            if soma < menor_soma:
-                menor_soma = soma
-                melhor_vertice = vertice
+        if aproximado:
+            return self._estimar_centralidade(amostras, tempo_limite, top_k, confianca, semente)
+        
+        # Soma das distâncias de cada vértice aos que ele alcança
+        somas, _, _ = self.resumo_distancias()
+        
+        melhor_vertice = int(np.argmin(somas)) if len(somas) else None
+        menor_soma = int(somas[melhor_vertice]) if len(somas) else float('inf')
+        distancias_totais = dict(enumerate(somas.tolist()))
         
         return {
             'vertice_central': melhor_vertice,
@@ -97,6 +172,89 @@ class AplicacoesDijkstra:
             'media_distancias': menor_soma / (self.grafo.num_vertices - 1) if self.grafo.num_vertices > 1 else 0
         }
     
+    def _estimar_centralidade(self, amostras: int, tempo_limite: Optional[float], top_k: int,
+                              confianca: float, semente: Optional[int]) -> Dict:
+        """
+        Estima a soma de distâncias de cada vértice por amostragem de origens
+        (método de Eppstein e Wang).
+        
+        Para k origens sorteadas no componente de v, a soma estimada é
+        |C| x média de d(origem, v). Pela desigualdade de Hoeffding, a média
+        erra no máximo D x sqrt(ln(2 / (1 - confianca)) / (2k)) com a
+        probabilidade pedida, onde D <= 2 x excentricidade de qualquer origem
+        limita as distâncias no componente. Se todas as origens do componente
+        forem sorteadas, a soma é exata. O intervalo da proximidade vem do da
+        soma: ((|C| - 1) / soma_sup, (|C| - 1) / soma_inf).
+        """
+        n = self.grafo.num_vertices
+        inicio = time.perf_counter()
+        ordem = np.random.default_rng(semente).permutation(n)
+        
+        somas = np.zeros(n, dtype=np.float64)
+        # Por vértice: origens que o alcançaram, tamanho do componente e limite do diâmetro
+        origens_por_vertice = np.zeros(n, dtype=np.int64)
+        tamanhos = np.zeros(n, dtype=np.int64)
+        limites_diametro = np.full(n, np.inf)
+        
+        num_amostras = 0
+        for origem in ordem.tolist():
+            if tempo_limite is not None:
+                if num_amostras and time.perf_counter() - inicio >= tempo_limite:
+                    break
+            elif num_amostras >= amostras:
+                break
+            
+            distancias = np.frombuffer(self.dijkstra.arvore_caminhos_minimos(origem).distancias, dtype=np.int64)
+            alcancados = np.flatnonzero(distancias >= 0)
+            somas[alcancados] += distancias[alcancados]
+            origens_por_vertice[alcancados] += 1
+            tamanhos[alcancados] = len(alcancados)
+            limites_diametro[alcancados] = np.minimum(limites_diametro[alcancados], 2 * distancias.max())
+            num_amostras += 1
+        
+        # Vértices de componentes sem nenhuma origem sorteada ficam sem estimativa
+        estimados = np.flatnonzero(origens_por_vertice > 0)
+        k = origens_por_vertice[estimados]
+        media = somas[estimados] / k
+        soma_estimada = tamanhos[estimados] * media
+        erro = np.sqrt(math.log(2 / (1 - confianca)) / (2 * k)) * limites_diametro[estimados]
+        # Componente com todas as origens sorteadas: soma exata
+        erro[k >= tamanhos[estimados]] = 0
+        margem = tamanhos[estimados] * erro
+        
+        ranking = []
+        for posicao in np.argsort(soma_estimada, kind='stable')[:top_k].tolist():
+            vertice = int(estimados[posicao])
+            tamanho = int(tamanhos[vertice])
+            soma = float(soma_estimada[posicao])
+            soma_inf, soma_sup = max(soma - float(margem[posicao]), 0.0), soma + float(margem[posicao])
+            ranking.append({
+                'vertice': vertice,
+                'soma_estimada': soma,
+                'intervalo_soma': (soma_inf, soma_sup),
+                # Proximidade (closeness) = outros vértices do componente / soma das distâncias
+                'proximidade_estimada': (tamanho - 1) / soma if soma > 0 else 0.0,
+                # Mesma confiança: a proximidade decresce com a soma, então os limites se invertem
+                'intervalo_proximidade': (
+                    (tamanho - 1) / soma_sup if soma_sup > 0 else 0.0,
+                    (tamanho - 1) / soma_inf if soma_inf > 0 else (float('inf') if tamanho > 1 else 0.0)
+                )
+            })
+        
+        melhor = ranking[0] if ranking else None
+        return {
+            'vertice_central': melhor['vertice'] if melhor else None,
+            'soma_distancias': melhor['soma_estimada'] if melhor else float('inf'),
+            'distancias_totais': dict(zip(estimados.tolist(), soma_estimada.tolist())),
+            'media_distancias': melhor['soma_estimada'] / (n - 1) if melhor and n > 1 else 0,
+            'ranking': ranking,
+            'amostras': num_amostras,
+            'confianca': confianca,
+            'vertices_sem_estimativa': n - len(estimados),
+            'tempo_segundos': time.perf_counter() - inicio,
+            'aproximado': True
+        }
+    
     # ============================================
     # 3. PLANEJAMENTO DE LOGÍSTICA (Logistics Planning)
     # ============================================
@@ -115,8 +273,11 @@ class AplicacoesDijkstra:
         rotas = {}
         custo_total = 0
         
+        # Uma única busca a partir do depósito atende todos os pontos de entrega
+        matriz = self.dijkstra.matriz_distancias([origem], destinos)
+        
         for destino in destinos:
-            caminho, custo = self.dijkstra.encontrar_caminho_minimo(origem, destino)
+            caminho, custo = matriz.caminho(origem, destino), matriz.distancia(origem, destino)
             if caminho:
                 rotas[destino] = {
                     'caminho': caminho,
@@ -176,13 +337,17 @@ class AplicacoesDijkstra:
         Calcula o custo mínimo para alcançar todos os vértices a partir de uma origem.
         Útil para planejamento de infraestrutura ou distribuição.
         
+        Uma única busca produz a árvore de caminhos mínimos; 'caminhos' é um
+        mapeamento que reconstrói cada caminho só quando ele é acessado.
+        
         Args:
             origem: Vértice de origem
             
         Returns:
             Dicionário com análise de custos e caminhos
         """
-        distancias = self.dijkstra.obter_distancias_minimas(origem)
+        arvore = self.dijkstra.arvore_caminhos_minimos(origem)
+        distancias = arvore.como_dicionario()
         
         if not distancias:
             return {
@@ -200,14 +365,6 @@ class AplicacoesDijkstra:
         mais_distante = max(distancias.items(), key=lambda x: x[1])
         mais_proximo = min((k, v) for k, v in distancias.items() if k != origem)
         
-        # Calcular caminhos mínimos para todos os vértices alcançáveis
-        caminhos = {}
-        for destino in distancias.keys():
-            if destino != origem:
-                caminho, _ = self.dijkstra.encontrar_caminho_minimo(origem, destino)
-                if caminho:
-                    caminhos[destino] = caminho
-        
         return {
             'origem': origem,
             'custo_total': custo_total,
@@ -222,60 +379,135 @@ class AplicacoesDijkstra:
                 'custo': mais_proximo[1]
             },
             'distancias': distancias,
-            'caminhos': caminhos
+            'caminhos': arvore.caminhos(),
+            'arvore': arvore
         }
     
     # ============================================
     # 6. ANÁLISE DE CONECTIVIDADE (Connectivity Analysis)
     # ============================================
-    def analisar_conectividade(self) -> Dict:
+    def analisar_conectividade(self, somente_resumo: bool = False) -> Dict:
         """
         Analisa a conectividade do grafo.
         Calcula distâncias médias, diâmetro, raio, etc.
         
+        Args:
+            somente_resumo: Se True, calcula só diâmetro, raio, centro e
+                periferia (exatos), com limites de excentricidade que costumam
+                precisar de poucas buscas em vez de uma por vértice
+                
         Returns:
             Dicionário com métricas de conectividade
         """
-        todas_distancias = []
-        distancias_por_vertice = {}
-        
-        for vertice in self.grafo.vertices:
-            distancias = self.dijkstra.obter_distancias_minimas(vertice)
-            soma = sum(distancias.values())
-            distancias_por_vertice[vertice] = {
-                'soma': soma,
-                'media': soma / len(distancias) if distancias else 0,
-                'maxima': max(distancias.values()) if distancias else 0
-            }
-            todas_distancias.extend(distancias.values())
-        
-        if not todas_distancias:
+        if self.grafo.num_vertices == 0:
             return {
                 'grafo_vazio': True
             }
         
+        if somente_resumo:
+            return self._resumo_excentricidades()
+        
+        # Métricas por vértice, considerando só os pares com caminho
+        somas, contagens, excentricidades = self.resumo_distancias()
+        
+        distancias_por_vertice = {
+            vertice: {'soma': soma, 'media': soma / contagem, 'maxima': maxima}
+            for vertice, (soma, contagem, maxima) in enumerate(zip(
+                somas.tolist(), contagens.tolist(), excentricidades.tolist()
+            ))
+        }
+        
         # Calcular métricas globais
-        distancia_maxima = max(todas_distancias)
-        distancia_minima = min(todas_distancias)
-        distancia_media = sum(todas_distancias) / len(todas_distancias)
+        distancia_maxima = int(excentricidades.max())
+        # A menor distância entre pares alcançáveis é a de cada vértice a si mesmo
+        distancia_minima = 0
+        distancia_media = int(somas.sum()) / int(contagens.sum())
         
         # Diâmetro = maior distância entre quaisquer dois vértices
         # Raio = menor excentricidade (menor distância máxima de um vértice)
-        excentricidades = [distancias_por_vertice[v]['maxima'] for v in self.grafo.vertices]
-        raio = min(excentricidades) if excentricidades else 0
+        raio = int(excentricidades.min())
         diametro = distancia_maxima
         
         return {
             'numero_vertices': self.grafo.num_vertices,
-            'numero_arestas': len(self.grafo.arestas),
+            'numero_arestas': self.grafo.num_arestas,
             'diametro': diametro,
             'raio': raio,
+            'centro': np.flatnonzero(excentricidades == raio).tolist(),
+            'periferia': np.flatnonzero(excentricidades == diametro).tolist(),
             'distancia_maxima': distancia_maxima,
             'distancia_minima': distancia_minima,
             'distancia_media': distancia_media,
             'distancias_por_vertice': distancias_por_vertice
         }
     
+    def _resumo_excentricidades(self) -> Dict:
+        """
+        Diâmetro, raio, centro e periferia exatos pelo método de limites de
+        Takes e Kosters (BoundingDiameters).
+        
+        Cada vértice tem um intervalo [inferior, superior] para sua
+        excentricidade. Uma busca a partir de v dá ecc(v) e, pela desigualdade
+        triangular, para todo w do mesmo componente:
+        max(ecc(v) - d(v, w), d(v, w)) <= ecc(w) <= ecc(v) + d(v, w).
+        Um vértice deixa de ser candidato quando sua excentricidade fica
+        conhecida ou quando os limites mostram que ele não pode estar nem no
+        centro nem na periferia. As buscas alternam entre o candidato de maior
+        limite superior e o de menor limite inferior.
+        
+        Returns:
+            Dicionário com as métricas e o número de buscas realizadas
+        """
+        n = self.grafo.num_vertices
+        csr = self.grafo.compilar()
+        graus = np.diff(np.frombuffer(csr.offsets, dtype=np.int64))
+        
+        inferior = np.zeros(n, dtype=np.int64)
+        # Vértices isolados têm excentricidade 0; os demais começam sem limite superior
+        superior = np.where(graus > 0, np.iinfo(np.int64).max, 0)
+        candidatos = superior > inferior
+        
+        buscas = 0
+        while candidatos.any():
+            indices = np.flatnonzero(candidatos)
+            if buscas % 2 == 0:
+                # Maior limite superior (desempate pelo maior grau)
+                v = int(indices[np.lexsort((-graus[indices], -superior[indices]))[0]])
+            else:
+                # Menor limite inferior (desempate pelo maior grau)
+                v = int(indices[np.lexsort((-graus[indices], inferior[indices]))[0]])
+            
+            arvore = self.dijkstra.arvore_caminhos_minimos(v)
+            buscas += 1
+            todas_distancias = np.frombuffer(arvore.distancias, dtype=np.int64)
+            alcancados = np.flatnonzero(todas_distancias >= 0)
+            distancias = todas_distancias[alcancados]
+            excentricidade = int(distancias.max())
+            
+            inferior[alcancados] = np.maximum(inferior[alcancados],
+                                              np.maximum(excentricidade - distancias, distancias))
+            superior[alcancados] = np.minimum(superior[alcancados], excentricidade + distancias)
+            
+            diametro_inferior = int(inferior.max())
+            raio_superior = int(superior.min())
+            candidatos &= (inferior != superior) & ((superior >= diametro_inferior) | (inferior <= raio_superior))
+        
+        # Sem candidatos, todo vértice do centro/periferia tem excentricidade exata
+        diametro = int(inferior.max())
+        raio = int(superior.min())
+        exatos = inferior == superior
+        
+        return {
+            'numero_vertices': n,
+            'numero_arestas': self.grafo.num_arestas,
+            'diametro': diametro,
+            'raio': raio,
+            'centro': np.flatnonzero(exatos & (superior == raio)).tolist(),
+            'periferia': np.flatnonzero(exatos & (inferior == diametro)).tolist(),
+            'buscas_realizadas': buscas,
+            'somente_resumo': True
+        }
+    
     # ============================================
     # 7. PLANEJAMENTO DE ROTAS MÚLTIPLAS (Multi-Route Planning)
     # ============================================
@@ -298,6 +530,9 @@ class AplicacoesDijkstra:
                 'custo_total': 0
             }
         
+        # Custos entre todos os pontos, com uma busca por ponto de partida
+        matriz = self.dijkstra.matriz_distancias([origem] + list(destinos), destinos)
+        
         if ordem_otima:
             # Tenta encontrar ordem que minimize custo total
             # Algoritmo simples: nearest neighbor
@@ -315,13 +550,13 @@ class AplicacoesDijkstra:
                     if destino in visitados:
                         continue
                     
-                    caminho, custo = self.dijkstra.encontrar_caminho_minimo(atual, destino)
-                    if caminho and custo < menor_custo:
+                    custo = matriz.distancia(atual, destino)
+                    if custo is not None and custo < menor_custo:
                         menor_custo = custo
                         melhor_destino = destino
                 
                 if melhor_destino is not None:
-                    caminho, custo = self.dijkstra.encontrar_caminho_minimo(atual, melhor_destino)
+                    caminho, custo = matriz.caminho(atual, melhor_destino), menor_custo
                     rotas.append({
                         'de': atual,
                         'para': melhor_destino,
@@ -348,7 +583,7 @@ class AplicacoesDijkstra:
             custo_total = 0
             
             for destino in destinos:
-                caminho, custo = self.dijkstra.encontrar_caminho_minimo(atual, destino)
+                caminho, custo = matriz.caminho(atual, destino), matriz.distancia(atual, destino)
                 if caminho:
                     rotas.append({
                         'de': atual,
@@ -365,4 +600,105 @@ class AplicacoesDijkstra:
                 'ordem_visita': [origem] + destinos,
                 'otimizado': False
             }
-
+    
+    # ============================================
+    # 8. CENTRALIDADE DE INTERMEDIAÇÃO (Betweenness Centrality)
+    # ============================================
+    def centralidade_intermediacao(self, amostras: Optional[int] = None, normalizado: bool = True,
+                                   top_k: int = 10, semente: Optional[int] = None) -> Dict:
+        """
+        Calcula a centralidade de intermediação (betweenness) de cada vértice:
+        a fração dos caminhos mínimos entre outros pares que passam por ele.
+        Identifica gargalos, como roteadores ou cruzamentos por onde passa
+        muito tráfego.
+        
+        Usa o algoritmo de Brandes (um Dijkstra por origem). Com amostras, só
+        as origens sorteadas são usadas e o resultado é escalado por V / amostras.
+        Se num_processos != 1, as origens são divididas entre processos. Os
+        pesos das arestas devem ser positivos (ver
+        Dijkstra.acumular_intermediacao); com peso 0 é gerado ValueError.
+        
+        Args:
+            amostras: Número de origens sorteadas (None = todas, resultado exato)
+            normalizado: Se True, divide pelo número de pares (V-1)(V-2)/2
+            top_k: Tamanho do ranking
+            semente: Semente do sorteio das origens
+            
+        Returns:
+            Dicionário com a intermediação de cada vértice e o ranking
+        """
+        n = self.grafo.num_vertices
+        if amostras is None or amostras >= n:
+            origens = list(range(n))
+        else:
+            origens = np.random.default_rng(semente).choice(n, size=amostras, replace=False).tolist()
+        
+        if self.num_processos == 1:
+            dependencias = self.dijkstra.acumular_intermediacao(origens)
+        else:
+            dependencias = intermediacao_paralela(self.grafo, origens, self.num_processos,
+                                                  fila=self.dijkstra.fila)
+        
+        # Grafo não direcionado: cada par é contado a partir das suas duas pontas
+        escala = 0.5
+        if normalizado and n > 2:
+            escala = 1 / ((n - 1) * (n - 2))
+        if origens and len(origens) < n:
+            escala *= n / len(origens)
+        intermediacao = dependencias * escala
+        
+        ordem = np.argsort(-intermediacao, kind='stable')[:top_k].tolist()
+        return {
+            'intermediacao': dict(enumerate(intermediacao.tolist())),
+            'ranking': [(v, float(intermediacao[v])) for v in ordem],
+            'vertice_mais_intermediario': ordem[0] if ordem else None,
+            'amostras': len(origens),
+            'exato': len(origens) == n
+        }
+    
+    # ============================================
+    # 9. ATRIBUIÇÃO DE DEPÓSITOS (Facility Assignment)
+    # ============================================
+    def atribuir_depositos(self, depositos: List[int]) -> Dict:
+        """
+        Atribui cada ponto da rede ao depósito mais próximo (partição de
+        Voronoi do grafo). Os pesos representam custo de transporte.
+        
+        Usa um único Dijkstra com todos os depósitos como fontes, em vez de um
+        Dijkstra por depósito.
+        
+        Args:
+            depositos: Vértices onde ficam os depósitos
+            
+        Returns:
+            Dicionário com o depósito e o custo de cada ponto, a região de cada
+            depósito e os pontos que nenhum depósito alcança
+        """
+        distancias, rotulos = self.dijkstra.buscar_multiplas_fontes(depositos)
+        depositos = list(dict.fromkeys(v for v in depositos if 0 <= v < self.grafo.num_vertices))
+        
+        atendidos = np.flatnonzero(rotulos != SEM_CAMINHO)
+        regioes: Dict[int, List[int]] = {d: [] for d in depositos}
+        for v, deposito in zip(atendidos.tolist(), rotulos[atendidos].tolist()):
+            regioes[deposito].append(v)
+        
+        resumo = {}
+        for deposito, vertices in regioes.items():
+            custos = distancias[vertices]
+            resumo[deposito] = {
+                'pontos_atendidos': len(vertices),
+                'custo_total': int(custos.sum()),
+                'custo_medio': float(custos.mean()) if len(vertices) else 0,
+                'maior_custo': int(custos.max(initial=0))
+            }
+        
+        return {
+            'depositos': depositos,
+            'deposito_mais_proximo': dict(zip(atendidos.tolist(), rotulos[atendidos].tolist())),
+            'custos': dict(zip(atendidos.tolist(), distancias[atendidos].tolist())),
+            'regioes': regioes,
+            'resumo': resumo,
+            'nao_atendidos': np.flatnonzero(rotulos == SEM_CAMINHO).tolist(),
+            'custo_total': int(distancias[atendidos].sum()),
+            'maior_custo': int(distancias[atendidos].max(initial=0))
+        }
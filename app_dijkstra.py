@@ -7,7 +7,6 @@ Inclui múltiplas aplicações práticas do algoritmo
 """
 
 import streamlit as st
-import random
 from grafo import Grafo
 from dijkstra import Dijkstra
 from visualizacao import VisualizadorGrafo
@@ -89,10 +88,8 @@ with st.sidebar:
 
 # Inicializar ou regenerar grafo
 if 'grafo' not in st.session_state or st.session_state.get('gerar_novo', False):
-    if seed > 0:
-        random.seed(seed)
-    
-    grafo = Grafo(num_vertices, densidade, peso_min, peso_max)
+    # Semente própria do grafo (0 = aleatório); não altera o estado global de random
+    grafo = Grafo(num_vertices, densidade, peso_min, peso_max, semente=seed if seed > 0 else None)
     grafo.garantir_conectividade()
     
     st.session_state['grafo'] = grafo
@@ -269,8 +266,22 @@ with aba3:
     st.header("⭐ Análise de Centralidade")
     st.markdown("Encontra o vértice mais central do grafo (menor soma de distâncias para todos os outros).")
     
+    aproximado = st.checkbox(
+        "Estimar por amostragem (grafos grandes)",
+        key="aba3_aproximado",
+        help="Calcula as distâncias só a partir de algumas origens sorteadas e mostra intervalos de confiança"
+    )
+    amostras = st.number_input(
+        "Número de origens sorteadas",
+        min_value=1,
+        max_value=max(grafo.num_vertices, 1),
+        value=min(8, max(grafo.num_vertices, 1)),
+        key="aba3_amostras",
+        disabled=not aproximado
+    )
+    
     if st.button("🔍 Encontrar Vértice Mais Central", key="aba3_btn"):
-        resultado = aplicacoes.encontrar_vertice_mais_central()
+        resultado = aplicacoes.encontrar_vertice_mais_central(aproximado=aproximado, amostras=int(amostras))
         st.session_state['aba3_resultado'] = resultado
         st.rerun()
     
@@ -285,10 +296,19 @@ with aba3:
             st.metric("Distância Média", f"{resultado['media_distancias']:.2f}")
             
             st.write("**Ranking de centralidade (menor = mais central):**")
-            ranking = sorted(resultado['distancias_totais'].items(), key=lambda x: x[1])
-            for i, (vertice, soma) in enumerate(ranking[:10], 1):
-                marcador = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-                st.write(f"{marcador} Vértice {vertice}: {soma}")
+            if resultado.get('aproximado'):
+                st.caption(f"Estimativa com {resultado['amostras']} origens sorteadas; "
+                           f"intervalos com {resultado['confianca']:.0%} de confiança.")
+                for i, item in enumerate(resultado['ranking'], 1):
+                    marcador = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+                    minimo, maximo = item['intervalo_soma']
+                    st.write(f"{marcador} Vértice {item['vertice']}: ~{item['soma_estimada']:.0f} "
+                             f"({minimo:.0f} a {maximo:.0f})")
+            else:
+                ranking = sorted(resultado['distancias_totais'].items(), key=lambda x: x[1])
+                for i, (vertice, soma) in enumerate(ranking[:10], 1):
+                    marcador = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+                    st.write(f"{marcador} Vértice {vertice}: {soma}")
         
         with col2:
             fig, ax = plt.subplots(figsize=(10, 8))
@@ -381,12 +401,38 @@ with aba5:
     st.header("📊 Análise de Conectividade")
     st.markdown("Analisa métricas globais de conectividade do grafo: diâmetro, raio, distâncias médias, etc.")
     
+    somente_resumo = st.checkbox(
+        "Somente diâmetro, raio, centro e periferia (rápido)",
+        key="aba5_resumo",
+        help="Usa limites de excentricidade: poucas buscas em vez de uma por vértice"
+    )
+    
     if st.button("📈 Analisar Conectividade", key="aba5_btn"):
-        resultado = aplicacoes.analisar_conectividade()
+        resultado = aplicacoes.analisar_conectividade(somente_resumo=somente_resumo)
         st.session_state['aba5_resultado'] = resultado
         st.rerun()
     
-    if 'aba5_resultado' in st.session_state:
+    if 'aba5_resultado' in st.session_state and st.session_state['aba5_resultado'].get('somente_resumo'):
+        resultado = st.session_state['aba5_resultado']
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Diâmetro", resultado['diametro'])
+        
+        with col2:
+            st.metric("Raio", resultado['raio'])
+        
+        with col3:
+            st.metric("Vértices no Centro", len(resultado['centro']))
+        
+        with col4:
+            st.metric("Buscas Realizadas", f"{resultado['buscas_realizadas']} de {resultado['numero_vertices']}")
+        
+        st.write(f"**Centro (excentricidade = raio):** {', '.join(map(str, resultado['centro']))}")
+        st.write(f"**Periferia (excentricidade = diâmetro):** {', '.join(map(str, resultado['periferia']))}")
+    
+    elif 'aba5_resultado' in st.session_state:
         resultado = st.session_state['aba5_resultado']
         
         col1, col2, col3, col4 = st.columns(4)
@@ -492,16 +538,16 @@ with aba6:
                     st.warning("Por favor, preencha ambos os endereços!")
                 else:
                     with st.spinner("Geocodificando endereços e calculando rota..."):
-                        # Geocodificar origem
-                        coords_origem = mapa_real.geocodificar_endereco(endereco_origem)
+                        # Geocodificar origem e destino ao mesmo tempo
+                        coords_origem, coords_destino = mapa_real.geocodificar_enderecos(
+                            [endereco_origem, endereco_destino]
+                        )
                         if not coords_origem:
                             st.error(f"Não foi possível encontrar o endereço de origem: {endereco_origem}")
                         else:
                             mapa_real.coordenadas_origem = coords_origem
                             no_origem = mapa_real.encontrar_no_mais_proximo(coords_origem[0], coords_origem[1])
                             
-                            # Geocodificar destino
-                            coords_destino = mapa_real.geocodificar_endereco(endereco_destino)
                             if not coords_destino:
                                 st.error(f"Não foi possível encontrar o endereço de destino: {endereco_destino}")
                             else:
@@ -509,18 +555,33 @@ with aba6:
                                 no_destino = mapa_real.encontrar_no_mais_proximo(coords_destino[0], coords_destino[1])
                                 
                                 if no_origem and no_destino:
-                                    # Calcular rota com Dijkstra
-                                    caminho, distancia_metros = mapa_real.dijkstra_ruas(no_origem, no_destino)
+                                    # Avisa quando o ponto cai em um trecho isolado da malha viária
+                                    avisos = []
+                                    for rotulo, no in (("origem", no_origem), ("destino", no_destino)):
+                                        if mapa_real.no_em_fragmento_isolado(no):
+                                            avisos.append(
+                                                f"⚠️ O ponto de {rotulo} ficou em um trecho isolado da malha viária "
+                                                f"({mapa_real.tamanho_componente(no)} nós). Tente um endereço próximo a uma via principal."
+                                            )
+                                    
+                                    # Calcular rota (A*: Dijkstra guiado pela distância até o destino)
+                                    caminho, distancia_metros = mapa_real.dijkstra_ruas(no_origem, no_destino, metodo='astar')
                                     
                                     if caminho:
                                         st.session_state['mapa_caminho'] = caminho
                                         st.session_state['mapa_distancia'] = distancia_metros
                                         st.session_state['mapa_no_origem'] = no_origem
                                         st.session_state['mapa_no_destino'] = no_destino
+                                        st.session_state['mapa_avisos'] = avisos
                                         st.success("✅ Rota calculada com sucesso!")
                                         st.rerun()
                                     else:
-                                        st.error("❌ Não foi possível encontrar uma rota entre os endereços.")
+                                        for aviso in avisos:
+                                            st.warning(aviso)
+                                        if not mapa_real.pode_existir_caminho(no_origem, no_destino):
+                                            st.error("❌ Origem e destino estão em partes desconectadas da malha viária.")
+                                        else:
+                                            st.error("❌ Não foi possível encontrar uma rota entre os endereços.")
                                 else:
                                     st.error("❌ Não foi possível encontrar os pontos no mapa.")
             
@@ -528,6 +589,8 @@ with aba6:
             if 'mapa_caminho' in st.session_state:
                 distancia_km = st.session_state['mapa_distancia'] / 1000
                 st.success(f"✅ Rota encontrada!")
+                for aviso in st.session_state.get('mapa_avisos', []):
+                    st.warning(aviso)
                 st.metric("Distância Total", f"{distancia_km:.2f} km")
                 st.metric("Distância em Metros", f"{st.session_state['mapa_distancia']:.0f} m")
                 st.info(f"**Número de segmentos:** {len(st.session_state['mapa_caminho']) - 1}")
@@ -538,11 +601,7 @@ with aba6:
                 for i in range(len(caminho) - 1):
                     no_atual = caminho[i]
                     no_prox = caminho[i+1]
-                    aresta_data = mapa_real.grafo_ruas.get_edge_data(no_atual, no_prox)
-                    peso = None
-                    if aresta_data:
-                        primeiro_edge = list(aresta_data.values())[0]
-                        peso = primeiro_edge.get('length', None)
+                    peso = mapa_real.comprimento_rua(no_atual, no_prox)
                     st.write(f"{no_atual} → {no_prox} | Distância: {peso:.1f} m" if peso else f"{no_atual} → {no_prox}")
 
                 # Rotas alternativas
@@ -558,11 +617,7 @@ with aba6:
                             for i in range(len(alt_caminho) - 1):
                                 no_atual = alt_caminho[i]
                                 no_prox = alt_caminho[i+1]
-                                aresta_data = mapa_real.grafo_ruas.get_edge_data(no_atual, no_prox)
-                                peso = None
-                                if aresta_data:
-                                    primeiro_edge = list(aresta_data.values())[0]
-                                    peso = primeiro_edge.get('length', None)
+                                peso = mapa_real.comprimento_rua(no_atual, no_prox)
                                 st.write(f"{no_atual} → {no_prox} | Distância: {peso:.1f} m" if peso else f"{no_atual} → {no_prox}")
 
                 # Explicação da escolha
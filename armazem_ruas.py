@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Armazenamento em disco do grafo de ruas
+Guarda nós, coordenadas e ruas em arrays binários (.npy), recarregados por
+mapeamento de memória sem baixar nem reprocessar o OpenStreetMap
+"""
+
+import json
+import math
+import os
+from typing import Optional
+
+import networkx as nx
+import numpy as np
+
+# Versão do formato; arquivos de outra versão são ignorados (e baixados de novo)
+VERSAO_FORMATO = 1
+
+# Arrays salvos, um arquivo .npy cada
+ARRAYS = ('ids', 'lats', 'lons', 'offsets', 'destinos', 'comprimentos')
+
+
+class GrafoRuasArmazenado:
+    """
+    Grafo de ruas em arrays planos, na forma CSR.
+    
+    As ruas de cada nó (pelo índice interno, na ordem dos nós do grafo) ficam
+    em destinos[offsets[i]:offsets[i + 1]], inclusive as paralelas, com o
+    comprimento em metros (NaN quando o OSM não informa). Só são guardados os
+    atributos usados no roteamento: coordenadas dos nós e comprimento das ruas.
+    """
+    
+    def __init__(self, ids: np.ndarray, lats: np.ndarray, lons: np.ndarray, offsets: np.ndarray,
+                 destinos: np.ndarray, comprimentos: np.ndarray, crs: str = 'epsg:4326'):
+        """
+        Inicializa a partir de arrays já montados.
+        
+        Args:
+            ids: ID OSM de cada nó (int64), pelo índice interno
+            lats: Latitude de cada nó (NaN se não houver)
+            lons: Longitude de cada nó (NaN se não houver)
+            offsets: Array com num_nos + 1 posições de início das ruas de cada nó
+            destinos: Índice interno do nó de chegada de cada rua (int32)
+            comprimentos: Comprimento de cada rua em metros (NaN se não houver)
+            crs: Sistema de coordenadas do grafo (atributo 'crs' do OSMnx)
+        """
+        self.ids = ids
+        self.lats = lats
+        self.lons = lons
+        self.offsets = offsets
+        self.destinos = destinos
+        self.comprimentos = comprimentos
+        self.crs = crs
+    
+    @property
+    def num_nos(self) -> int:
+        """Número de nós."""
+        return len(self.ids)
+    
+    @property
+    def num_ruas(self) -> int:
+        """Número de ruas (arestas dirigidas, contando as paralelas)."""
+        return len(self.destinos)
+    
+    # ============================================
+    # CONVERSÃO
+    # ============================================
+    @classmethod
+    def de_multidigrafo(cls, grafo: nx.MultiDiGraph) -> 'GrafoRuasArmazenado':
+        """
+        Converte o MultiDiGraph do OSMnx para arrays.
+        
+        Args:
+            grafo: Grafo de ruas
+            
+        Returns:
+            Nova instância de GrafoRuasArmazenado
+        """
+        ids = np.fromiter(grafo.nodes(), dtype=np.int64, count=grafo.number_of_nodes())
+        indice = {no: i for i, no in enumerate(ids.tolist())}
+        coordenadas = grafo.nodes
+        lats = np.array([coordenadas[no].get('y', np.nan) for no in indice], dtype=np.float64)
+        lons = np.array([coordenadas[no].get('x', np.nan) for no in indice], dtype=np.float64)
+        
+        # Ruas agrupadas pelo nó de saída, na ordem dos nós e da adjacência de cada um
+        origens, destinos, comprimentos = [], [], []
+        for u, v, comprimento in grafo.edges(data='length'):
+            origens.append(indice[u])
+            destinos.append(indice[v])
+            comprimentos.append(np.nan if comprimento is None else comprimento)
+        
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(np.array(origens, dtype=np.int64), minlength=len(ids)))
+        
+        return cls(ids, lats, lons, offsets, np.array(destinos, dtype=np.int32),
+                   np.array(comprimentos, dtype=np.float64), crs=str(grafo.graph.get('crs', 'epsg:4326')))
+    
+    def para_multidigrafo(self) -> nx.MultiDiGraph:
+        """
+        Monta o MultiDiGraph equivalente (coordenadas 'y'/'x' e 'length' das ruas).
+        
+        Returns:
+            Grafo de ruas no formato do OSMnx
+        """
+        grafo = nx.MultiDiGraph(crs=self.crs)
+        ids = self.ids.tolist()
+        grafo.add_nodes_from((no, {'y': y, 'x': x}) for no, y, x in zip(ids, self.lats.tolist(), self.lons.tolist()))
+        
+        origens = np.repeat(np.arange(self.num_nos), np.diff(self.offsets)).tolist()
+        grafo.add_edges_from(
+            (ids[u], ids[v], {} if math.isnan(comprimento) else {'length': comprimento})
+            for u, v, comprimento in zip(origens, self.destinos.tolist(), self.comprimentos.tolist())
+        )
+        return grafo
+    
+    # ============================================
+    # DISCO
+    # ============================================
+    def salvar(self, diretorio: str) -> None:
+        """
+        Salva os arrays em diretorio (um .npy por array e um meta.json).
+        
+        O meta.json é escrito por último: um salvamento interrompido nunca é
+        lido como válido.
+        
+        Args:
+            diretorio: Pasta de destino (criada se não existir)
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        caminho_meta = os.path.join(diretorio, 'meta.json')
+        if os.path.exists(caminho_meta):
+            os.remove(caminho_meta)
+        
+        for nome in ARRAYS:
+            np.save(os.path.join(diretorio, f"{nome}.npy"), getattr(self, nome))
+        
+        with open(caminho_meta, 'w', encoding='utf-8') as arquivo:
+            json.dump({'versao_formato': VERSAO_FORMATO, 'crs': self.crs,
+                       'num_nos': self.num_nos, 'num_ruas': self.num_ruas}, arquivo)
+    
+    @classmethod
+    def carregar(cls, diretorio: str) -> Optional['GrafoRuasArmazenado']:
+        """
+        Abre um grafo salvo com salvar(), mapeando os arrays em memória
+        (somente leitura; os dados só são lidos do disco quando usados).
+        
+        Args:
+            diretorio: Pasta do grafo salvo
+            
+        Returns:
+            Instância de GrafoRuasArmazenado, ou None se não houver grafo
+            salvo completo nessa versão do formato
+        """
+        caminho_meta = os.path.join(diretorio, 'meta.json')
+        if not os.path.exists(caminho_meta):
+            return None
+        
+        with open(caminho_meta, encoding='utf-8') as arquivo:
+            meta = json.load(arquivo)
+        if meta.get('versao_formato') != VERSAO_FORMATO:
+            return None
+        
+        arrays = {nome: np.load(os.path.join(diretorio, f"{nome}.npy"), mmap_mode='r') for nome in ARRAYS}
+        if len(arrays['ids']) != meta['num_nos'] or len(arrays['destinos']) != meta['num_ruas']:
+            return None
+        
+        return cls(crs=meta['crs'], **arrays)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark das filas de prioridade do Dijkstra
+Compara o heap binário com remoção preguiçosa e o heap d-ário indexado
+(diminuição de chave) em grafos de densidade crescente
+
+Uso: python benchmark_filas.py [--vertices 600] [--buscas 10] [--peso-max 100000]
+"""
+
+import argparse
+import time
+from typing import List
+
+from dijkstra import Dijkstra
+from filas import criar_fila
+from grafo import Grafo, GrafoCSR
+
+DENSIDADES = (0.005, 0.02, 0.05, 0.1, 0.3, 0.5, 0.8)
+FILAS = ('heap', 'indexado')
+
+
+def pico_da_fila(csr: GrafoCSR, tipo: str, origem: int) -> int:
+    """
+    Executa um Dijkstra completo e retorna o maior tamanho que a fila atingiu.
+    
+    Args:
+        csr: Grafo compilado
+        tipo: Tipo de fila (ver filas.criar_fila)
+        origem: Vértice de partida
+        
+    Returns:
+        Maior número de entradas simultâneas na fila
+    """
+    infinito = float('inf')
+    distancias = [infinito] * csr.num_vertices
+    fechado = [False] * csr.num_vertices
+    distancias[origem] = 0
+    
+    fila = criar_fila(tipo, max(csr.pesos, default=0))
+    fila.inserir(0, origem)
+    pico = 1
+    
+    while len(fila):
+        dist_atual, vertice = fila.remover_minimo()
+        if fechado[vertice]:
+            continue
+        fechado[vertice] = True
+        
+        for i in range(csr.offsets[vertice], csr.offsets[vertice + 1]):
+            vizinho = csr.vizinhos[i]
+            nova_distancia = dist_atual + csr.pesos[i]
+            if nova_distancia < distancias[vizinho]:
+                distancias[vizinho] = nova_distancia
+                fila.inserir(nova_distancia, vizinho)
+                pico = max(pico, len(fila))
+    
+    return pico
+
+
+def medir(grafo: Grafo, tipo: str, origens: List[int]) -> float:
+    """Tempo médio, em milissegundos, de um Dijkstra completo com a fila dada."""
+    dijkstra = Dijkstra(grafo, fila=tipo)
+    inicio = time.perf_counter()
+    for origem in origens:
+        dijkstra.obter_distancias_minimas(origem)
+    return (time.perf_counter() - inicio) / len(origens) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara filas de prioridade do Dijkstra por densidade")
+    parser.add_argument('--vertices', type=int, default=600, help="Número de vértices dos grafos")
+    parser.add_argument('--buscas', type=int, default=10, help="Buscas completas por medição")
+    parser.add_argument('--peso-max', type=int, default=100000, help="Maior peso de aresta")
+    parser.add_argument('--semente', type=int, default=1, help="Semente dos grafos")
+    args = parser.parse_args()
+    
+    n = args.vertices
+    origens = list(range(0, n, max(1, n // args.buscas)))[:args.buscas]
+    
+    print(f"{n} vértices, pesos em [1, {args.peso_max}], {len(origens)} buscas por medição")
+    print(f"{'densidade':>9} {'arestas':>8} | " + " | ".join(f"{f:>8} ms  pico" for f in FILAS))
+    
+    for densidade in DENSIDADES:
+        grafo = Grafo(n, densidade, peso_max=args.peso_max, gerador='numpy', semente=args.semente)
+        csr = grafo.compilar()
+        colunas = []
+        for tipo in FILAS:
+            tempo = medir(grafo, tipo, origens)
+            pico = pico_da_fila(csr, tipo, origens[0])
+            colunas.append(f"{tempo:11.1f} {pico:5d}")
+        print(f"{densidade:9.3f} {len(csr.vizinhos) // 2:8d} | " + " | ".join(colunas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Contraction Hierarchies para o grafo de ruas
+Pré-processa um grafo dirigido estático (ordem dos nós + atalhos) para
+responder consultas de caminho mínimo com buscas bidirecionais curtas
+"""
+
+import hashlib
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class HierarquiaContracao:
+    """
+    Hierarquia de contração de um grafo dirigido com pesos não negativos.
+    
+    Os nós são contraídos um a um (do menos ao mais importante). Ao contrair v,
+    cada par u -> v -> w que não tenha caminho alternativo de mesmo custo vira
+    um atalho u -> w, lembrando v como nó do meio. Na consulta, a busca direta
+    só sobe de nível a partir da origem e a reversa só sobe a partir do destino;
+    o caminho mínimo passa pelo nó mais alto, onde as duas se encontram.
+    """
+    
+    def __init__(self, ids: np.ndarray, nivel: np.ndarray,
+                 acima_offsets: np.ndarray, acima_destinos: np.ndarray, acima_pesos: np.ndarray,
+                 abaixo_offsets: np.ndarray, abaixo_destinos: np.ndarray, abaixo_pesos: np.ndarray,
+                 atalhos_origem: np.ndarray, atalhos_destino: np.ndarray, atalhos_meio: np.ndarray,
+                 assinatura: str = ''):
+        """
+        Inicializa a hierarquia a partir dos arrays já calculados.
+        
+        Args:
+            ids: ID original (OSM) de cada nó, pelo índice interno
+            nivel: Posição de cada nó na ordem de contração
+            acima_*: CSR das arestas u -> x com nivel[x] > nivel[u] (busca direta)
+            abaixo_*: CSR das arestas x -> u com nivel[x] > nivel[u], guardadas
+                em u (busca reversa, que sobe a partir do destino)
+            atalhos_*: Atalhos (origem, destino) e o nó do meio de cada um
+            assinatura: Identificação do grafo de origem (ver assinatura_arestas)
+        """
+        self.ids = ids
+        self.nivel = nivel
+        self.assinatura = assinatura
+        self._arrays = {
+            'acima_offsets': acima_offsets, 'acima_destinos': acima_destinos, 'acima_pesos': acima_pesos,
+            'abaixo_offsets': abaixo_offsets, 'abaixo_destinos': abaixo_destinos, 'abaixo_pesos': abaixo_pesos,
+            'atalhos_origem': atalhos_origem, 'atalhos_destino': atalhos_destino, 'atalhos_meio': atalhos_meio,
+        }
+        
+        # Estruturas Python usadas na consulta (listas são mais rápidas que arrays no laço)
+        self._indice: Dict[int, int] = {int(no): i for i, no in enumerate(ids.tolist())}
+        self._ids: List[int] = ids.tolist()
+        self._acima = self._listas_adjacencia(acima_offsets, acima_destinos, acima_pesos)
+        self._abaixo = self._listas_adjacencia(abaixo_offsets, abaixo_destinos, abaixo_pesos)
+        self._meio: Dict[Tuple[int, int], int] = dict(zip(
+            zip(atalhos_origem.tolist(), atalhos_destino.tolist()), atalhos_meio.tolist()
+        ))
+    
+    @staticmethod
+    def _listas_adjacencia(offsets: np.ndarray, destinos: np.ndarray,
+                           pesos: np.ndarray) -> List[List[Tuple[int, float]]]:
+        """Converte uma estrutura CSR em listas de (vizinho, peso) por nó."""
+        lista_offsets, lista_destinos, lista_pesos = offsets.tolist(), destinos.tolist(), pesos.tolist()
+        return [
+            list(zip(lista_destinos[lista_offsets[i]:lista_offsets[i + 1]],
+                     lista_pesos[lista_offsets[i]:lista_offsets[i + 1]]))
+            for i in range(len(lista_offsets) - 1)
+        ]
+    
+    @property
+    def num_nos(self) -> int:
+        """Número de nós da hierarquia."""
+        return len(self._ids)
+    
+    @property
+    def num_atalhos(self) -> int:
+        """Número de atalhos criados na contração."""
+        return len(self._meio)
+    
+    # ============================================
+    # PRÉ-PROCESSAMENTO
+    # ============================================
+    @classmethod
+    def construir(cls, ids: List[int], arestas: Iterable[Tuple[int, int, float]],
+                  limite_testemunha: int = 60, assinatura: str = '') -> 'HierarquiaContracao':
+        """
+        Contrai o grafo e monta a hierarquia.
+        
+        Args:
+            ids: IDs originais dos nós
+            arestas: Arestas dirigidas (u, v, peso) usando os IDs originais
+            limite_testemunha: Máximo de nós resolvidos em cada busca por caminho
+                alternativo; se estourar, o atalho é criado por segurança
+            assinatura: Identificação do grafo de origem
+        
+        Returns:
+            Nova instância de HierarquiaContracao
+        """
+        indice = {no: i for i, no in enumerate(ids)}
+        n = len(ids)
+        
+        # Grafo restante (só nós ainda não contraídos), alterado a cada contração
+        saida: List[Dict[int, float]] = [{} for _ in range(n)]
+        entrada: List[Dict[int, float]] = [{} for _ in range(n)]
+        
+        # Mantém só a aresta mais curta entre cada par de nós
+        for u, v, peso in arestas:
+            iu, iv = indice[u], indice[v]
+            if iu == iv:
+                continue
+            if peso < saida[iu].get(iv, float('inf')):
+                saida[iu][iv] = peso
+                entrada[iv][iu] = peso
+        
+        acima: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+        abaixo: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+        nivel = [0] * n
+        meio: Dict[Tuple[int, int], int] = {}
+        vizinhos_contraidos = [0] * n
+        profundidade = [0] * n
+        
+        def prioridade(v: int) -> int:
+            # Diferença de arestas + vizinhos já contraídos + profundidade na hierarquia
+            atalhos = cls._atalhos_necessarios(v, saida, entrada, limite_testemunha)
+            diferenca = len(atalhos) - len(entrada[v]) - len(saida[v])
+            return 2 * diferenca + 2 * vizinhos_contraidos[v] + profundidade[v]
+        
+        prioridades = [prioridade(v) for v in range(n)]
+        fila = [(p, v) for v, p in enumerate(prioridades)]
+        heapq.heapify(fila)
+        contraido = bytearray(n)
+        ordem = 0
+        
+        while fila:
+            chave, v = heapq.heappop(fila)
+            if contraido[v] or chave != prioridades[v]:
+                continue
+            
+            # Atualização preguiçosa: se a prioridade piorou, volta para a fila
+            atual = prioridade(v)
+            if fila and atual > fila[0][0]:
+                prioridades[v] = atual
+                heapq.heappush(fila, (atual, v))
+                continue
+            
+            for u, x, custo in cls._atalhos_necessarios(v, saida, entrada, limite_testemunha):
+                if custo < saida[u].get(x, float('inf')):
+                    saida[u][x] = custo
+                    entrada[x][u] = custo
+                    meio[(u, x)] = v
+            
+            # As arestas de v com o grafo restante sobem de nível: v -> x para a
+            # busca direta e u -> v (guardada em v) para a busca reversa
+            acima[v] = list(saida[v].items())
+            abaixo[v] = list(entrada[v].items())
+            contraido[v] = 1
+            nivel[v] = ordem
+            ordem += 1
+            
+            # Remove v do grafo restante e atualiza a prioridade dos vizinhos
+            vizinhos = set(saida[v]) | set(entrada[v])
+            for x in saida[v]:
+                del entrada[x][v]
+            for u in entrada[v]:
+                del saida[u][v]
+            saida[v], entrada[v] = {}, {}
+            
+            for w in vizinhos:
+                vizinhos_contraidos[w] += 1
+                profundidade[w] = max(profundidade[w], profundidade[v] + 1)
+        
+        acima_csr = cls._para_csr(acima)
+        abaixo_csr = cls._para_csr(abaixo)
+        chaves = list(meio.keys())
+        return cls(
+            np.array(ids, dtype=np.int64), np.array(nivel, dtype=np.int32),
+            *acima_csr, *abaixo_csr,
+            np.array([u for u, _ in chaves], dtype=np.int32),
+            np.array([x for _, x in chaves], dtype=np.int32),
+            np.array([meio[c] for c in chaves], dtype=np.int32),
+            assinatura=assinatura
+        )
+    
+    @staticmethod
+    def _atalhos_necessarios(v: int, saida: List[Dict[int, float]], entrada: List[Dict[int, float]],
+                             limite_testemunha: int) -> List[Tuple[int, int, float]]:
+        """
+        Lista os atalhos (u, w, custo) que a contração de v exigiria.
+        
+        Um par u -> v -> w dispensa atalho se uma busca local a partir de u,
+        sem passar por v, achar caminho até w de custo menor ou igual.
+        """
+        entradas = list(entrada[v].items())
+        saidas = list(saida[v].items())
+        if not entradas or not saidas:
+            return []
+        
+        maior_saida = max(p for _, p in saidas)
+        alvos = set(saida[v])
+        atalhos = []
+        for u, peso_uv in entradas:
+            limite_custo = peso_uv + maior_saida
+            pendentes = len(alvos) - (u in alvos)
+            
+            # Busca de testemunhas: Dijkstra local a partir de u, ignorando v;
+            # termina ao resolver todos os alvos, passar do custo ou do limite de nós
+            distancias = {u: 0.0}
+            fila = [(0.0, u)]
+            resolvidos = 0
+            while fila and pendentes > 0:
+                dist_atual, atual = heapq.heappop(fila)
+                if dist_atual > distancias[atual]:
+                    continue
+                if dist_atual > limite_custo or resolvidos >= limite_testemunha:
+                    break
+                resolvidos += 1
+                if atual in alvos and atual != u:
+                    pendentes -= 1
+                for vizinho, peso in saida[atual].items():
+                    if vizinho == v:
+                        continue
+                    nova_distancia = dist_atual + peso
+                    if nova_distancia < distancias.get(vizinho, float('inf')):
+                        distancias[vizinho] = nova_distancia
+                        heapq.heappush(fila, (nova_distancia, vizinho))
+            
+            for w, peso_vw in saidas:
+                if w == u:
+                    continue
+                custo = peso_uv + peso_vw
+                if distancias.get(w, float('inf')) > custo:
+                    atalhos.append((u, w, custo))
+        
+        return atalhos
+    
+    @staticmethod
+    def _para_csr(listas: List[List[Tuple[int, float]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Converte listas de (vizinho, peso) por nó em arrays CSR."""
+        offsets = np.zeros(len(listas) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(lista) for lista in listas])
+        destinos = np.array([x for lista in listas for x, _ in lista], dtype=np.int32)
+        pesos = np.array([p for lista in listas for _, p in lista], dtype=np.float64)
+        return offsets, destinos, pesos
+    
+    # ============================================
+    # PERSISTÊNCIA
+    # ============================================
+    def salvar(self, caminho_arquivo: str) -> None:
+        """
+        Salva a hierarquia em um arquivo .npz (arrays binários).
+        
+        Args:
+            caminho_arquivo: Caminho do arquivo de destino
+        """
+        np.savez(caminho_arquivo, ids=self.ids, nivel=self.nivel,
+                 assinatura=np.array(self.assinatura), **self._arrays)
+    
+    @classmethod
+    def carregar(cls, caminho_arquivo: str) -> 'HierarquiaContracao':
+        """
+        Carrega uma hierarquia salva com salvar().
+        
+        Args:
+            caminho_arquivo: Caminho do arquivo .npz
+        
+        Returns:
+            Instância de HierarquiaContracao
+        """
+        with np.load(caminho_arquivo, allow_pickle=False) as dados:
+            return cls(
+                dados['ids'], dados['nivel'],
+                dados['acima_offsets'], dados['acima_destinos'], dados['acima_pesos'],
+                dados['abaixo_offsets'], dados['abaixo_destinos'], dados['abaixo_pesos'],
+                dados['atalhos_origem'], dados['atalhos_destino'], dados['atalhos_meio'],
+                assinatura=str(dados['assinatura'])
+            )
+    
+    # ============================================
+    # CONSULTA
+    # ============================================
+    def consultar(self, origem: int, destino: int) -> Tuple[Optional[List[int]], Optional[float]]:
+        """
+        Caminho mínimo entre dois nós (IDs originais) pela hierarquia.
+        
+        Args:
+            origem: ID do nó de origem
+            destino: ID do nó de destino
+        
+        Returns:
+            Tupla (caminho, distancia): caminho com os IDs originais, já sem
+            atalhos, ou (None, None) se não houver caminho
+        """
+        s, t = self._indice.get(origem), self._indice.get(destino)
+        if s is None or t is None:
+            return None, None
+        if s == t:
+            return [origem], 0.0
+        
+        infinito = float('inf')
+        distancias: Tuple[Dict[int, float], Dict[int, float]] = ({s: 0.0}, {t: 0.0})
+        predecessores: Tuple[Dict[int, int], Dict[int, int]] = ({s: -1}, {t: -1})
+        filas: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0.0, s)], [(0.0, t)])
+        adjacencias = (self._acima, self._abaixo)
+        
+        melhor = infinito
+        encontro = -1
+        
+        while True:
+            # Avança o lado de menor topo; cada lado só continua enquanto seu
+            # topo ainda puder melhorar o resultado
+            topo_direta = filas[0][0][0] if filas[0] else infinito
+            topo_reversa = filas[1][0][0] if filas[1] else infinito
+            if min(topo_direta, topo_reversa) >= melhor:
+                break
+            lado = 0 if topo_direta <= topo_reversa else 1
+            
+            dist_atual, atual = heapq.heappop(filas[lado])
+            dist_lado = distancias[lado]
+            if dist_atual > dist_lado[atual]:
+                continue
+            
+            dist_outro = distancias[1 - lado].get(atual)
+            if dist_outro is not None and dist_atual + dist_outro < melhor:
+                melhor = dist_atual + dist_outro
+                encontro = atual
+            
+            # Stall-on-demand: se um nó mais alto já alcançado chega a este por
+            # uma aresta descendente com custo menor, este nó não está em nenhum
+            # caminho mínimo vindo da origem desta busca e não precisa ser expandido
+            if any(dist_lado.get(superior, infinito) + peso < dist_atual
+                   for superior, peso in adjacencias[1 - lado][atual]):
+                continue
+            
+            for vizinho, peso in adjacencias[lado][atual]:
+                nova_distancia = dist_atual + peso
+                if nova_distancia < dist_lado.get(vizinho, infinito):
+                    dist_lado[vizinho] = nova_distancia
+                    predecessores[lado][vizinho] = atual
+                    heapq.heappush(filas[lado], (nova_distancia, vizinho))
+        
+        if encontro == -1:
+            return None, None
+        
+        # Sequência de arestas da hierarquia: origem -> encontro -> destino
+        trecho = []
+        atual = encontro
+        while atual != -1:
+            trecho.append(atual)
+            atual = predecessores[0][atual]
+        trecho.reverse()
+        atual = predecessores[1][encontro]
+        while atual != -1:
+            trecho.append(atual)
+            atual = predecessores[1][atual]
+        
+        return [self._ids[i] for i in self._desempacotar(trecho)], melhor
+    
+    def _desempacotar(self, trecho: List[int]) -> List[int]:
+        """Substitui recursivamente cada atalho u -> w por u -> meio -> w."""
+        caminho = [trecho[0]]
+        for u, w in zip(trecho, trecho[1:]):
+            pilha = [(u, w)]
+            while pilha:
+                a, b = pilha.pop()
+                m = self._meio.get((a, b))
+                if m is None:
+                    caminho.append(b)
+                else:
+                    # Empilha a segunda metade antes para processar a primeira antes
+                    pilha.append((m, b))
+                    pilha.append((a, m))
+        return caminho
+
+
+def assinatura_arestas(ids: List[int], arestas: List[Tuple[int, int, float]]) -> str:
+    """
+    Calcula uma assinatura (hash) dos nós e arestas de um grafo, usada para
+    saber se uma hierarquia salva corresponde ao grafo carregado.
+    """
+    resumo = hashlib.sha1()
+    resumo.update(np.array(ids, dtype=np.int64).tobytes())
+    resumo.update(np.array([(u, v) for u, v, _ in arestas], dtype=np.int64).tobytes())
+    resumo.update(np.array([p for _, _, p in arestas], dtype=np.float64).round(3).tobytes())
+    return resumo.hexdigest()
@@ -6,139 +6,781 @@ Classe própria do grupo para encontrar o caminho mínimo entre vértices
 """
 
 import heapq
-from typing import Dict, List, Optional, Tuple
-from grafo import Grafo
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+import numpy as np
+from grafo import Grafo, GrafoCSR
+from marcos import MarcosALT
+from filas import TIPOS_FILA, FilaDial, FilaHeapIndexado, criar_fila, escolher_fila
+
+# Valor das matrizes de distância para pares sem caminho
+SEM_CAMINHO = -1
+
+
+class AreaDeBusca:
+    """
+    Estado reutilizável de uma busca de Dijkstra (distâncias e predecessores).
+    
+    Os arrays são alocados uma única vez por grafo. Cada busca recebe um novo
+    número de geração g: a marca de um vértice vale g se ele foi alcançado e -g
+    se já foi resolvido nesta busca; qualquer outro valor é resto de buscas
+    anteriores. Assim uma consulta só toca os vértices que de fato alcança,
+    sem reinicializar O(V) posições.
+    """
+    
+    __slots__ = ('num_vertices', 'distancias', 'predecessores', 'marcas', 'geracao')
+    
+    def __init__(self, num_vertices: int):
+        """
+        Aloca o estado para um grafo com num_vertices vértices.
+        
+        Args:
+            num_vertices: Número de vértices do grafo
+        """
+        self.num_vertices = num_vertices
+        self.distancias: List[float] = [0] * num_vertices
+        self.predecessores: List[int] = [-1] * num_vertices
+        self.marcas: List[int] = [0] * num_vertices
+        self.geracao = 0
+    
+    def nova_busca(self) -> int:
+        """Invalida o estado da busca anterior e retorna a nova geração."""
+        self.geracao += 1
+        return self.geracao
+    
+    def alcancado(self, vertice: int) -> bool:
+        """Verifica se o vértice foi alcançado na busca atual."""
+        return abs(self.marcas[vertice]) == self.geracao
+    
+    def reconstruir_caminho(self, destino: int) -> List[int]:
+        """Reconstrói o caminho até destino seguindo os predecessores da busca atual."""
+        caminho = []
+        atual = destino
+        while atual != -1:
+            caminho.append(atual)
+            atual = self.predecessores[atual]
+        
+        caminho.reverse()
+        return caminho
+
+
+class ArvoreCaminhosMinimos:
+    """
+    Árvore de caminhos mínimos a partir de uma origem.
+    
+    Guarda só dois arrays de V posições (distância e predecessor); cada
+    caminho é reconstruído quando pedido, seguindo os predecessores.
+    """
+    
+    __slots__ = ('origem', 'distancias', 'predecessores')
+    
+    def __init__(self, origem: int, distancias: array, predecessores: array):
+        """
+        Inicializa a árvore a partir dos arrays já preenchidos.
+        
+        Args:
+            origem: Raiz da árvore
+            distancias: Distância mínima de cada vértice (-1 = não alcançado)
+            predecessores: Vértice anterior no caminho mínimo (-1 na raiz e nos não alcançados)
+        """
+        self.origem = origem
+        self.distancias = distancias
+        self.predecessores = predecessores
+    
+    def alcancado(self, vertice: int) -> bool:
+        """Verifica se existe caminho da origem até o vértice."""
+        return 0 <= vertice < len(self.distancias) and self.distancias[vertice] >= 0
+    
+    def distancia(self, vertice: int) -> Optional[int]:
+        """Distância mínima da origem até o vértice, ou None se não for alcançável."""
+        return self.distancias[vertice] if self.alcancado(vertice) else None
+    
+    def iterar_caminho(self, destino: int) -> Iterator[int]:
+        """Percorre o caminho mínimo de destino de volta até a origem, sem montar lista."""
+        if not self.alcancado(destino):
+            return
+        atual = destino
+        while atual != -1:
+            yield atual
+            atual = self.predecessores[atual]
+    
+    def caminho(self, destino: int) -> Optional[List[int]]:
+        """Caminho mínimo da origem até destino, ou None se não for alcançável."""
+        if not self.alcancado(destino):
+            return None
+        caminho = list(self.iterar_caminho(destino))
+        caminho.reverse()
+        return caminho
+    
+    def vertices_alcancados(self) -> List[int]:
+        """Vértices alcançáveis a partir da origem (inclusive ela), em ordem crescente."""
+        return [v for v, d in enumerate(self.distancias) if d >= 0]
+    
+    def como_dicionario(self) -> Dict[int, int]:
+        """Distâncias no formato {vertice: distancia_minima}, só para os alcançáveis."""
+        return {v: d for v, d in enumerate(self.distancias) if d >= 0}
+    
+    def caminhos(self) -> 'CaminhosDaArvore':
+        """Mapeamento {destino: caminho} de todos os alcançáveis, calculado sob demanda."""
+        return CaminhosDaArvore(self)
+
+
+class CaminhosDaArvore(Mapping):
+    """
+    Mapeamento somente leitura {destino: caminho mínimo} sobre uma árvore de
+    caminhos mínimos (sem a própria origem). Nenhum caminho fica guardado:
+    cada acesso o reconstrói a partir dos predecessores.
+    """
+    
+    def __init__(self, arvore: ArvoreCaminhosMinimos):
+        """
+        Args:
+            arvore: Árvore de caminhos mínimos de origem
+        """
+        self.arvore = arvore
+        self._destinos = [v for v in arvore.vertices_alcancados() if v != arvore.origem]
+    
+    def __getitem__(self, destino: int) -> List[int]:
+        if destino == self.arvore.origem or not self.arvore.alcancado(destino):
+            raise KeyError(destino)
+        return self.arvore.caminho(destino)
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._destinos)
+    
+    def __len__(self) -> int:
+        return len(self._destinos)
+
+
+class MatrizDistancias:
+    """
+    Distâncias e caminhos mínimos entre listas de origens e destinos.
+    
+    Para cada origem guarda só a parte da árvore de caminhos mínimos que leva
+    aos destinos; os caminhos são reconstruídos quando pedidos.
+    """
+    
+    def __init__(self, origens: List[int], destinos: List[int]):
+        """
+        Inicializa uma matriz vazia (todas as distâncias desconhecidas).
+        
+        Args:
+            origens: Vértices das linhas
+            destinos: Vértices das colunas
+        """
+        self.origens = origens
+        self.destinos = destinos
+        self._linha = {v: i for i, v in enumerate(origens)}
+        self._coluna = {v: j for j, v in enumerate(destinos)}
+        # distancias[i][j] = distância de origens[i] a destinos[j] (None = sem caminho)
+        self.distancias: List[List[Optional[int]]] = [[None] * len(destinos) for _ in origens]
+        self._arvores: List[Dict[int, int]] = [{} for _ in origens]
+    
+    def distancia(self, origem: int, destino: int) -> Optional[int]:
+        """Distância mínima de origem a destino, ou None se não houver caminho."""
+        return self.distancias[self._linha[origem]][self._coluna[destino]]
+    
+    def caminho(self, origem: int, destino: int) -> Optional[List[int]]:
+        """Caminho mínimo de origem a destino, ou None se não houver caminho."""
+        if self.distancia(origem, destino) is None:
+            return None
+        
+        arvore = self._arvores[self._linha[origem]]
+        caminho = [destino]
+        while caminho[-1] != origem:
+            caminho.append(arvore[caminho[-1]])
+        
+        caminho.reverse()
+        return caminho
 
 
 class Dijkstra:
-    """Classe que implementa o algoritmo de Dijkstra para encontrar caminho mínimo."""
+    """
+    Classe que implementa o algoritmo de Dijkstra para encontrar caminho mínimo.
+    
+    Cada instância reutiliza sua área de busca entre consultas; para consultas
+    concorrentes, use uma instância de Dijkstra por thread.
+    """
     
-    def __init__(self, grafo: Grafo):
+    def __init__(self, grafo: Union[Grafo, GrafoCSR], fila: str = 'auto'):
         """
         Inicializa o algoritmo de Dijkstra com um grafo.
         
+        As buscas percorrem sempre a forma compilada (CSR) do grafo, obtida
+        com grafo.compilar() e recompilada apenas quando o grafo muda.
+        
         Args:
-            grafo: Instância da classe Grafo
+            grafo: Instância da classe Grafo (ou sua forma compilada GrafoCSR)
+            fila: Fila de prioridade das buscas: 'heap' (heap binário),
+                'indexado' (heap d-ário com diminuição de chave, no máximo uma
+                entrada por vértice), 'dial' (baldes, para pesos inteiros
+                pequenos), 'radix' ou 'auto' (escolhida pela faixa de pesos do
+                grafo; ver filas.escolher_fila)
         """
+        if fila != 'auto' and fila not in TIPOS_FILA:
+            raise ValueError(f"Tipo de fila desconhecido: {fila}")
+        
         self.grafo = grafo
+        self.fila = fila
+        # Tipo de fila e maior peso da forma compilada atual (recalculados se o grafo mudar)
+        self._csr_fila: Optional[GrafoCSR] = None
+        self._tipo_fila = 'heap'
+        self._peso_max = 0
+        # Heap indexado e baldes de Dial reutilizados entre buscas (alocados uma vez por grafo)
+        self._fila_indexada: Optional[FilaHeapIndexado] = None
+        self._fila_dial: Optional[FilaDial] = None
+        # Áreas de busca reutilizáveis: [0] busca direta, [1] busca reversa (bidirecional)
+        self._areas: List[Optional[AreaDeBusca]] = [None, None]
+        # Marcos da busca ALT e a forma compilada para a qual foram calculados
+        self.marcos: Optional[MarcosALT] = None
+        self._csr_marcos: Optional[GrafoCSR] = None
+    
+    def _obter_area(self, csr: GrafoCSR, indice: int = 0) -> AreaDeBusca:
+        """Retorna a área de busca reutilizável, realocando só se o número de vértices mudar."""
+        area = self._areas[indice]
+        if area is None or area.num_vertices != csr.num_vertices:
+            area = AreaDeBusca(csr.num_vertices)
+            self._areas[indice] = area
+        return area
     
-    def encontrar_caminho_minimo(self, origem: int, destino: int) -> Tuple[Optional[List[int]], Optional[int]]:
+    def _nova_fila(self, csr: GrafoCSR):
         """
-        Encontra o caminho mínimo entre origem e destino usando Dijkstra.
+        Cria uma fila de prioridade vazia do tipo configurado para a forma
+        compilada; o heap indexado e os baldes de Dial, que custam O(V) e
+        O(peso_max) para alocar, são esvaziados e reutilizados entre buscas.
+        """
+        if self._csr_fila is not csr:
+            peso_min, peso_max = (min(csr.pesos), max(csr.pesos)) if len(csr.pesos) else (0, 0)
+            self._tipo_fila = escolher_fila(peso_min, peso_max) if self.fila == 'auto' else self.fila
+            self._peso_max = peso_max
+            self._csr_fila = csr
+        if self._tipo_fila == 'indexado':
+            fila = self._fila_indexada
+            if fila is None or fila.num_itens != csr.num_vertices:
+                fila = self._fila_indexada = criar_fila('indexado', num_itens=csr.num_vertices)
+            else:
+                fila.esvaziar()
+            return fila
+        if self._tipo_fila == 'dial':
+            fila = self._fila_dial
+            if fila is None or fila.peso_max != self._peso_max:
+                fila = self._fila_dial = criar_fila('dial', self._peso_max)
+            else:
+                fila.esvaziar()
+            return fila
+        return criar_fila(self._tipo_fila, self._peso_max)
+    
+    def _buscar(self, origem: Union[int, Sequence[int]], destino: int = -1,
+                alvos: Optional[Set[int]] = None) -> Tuple[AreaDeBusca, List[int]]:
+        """
+        Executa Dijkstra a partir de origem na área de busca reutilizável.
         
         Args:
-            origem: Vértice de partida
-            destino: Vértice de destino
+            origem: Vértice de partida, ou uma sequência de vértices (busca com
+                múltiplas fontes, todas com distância 0 e sem predecessor)
+            destino: Vértice em que a busca pode parar (-1 = explorar tudo)
+            alvos: Vértices que, quando todos resolvidos, encerram a busca
             
         Returns:
-            Tupla (caminho, distancia_total):
-            - caminho: Lista de vértices do caminho mínimo, ou None se não houver caminho
-            - distancia_total: Distância total do caminho, ou None se não houver caminho
+            Tupla (area, fechados) com a área preenchida e a lista de vértices
+            definitivamente resolvidos, na ordem em que saíram da fila
         """
-        if origem == destino:
-            return [origem], 0
-        
-        if origem < 0 or origem >= self.grafo.num_vertices:
-            return None, None
+        csr = self.grafo.compilar()
+        offsets, vizinhos, pesos = csr.offsets, csr.vizinhos, csr.pesos
         
-        if destino < 0 or destino >= self.grafo.num_vertices:
-            return None, None
+        area = self._obter_area(csr)
+        geracao = area.nova_busca()
+        distancias, predecessores, marcas = area.distancias, area.predecessores, area.marcas
         
-        # Inicialização
-        distancias: Dict[int, int] = {v: float('inf') for v in self.grafo.vertices}
-        distancias[origem] = 0
+        fechado = -geracao
         
-        # Fila de prioridade: (distancia, vertice)
-        fila: List[Tuple[int, int]] = [(0, origem)]
-        heapq.heapify(fila)
+        # Fila de prioridade de vértices por distância
+        fila = self._nova_fila(csr)
+        inserir, remover_minimo = fila.inserir, fila.remover_minimo
         
-        # Para reconstruir o caminho
-        predecessores: Dict[int, Optional[int]] = {v: None for v in self.grafo.vertices}
-        visitados: set = set()
+        for fonte in ((origem,) if isinstance(origem, (int, np.integer)) else origem):
+            distancias[fonte] = 0
+            predecessores[fonte] = -1
+            marcas[fonte] = geracao
+            inserir(0, fonte)
+        fechados: List[int] = []
+        faltam = len(alvos) if alvos is not None else 0
         
-        while fila:
-            dist_atual, vertice_atual = heapq.heappop(fila)
+        while len(fila):
+            dist_atual, vertice_atual = remover_minimo()
             
-            # Se já visitamos este vértice com distância menor, ignora
-            if vertice_atual in visitados:
+            # Se já resolvemos este vértice com distância menor, ignora
+            if marcas[vertice_atual] == fechado:
                 continue
             
-            visitados.add(vertice_atual)
+            marcas[vertice_atual] = fechado
+            fechados.append(vertice_atual)
             
-            # Se chegamos ao destino, podemos parar
+            # Se chegamos ao destino (ou a todos os alvos), podemos parar
             if vertice_atual == destino:
                 break
+            if faltam and vertice_atual in alvos:
+                faltam -= 1
+                if not faltam:
+                    break
             
-            # Explora vizinhos
-            for vizinho, peso in self.grafo.obter_vizinhos(vertice_atual):
-                if vizinho in visitados:
+            # Explora vizinhos (marca de outra geração = ainda não alcançado nesta busca)
+            inicio, fim = offsets[vertice_atual], offsets[vertice_atual + 1]
+            for vizinho, peso in zip(vizinhos[inicio:fim], pesos[inicio:fim]):
+                marca = marcas[vizinho]
+                if marca == fechado:
                     continue
                 
                 nova_distancia = dist_atual + peso
                 
-                if nova_distancia < distancias[vizinho]:
+                if marca != geracao or nova_distancia < distancias[vizinho]:
+                    marcas[vizinho] = geracao
+                    distancias[vizinho] = nova_distancia
+                    predecessores[vizinho] = vertice_atual
+                    inserir(nova_distancia, vizinho)
+        
+        return area, fechados
+    
+    def _buscar_bidirecional(self, origem: int, destino: int) -> Tuple[Optional[List[int]], Optional[int]]:
+        """
+        Executa Dijkstra simultaneamente a partir da origem e do destino.
+        
+        A cada passo avança a busca cuja fila tem a menor chave. Ao relaxar uma
+        aresta que chega a um vértice já alcançado pela outra busca, atualiza o
+        melhor caminho conhecido (mu). Para quando a soma dos topos das duas
+        filas não puder mais melhorar mu.
+        """
+        csr = self.grafo.compilar()
+        offsets, vizinhos, pesos = csr.offsets, csr.vizinhos, csr.pesos
+        
+        areas = (self._obter_area(csr, 0), self._obter_area(csr, 1))
+        geracoes = (areas[0].nova_busca(), areas[1].nova_busca())
+        filas: Tuple[List[Tuple[int, int]], List[Tuple[int, int]]] = ([(0, origem)], [(0, destino)])
+        
+        for area, geracao, inicio in zip(areas, geracoes, (origem, destino)):
+            area.distancias[inicio] = 0
+            area.predecessores[inicio] = -1
+            area.marcas[inicio] = geracao
+        
+        melhor = float('inf')
+        encontro = -1
+        
+        while filas[0] and filas[1]:
+            if filas[0][0][0] + filas[1][0][0] >= melhor:
+                break
+            
+            # Avança o lado com menor chave no topo da fila
+            lado = 0 if filas[0][0][0] <= filas[1][0][0] else 1
+            fila = filas[lado]
+            area, geracao = areas[lado], geracoes[lado]
+            distancias, predecessores, marcas = area.distancias, area.predecessores, area.marcas
+            outra = areas[1 - lado]
+            dist_outra, marcas_outra, geracao_outra = outra.distancias, outra.marcas, geracoes[1 - lado]
+            fechado = -geracao
+            
+            dist_atual, vertice_atual = heapq.heappop(fila)
+            if marcas[vertice_atual] == fechado:
+                continue
+            marcas[vertice_atual] = fechado
+            
+            inicio, fim = offsets[vertice_atual], offsets[vertice_atual + 1]
+            for vizinho, peso in zip(vizinhos[inicio:fim], pesos[inicio:fim]):
+                marca = marcas[vizinho]
+                if marca == fechado:
+                    continue
+                
+                nova_distancia = dist_atual + peso
+                
+                if marca != geracao or nova_distancia < distancias[vizinho]:
+                    marcas[vizinho] = geracao
                     distancias[vizinho] = nova_distancia
                     predecessores[vizinho] = vertice_atual
                     heapq.heappush(fila, (nova_distancia, vizinho))
+                
+                # Vizinho já alcançado pela outra busca: caminho candidato completo
+                if abs(marcas_outra[vizinho]) == geracao_outra:
+                    candidato = distancias[vizinho] + dist_outra[vizinho]
+                    if candidato < melhor:
+                        melhor = candidato
+                        encontro = vizinho
         
-        # Reconstruir caminho
-        if distancias[destino] == float('inf'):
+        if encontro == -1:
             return None, None
         
-        caminho = []
-        atual = destino
-        while atual is not None:
+        # Origem -> encontro pela busca direta, encontro -> destino pela reversa
+        caminho = areas[0].reconstruir_caminho(encontro)
+        atual = areas[1].predecessores[encontro]
+        while atual != -1:
             caminho.append(atual)
-            atual = predecessores[atual]
+            atual = areas[1].predecessores[atual]
         
-        caminho.reverse()
-        distancia_total = distancias[destino]
-        
-        return caminho, distancia_total
+        return caminho, melhor
     
-    def obter_distancias_minimas(self, origem: int) -> Dict[int, int]:
+    def preparar_marcos(self, num_marcos: int = 8, estrategia: str = 'mais_distante',
+                        semente: Optional[int] = None) -> MarcosALT:
         """
-        Retorna um dicionário com as distâncias mínimas de origem para todos os vértices.
+        Escolhe os marcos e calcula suas tabelas de distância para a busca ALT.
+        
+        Custa num_marcos buscas completas e ocupa num_marcos x V inteiros de
+        32 bits; vale enquanto o grafo não mudar.
         
         Args:
-            origem: Vértice de partida
+            num_marcos: Quantidade de marcos
+            estrategia: 'mais_distante' ou 'evitar' (ver MarcosALT.construir)
+            semente: Semente para a escolha dos marcos
             
         Returns:
-            Dicionário {vertice: distancia_minima}
+            Os marcos calculados
         """
-        if origem < 0 or origem >= self.grafo.num_vertices:
-            return {}
+        csr = self.grafo.compilar()
+        self.marcos = MarcosALT.construir((csr.offsets, csr.vizinhos, csr.pesos), num_marcos=num_marcos,
+                                          estrategia=estrategia, semente=semente)
+        self._csr_marcos = csr
+        return self.marcos
+    
+    def _buscar_alt(self, origem: int, destino: int) -> Tuple[Optional[List[int]], Optional[int]]:
+        """
+        A* com a heurística dos marcos (ALT): a fila é ordenada por
+        distância + limite inferior até o destino, então a busca avança em
+        direção ao destino mesmo sem coordenadas.
+        """
+        csr = self.grafo.compilar()
+        if self.marcos is None or self._csr_marcos is not csr:
+            self.preparar_marcos()
+        heuristica = self.marcos.heuristica(origem, destino)
+        offsets, vizinhos, pesos = csr.offsets, csr.vizinhos, csr.pesos
+        
+        area = self._obter_area(csr)
+        geracao = area.nova_busca()
+        distancias, predecessores, marcas = area.distancias, area.predecessores, area.marcas
+        
+        fechado = -geracao
         
-        distancias: Dict[int, int] = {v: float('inf') for v in self.grafo.vertices}
         distancias[origem] = 0
+        predecessores[origem] = -1
+        marcas[origem] = geracao
         
-        fila: List[Tuple[int, int]] = [(0, origem)]
-        heapq.heapify(fila)
-        visitados: set = set()
+        # Fila de prioridade: (distancia + heuristica, distancia, vertice)
+        fila: List[Tuple[int, int, int]] = [(heuristica(origem), 0, origem)]
         
         while fila:
-            dist_atual, vertice_atual = heapq.heappop(fila)
+            _, dist_atual, vertice_atual = heapq.heappop(fila)
             
-            if vertice_atual in visitados:
+            if marcas[vertice_atual] == fechado:
                 continue
             
-            visitados.add(vertice_atual)
+            marcas[vertice_atual] = fechado
+            
+            if vertice_atual == destino:
+                return area.reconstruir_caminho(destino), dist_atual
             
-            for vizinho, peso in self.grafo.obter_vizinhos(vertice_atual):
-                if vizinho in visitados:
+            inicio, fim = offsets[vertice_atual], offsets[vertice_atual + 1]
+            for vizinho, peso in zip(vizinhos[inicio:fim], pesos[inicio:fim]):
+                marca = marcas[vizinho]
+                if marca == fechado:
                     continue
                 
                 nova_distancia = dist_atual + peso
                 
-                if nova_distancia < distancias[vizinho]:
+                if marca != geracao or nova_distancia < distancias[vizinho]:
+                    marcas[vizinho] = geracao
                     distancias[vizinho] = nova_distancia
-                    heapq.heappush(fila, (nova_distancia, vizinho))
+                    predecessores[vizinho] = vertice_atual
+                    heapq.heappush(fila, (nova_distancia + heuristica(vizinho), nova_distancia, vizinho))
         
-        # Converte float('inf') para None para vértices inalcançáveis
-        resultado = {}
-        for v, d in distancias.items():
-            if d != float('inf'):
-                resultado[v] = int(d)
+        return None, None
+    
+    def encontrar_caminho_minimo(self, origem: int, destino: int,
+                                 metodo: str = 'dijkstra') -> Tuple[Optional[List[int]], Optional[int]]:
+        """
+        Encontra o caminho mínimo entre origem e destino usando Dijkstra.
         
-        return resultado
-
+        Args:
+            origem: Vértice de partida
+            destino: Vértice de destino
+            metodo: 'dijkstra' (busca a partir da origem), 'bidirecional'
+                (buscas simultâneas da origem e do destino, que se encontram no meio)
+                ou 'alt' (A* com limites dos marcos; calcula os marcos na primeira consulta)
+                
+        Returns:
+            Tupla (caminho, distancia_total):
+            - caminho: Lista de vértices do caminho mínimo, ou None se não houver caminho
+            - distancia_total: Distância total do caminho, ou None se não houver caminho
+        """
+        if origem == destino:
+            return [origem], 0
+        
+        if origem < 0 or origem >= self.grafo.num_vertices:
+            return None, None
+        
+        if destino < 0 or destino >= self.grafo.num_vertices:
+            return None, None
+        
+        # Componentes conexos diferentes: não existe caminho, nem é preciso buscar
+        if not self.grafo.mesmo_componente(origem, destino):
+            return None, None
+        
+        if metodo == 'bidirecional':
+            return self._buscar_bidirecional(origem, destino)
+        if metodo == 'alt':
+            return self._buscar_alt(origem, destino)
+        if metodo != 'dijkstra':
+            raise ValueError(f"Método de busca desconhecido: {metodo}")
+        
+        area, _ = self._buscar(origem, destino)
+        
+        if not area.alcancado(destino):
+            return None, None
+        
+        return area.reconstruir_caminho(destino), area.distancias[destino]
+    
+    def matriz_distancias(self, origens: Sequence[int], destinos: Sequence[int]) -> MatrizDistancias:
+        """
+        Calcula distâncias e caminhos mínimos de cada origem para cada destino.
+        
+        Faz uma única busca por origem, que para assim que todos os destinos
+        do mesmo componente estiverem resolvidos.
+        
+        Args:
+            origens: Vértices de partida
+            destinos: Vértices de chegada
+            
+        Returns:
+            MatrizDistancias com uma linha por origem e uma coluna por destino
+            (repetições nas listas são ignoradas)
+        """
+        n = self.grafo.num_vertices
+        matriz = MatrizDistancias(list(dict.fromkeys(origens)), list(dict.fromkeys(destinos)))
+        
+        for i, origem in enumerate(matriz.origens):
+            if origem < 0 or origem >= n:
+                continue
+            
+            # Destinos de outros componentes nunca seriam resolvidos
+            alvos = {v for v in matriz.destinos if 0 <= v < n and self.grafo.mesmo_componente(origem, v)}
+            if not alvos:
+                continue
+            area, _ = self._buscar(origem, alvos=alvos)
+            
+            linha, arvore = matriz.distancias[i], matriz._arvores[i]
+            for destino in alvos:
+                linha[matriz._coluna[destino]] = area.distancias[destino]
+                # Guarda os predecessores até encontrar um trecho já guardado
+                atual = destino
+                while atual != origem and atual not in arvore:
+                    anterior = area.predecessores[atual]
+                    arvore[atual] = anterior
+                    atual = anterior
+        
+        return matriz
+    
+    def arvore_caminhos_minimos(self, origem: int) -> ArvoreCaminhosMinimos:
+        """
+        Calcula, com uma única busca, os caminhos mínimos de origem para todos os vértices.
+        
+        Args:
+            origem: Vértice de partida
+            
+        Returns:
+            ArvoreCaminhosMinimos com distâncias e predecessores (vazia se a
+            origem for inválida)
+        """
+        n = self.grafo.num_vertices
+        distancias = array('q', [-1]) * n
+        predecessores = array('q', [-1]) * n
+        
+        if 0 <= origem < n:
+            area, fechados = self._buscar(origem)
+            for v in fechados:
+                distancias[v] = area.distancias[v]
+                predecessores[v] = area.predecessores[v]
+        
+        return ArvoreCaminhosMinimos(origem, distancias, predecessores)
+    
+    def buscar_multiplas_fontes(self, fontes: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula, com uma única busca, a distância de cada vértice até a fonte
+        mais próxima e qual é essa fonte (partição de Voronoi do grafo).
+        
+        Todas as fontes entram na fila com distância 0; cada vértice herda o
+        rótulo da fonte da raiz de sua árvore de caminhos mínimos. Custa um
+        Dijkstra, em vez de um por fonte seguido do mínimo.
+        
+        Args:
+            fontes: Vértices de partida (depósitos, roteadores...); inválidos e
+                repetidos são ignorados
+                
+        Returns:
+            Tupla (distancias, rotulos), arrays int64 indexados pelo vértice:
+            distância até a fonte mais próxima e essa fonte; vértices que
+            nenhuma fonte alcança valem SEM_CAMINHO nos dois. Empates ficam com
+            a fonte que resolveu o vértice primeiro
+        """
+        n = self.grafo.num_vertices
+        distancias = np.full(n, SEM_CAMINHO, dtype=np.int64)
+        rotulos = np.full(n, SEM_CAMINHO, dtype=np.int64)
+        
+        fontes = [v for v in dict.fromkeys(fontes) if 0 <= v < n]
+        if not fontes:
+            return distancias, rotulos
+        
+        area, fechados = self._buscar(fontes)
+        predecessores = area.predecessores
+        
+        # O predecessor sai da fila antes do vértice: seu rótulo já está definido
+        rotulo = [SEM_CAMINHO] * n
+        for v in fechados:
+            anterior = predecessores[v]
+            rotulo[v] = v if anterior == -1 else rotulo[anterior]
+        
+        fechados_array = np.array(fechados, dtype=np.int64)
+        distancias[fechados_array] = np.array(area.distancias, dtype=np.int64)[fechados_array]
+        rotulos[fechados_array] = np.array(rotulo, dtype=np.int64)[fechados_array]
+        return distancias, rotulos
+    
+    def matriz_todos_pares(self, origens: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Calcula as distâncias mínimas de cada origem para todos os vértices.
+        
+        Args:
+            origens: Vértices das linhas (padrão: todos, o que dá a matriz V x V)
+            
+        Returns:
+            Matriz int32 com uma linha por origem (4 bytes por par); pares sem
+            caminho valem SEM_CAMINHO
+        """
+        n = self.grafo.num_vertices
+        origens = range(n) if origens is None else origens
+        matriz = np.full((len(origens), n), SEM_CAMINHO, dtype=np.int32)
+        
+        for i, origem in enumerate(origens):
+            area, fechados = self._buscar(origem)
+            fechados_array = np.array(fechados, dtype=np.int64)
+            matriz[i, fechados_array] = np.array(area.distancias, dtype=np.int64)[fechados_array]
+        
+        return matriz
+    
+    def resumo_distancias(self, origens: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Resume as distâncias a partir de cada origem sem guardar a matriz.
+        
+        Args:
+            origens: Vértices de partida (padrão: todos)
+            
+        Returns:
+            Tupla (somas, contagens, excentricidades), uma posição por origem:
+            soma das distâncias aos vértices alcançáveis, quantos são
+            alcançáveis (incluindo a origem) e a maior dessas distâncias
+        """
+        origens = range(self.grafo.num_vertices) if origens is None else origens
+        somas = np.zeros(len(origens), dtype=np.int64)
+        contagens = np.zeros(len(origens), dtype=np.int64)
+        excentricidades = np.zeros(len(origens), dtype=np.int64)
+        
+        for i, origem in enumerate(origens):
+            area, fechados = self._buscar(origem)
+            distancias = area.distancias
+            somas[i] = sum(distancias[v] for v in fechados)
+            contagens[i] = len(fechados)
+            # Vértices saem da fila em ordem de distância: o último é o mais distante
+            excentricidades[i] = distancias[fechados[-1]]
+        
+        return somas, contagens, excentricidades
+    
+    def acumular_intermediacao(self, origens: Iterable[int]) -> np.ndarray:
+        """
+        Soma, para as origens dadas, a dependência de cada vértice no
+        algoritmo de Brandes (centralidade de intermediação com pesos).
+        
+        Para cada origem s, um Dijkstra conta os caminhos mínimos sigma[v] e
+        guarda todos os predecessores de cada v em algum caminho mínimo; depois,
+        em ordem decrescente de distância, acumula
+        delta[u] += sigma[u] / sigma[v] x (1 + delta[v]) para cada predecessor u de v.
+        
+        Exige pesos positivos: uma aresta de peso 0 liga dois vértices à mesma
+        distância nos dois sentidos, e a contagem de caminhos mínimos deixa de
+        ser finita (o Dijkstra também resolveria um deles antes de somar os
+        caminhos que chegam pelo outro). Pesos não positivos geram ValueError.
+        
+        Args:
+            origens: Vértices de partida
+            
+        Returns:
+            Array float64 com a soma das dependências de cada vértice (cada par
+            não ordenado é contado uma vez em cada sentido)
+        """
+        csr = self.grafo.compilar()
+        offsets, vizinhos, pesos = csr.offsets, csr.vizinhos, csr.pesos
+        if len(pesos) and min(pesos) <= 0:
+            raise ValueError("A centralidade de intermediação exige pesos de aresta positivos")
+        n = csr.num_vertices
+        intermediacao = [0.0] * n
+        
+        for origem in origens:
+            distancias = [-1] * n
+            sigma = [0] * n
+            predecessores: List[List[int]] = [[] for _ in range(n)]
+            ordem: List[int] = []
+            
+            distancias[origem] = 0
+            sigma[origem] = 1
+            fila = self._nova_fila(csr)
+            inserir, remover_minimo = fila.inserir, fila.remover_minimo
+            inserir(0, origem)
+            fechado = [False] * n
+            
+            while len(fila):
+                dist_atual, vertice_atual = remover_minimo()
+                if fechado[vertice_atual]:
+                    continue
+                fechado[vertice_atual] = True
+                ordem.append(vertice_atual)
+                
+                inicio, fim = offsets[vertice_atual], offsets[vertice_atual + 1]
+                for vizinho, peso in zip(vizinhos[inicio:fim], pesos[inicio:fim]):
+                    if fechado[vizinho]:
+                        continue
+                    
+                    nova_distancia = dist_atual + peso
+                    dist_vizinho = distancias[vizinho]
+                    
+                    if dist_vizinho == -1 or nova_distancia < dist_vizinho:
+                        distancias[vizinho] = nova_distancia
+                        sigma[vizinho] = sigma[vertice_atual]
+                        predecessores[vizinho] = [vertice_atual]
+                        inserir(nova_distancia, vizinho)
+                    elif nova_distancia == dist_vizinho:
+                        # Outro caminho mínimo de mesmo custo
+                        sigma[vizinho] += sigma[vertice_atual]
+                        predecessores[vizinho].append(vertice_atual)
+            
+            # Acumula as dependências do mais distante para o mais próximo
+            delta = dict.fromkeys(ordem, 0.0)
+            for v in reversed(ordem):
+                coeficiente = (1.0 + delta[v]) / sigma[v]
+                for u in predecessores[v]:
+                    delta[u] += sigma[u] * coeficiente
+                if v != origem:
+                    intermediacao[v] += delta[v]
+        
+        return np.array(intermediacao, dtype=np.float64)
+    
+    def obter_distancias_minimas(self, origem: int) -> Dict[int, int]:
+        """
+        Retorna um dicionário com as distâncias mínimas de origem para todos os vértices.
+        
+        Args:
+            origem: Vértice de partida
+            
+        Returns:
+            Dicionário {vertice: distancia_minima}
+        """
+        if origem < 0 or origem >= self.grafo.num_vertices:
+            return {}
+        
+        area, fechados = self._buscar(origem)
+        
+        # Só os vértices alcançados entram no resultado (inalcançáveis ficam de fora)
+        distancias = area.distancias
+        return {v: int(distancias[v]) for v in sorted(fechados)}
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Filas de prioridade para o algoritmo de Dijkstra
+Heap binário (padrão), heap d-ário indexado, fila de baldes de Dial e
+radix heap, com escolha automática a partir da faixa de pesos do grafo
+"""
+
+import heapq
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+# Maior peso de aresta para o qual a fila de Dial é escolhida automaticamente.
+# Cada busca paga O(peso_max) para percorrer os baldes vazios e, se parar
+# antes de esvaziar a fila, para limpá-los na reutilização; com 1024 isso
+# fica em torno de 0,02 ms por consulta curta, enquanto buscas longas ainda
+# ganham do heap. Com 4000, consultas curtas já ficavam ~10x mais lentas.
+LIMITE_DIAL = 1024
+
+
+class FilaHeapBinario:
+    """
+    Heap binário (heapq) com remoção preguiçosa: a mesma chave pode ser
+    inserida várias vezes e cabe ao Dijkstra ignorar as entradas antigas.
+    Aceita qualquer prioridade comparável.
+    """
+    
+    __slots__ = ('_itens',)
+    
+    def __init__(self):
+        self._itens: List[Tuple[int, int]] = []
+    
+    def inserir(self, prioridade: int, item: int) -> None:
+        """Insere item com a prioridade dada."""
+        heapq.heappush(self._itens, (prioridade, item))
+    
+    def remover_minimo(self) -> Tuple[int, int]:
+        """Remove e retorna o par (prioridade, item) de menor prioridade."""
+        return heapq.heappop(self._itens)
+    
+    def __len__(self) -> int:
+        return len(self._itens)
+
+
+class FilaHeapIndexado:
+    """
+    Heap d-ário indexado com diminuição de chave.
+    
+    Cada item aparece no máximo uma vez: inserir um item já presente só
+    diminui sua prioridade (se a nova for menor). Assim a fila nunca passa do
+    número de vértices, enquanto o heap com remoção preguiçosa pode acumular
+    uma entrada por aresta relaxada.
+    
+    Com num_itens, os itens são os inteiros 0..num_itens-1 (vértices do CSR) e
+    a posição de cada um fica numa lista pré-alocada (-1 = fora da fila), sem
+    custo de hash. Sem num_itens, as posições ficam num dicionário, o que
+    aceita qualquer item hashable (ex: IDs de nós do OSM).
+    """
+    
+    __slots__ = ('_aridade', '_chaves', '_itens', '_posicoes', '_denso', 'num_itens')
+    
+    def __init__(self, aridade: int = 4, num_itens: Optional[int] = None):
+        """
+        Args:
+            aridade: Número de filhos de cada nó (d); heaps mais largos são mais
+                rasos, o que barateia a diminuição de chave
+            num_itens: Quantidade de itens inteiros possíveis (None = itens
+                quaisquer, com as posições num dicionário)
+        """
+        self._aridade = aridade
+        self._chaves: List = []
+        self._itens: List[Hashable] = []
+        self._denso = num_itens is not None
+        self.num_itens = num_itens
+        self._posicoes: Union[List[int], Dict[Hashable, int]] = [-1] * num_itens if self._denso else {}
+    
+    def inserir(self, prioridade, item: Hashable) -> None:
+        """Insere item ou, se já estiver na fila, diminui sua prioridade."""
+        chaves, itens, posicoes = self._chaves, self._itens, self._posicoes
+        i = posicoes[item] if self._denso else posicoes.get(item, -1)
+        if i < 0:
+            i = len(itens)
+            chaves.append(prioridade)
+            itens.append(item)
+        elif prioridade >= chaves[i]:
+            return
+        
+        # Sobe o item até um pai com prioridade menor ou igual
+        aridade = self._aridade
+        while i:
+            pai = (i - 1) // aridade
+            if chaves[pai] <= prioridade:
+                break
+            movido = itens[pai]
+            chaves[i] = chaves[pai]
+            itens[i] = movido
+            posicoes[movido] = i
+            i = pai
+        chaves[i] = prioridade
+        itens[i] = item
+        posicoes[item] = i
+    
+    def remover_minimo(self) -> Tuple:
+        """Remove e retorna o par (prioridade, item) de menor prioridade."""
+        chaves, itens, posicoes = self._chaves, self._itens, self._posicoes
+        prioridade, item = chaves[0], itens[0]
+        if self._denso:
+            posicoes[item] = -1
+        else:
+            del posicoes[item]
+        
+        # O último elemento desce a partir da raiz até caber
+        chave, ultimo = chaves.pop(), itens.pop()
+        n = len(itens)
+        if n:
+            aridade = self._aridade
+            i = 0
+            while True:
+                primeiro = i * aridade + 1
+                if primeiro >= n:
+                    break
+                menor, chave_menor = primeiro, chaves[primeiro]
+                for j in range(primeiro + 1, min(primeiro + aridade, n)):
+                    if chaves[j] < chave_menor:
+                        menor, chave_menor = j, chaves[j]
+                if chave_menor >= chave:
+                    break
+                movido = itens[menor]
+                chaves[i] = chave_menor
+                itens[i] = movido
+                posicoes[movido] = i
+                i = menor
+            chaves[i] = chave
+            itens[i] = ultimo
+            posicoes[ultimo] = i
+        
+        return prioridade, item
+    
+    def esvaziar(self) -> None:
+        """
+        Remove todos os itens, para reutilizar a fila em outra busca sem
+        realocar as posições (só as dos itens ainda na fila são limpas).
+        """
+        if self._denso:
+            posicoes = self._posicoes
+            for item in self._itens:
+                posicoes[item] = -1
+        else:
+            self._posicoes.clear()
+        self._chaves.clear()
+        self._itens.clear()
+    
+    def __contains__(self, item: Hashable) -> bool:
+        if self._denso:
+            return 0 <= item < self.num_itens and self._posicoes[item] >= 0
+        return item in self._posicoes
+    
+    def __len__(self) -> int:
+        return len(self._itens)
+
+
+class FilaDial:
+    """
+    Fila de baldes de Dial para prioridades inteiras.
+    
+    Em Dijkstra com pesos inteiros em [0, C], toda prioridade na fila está
+    entre a última removida e ela + C; basta um vetor circular de C + 1
+    baldes, indexado por prioridade mod (C + 1). Inserir e remover são
+    append/pop de lista, sem comparações nem tuplas.
+    """
+    
+    __slots__ = ('_baldes', '_num_baldes', '_atual', '_tamanho', 'peso_max')
+    
+    def __init__(self, peso_max: int):
+        """
+        Args:
+            peso_max: Maior peso de aresta do grafo (C)
+        """
+        self.peso_max = peso_max
+        self._num_baldes = peso_max + 1
+        self._baldes: List[List[int]] = [[] for _ in range(self._num_baldes)]
+        self._atual = 0
+        self._tamanho = 0
+    
+    def inserir(self, prioridade: int, item: int) -> None:
+        """Insere item; prioridade deve estar entre a última removida e ela + peso_max."""
+        self._baldes[prioridade % self._num_baldes].append(item)
+        self._tamanho += 1
+    
+    def remover_minimo(self) -> Tuple[int, int]:
+        """Remove e retorna o par (prioridade, item) de menor prioridade."""
+        baldes, num_baldes, atual = self._baldes, self._num_baldes, self._atual
+        balde = baldes[atual % num_baldes]
+        while not balde:
+            atual += 1
+            balde = baldes[atual % num_baldes]
+        
+        self._atual = atual
+        self._tamanho -= 1
+        return atual, balde.pop()
+    
+    def esvaziar(self) -> None:
+        """
+        Remove todos os itens, para reutilizar os baldes em outra busca sem
+        realocá-los (uma busca que esvaziou a fila não custa nada aqui).
+        """
+        if self._tamanho:
+            for balde in self._baldes:
+                balde.clear()
+            self._tamanho = 0
+        self._atual = 0
+    
+    def __len__(self) -> int:
+        return self._tamanho
+
+
+class FilaRadix:
+    """
+    Radix heap para prioridades inteiras monótonas (nunca menores que a
+    última removida), como as do Dijkstra.
+    
+    O balde i guarda as prioridades cujo bit mais alto diferente da última
+    removida é o bit i - 1. Ao esvaziar o balde 0, o primeiro balde não vazio
+    é redistribuído em relação ao seu mínimo; cada entrada só desce de balde,
+    então cada uma é movida no máximo uma vez por bit.
+    """
+    
+    __slots__ = ('_chaves', '_itens', '_ultima', '_tamanho')
+    
+    def __init__(self):
+        self._chaves: List[List[int]] = [[] for _ in range(65)]
+        self._itens: List[List[int]] = [[] for _ in range(65)]
+        self._ultima = 0
+        self._tamanho = 0
+    
+    def inserir(self, prioridade: int, item: int) -> None:
+        """Insere item; prioridade não pode ser menor que a última removida."""
+        i = (prioridade ^ self._ultima).bit_length()
+        self._chaves[i].append(prioridade)
+        self._itens[i].append(item)
+        self._tamanho += 1
+    
+    def remover_minimo(self) -> Tuple[int, int]:
+        """Remove e retorna o par (prioridade, item) de menor prioridade."""
+        itens_zero = self._itens[0]
+        if not itens_zero:
+            chaves, itens = self._chaves, self._itens
+            i = 1
+            while not itens[i]:
+                i += 1
+            
+            chaves_balde, itens_balde = chaves[i], itens[i]
+            chaves[i], itens[i] = [], []
+            ultima = min(chaves_balde)
+            self._ultima = ultima
+            for prioridade, item in zip(chaves_balde, itens_balde):
+                j = (prioridade ^ ultima).bit_length()
+                chaves[j].append(prioridade)
+                itens[j].append(item)
+        
+        self._tamanho -= 1
+        self._chaves[0].pop()
+        return self._ultima, itens_zero.pop()
+    
+    def __len__(self) -> int:
+        return self._tamanho
+
+
+TIPOS_FILA = ('heap', 'indexado', 'dial', 'radix')
+
+
+def escolher_fila(peso_min: int, peso_max: int) -> str:
+    """
+    Escolhe a fila para um grafo de pesos inteiros em [peso_min, peso_max].
+    
+    A fila de Dial é usada para pesos pequenos; acima de LIMITE_DIAL fica o
+    heap binário. A radix heap não é escolhida automaticamente: em Python a
+    redistribuição dos baldes custa mais que o heapq (implementado em C).
+    
+    Returns:
+        'dial' ou 'heap'
+    """
+    if 0 <= peso_min and peso_max <= LIMITE_DIAL:
+        return 'dial'
+    return 'heap'
+
+
+def criar_fila(tipo: str, peso_max: int = 0, num_itens: Optional[int] = None):
+    """
+    Cria uma fila vazia do tipo dado.
+    
+    Args:
+        tipo: 'heap', 'indexado', 'dial' ou 'radix'
+        peso_max: Maior peso de aresta (usado pela fila de Dial)
+        num_itens: Número de vértices, se os itens forem os inteiros
+            0..num_itens-1 (usado pelo heap indexado)
+            
+    Returns:
+        Fila com os métodos inserir(prioridade, item), remover_minimo() e len()
+    """
+    if tipo == 'heap':
+        return FilaHeapBinario()
+    if tipo == 'indexado':
+        return FilaHeapIndexado(num_itens=num_itens)
+    if tipo == 'dial':
+        return FilaDial(peso_max)
+    if tipo == 'radix':
+        return FilaRadix()
+    raise ValueError(f"Tipo de fila desconhecido: {tipo}")
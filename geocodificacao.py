@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geocodificação com cache
+Camada na frente do geocodificador: cache em memória (LRU), cache persistente
+em SQLite (inclusive dos endereços não encontrados) e backends plugáveis, como
+o Nominatim ou um arquivo local de endereços para uso sem rede
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Quantidade de endereços mantidos no cache em memória
+TAMANHO_LRU = 1024
+
+# Por quanto tempo (segundos) um endereço não encontrado deixa de ser consultado
+VALIDADE_NEGATIVA = 7 * 24 * 3600
+
+# Limite de requisições por segundo da política de uso do Nominatim
+LIMITE_NOMINATIM = 1.0
+
+
+def normalizar_endereco(endereco: str) -> str:
+    """
+    Forma canônica de um endereço, usada como chave dos caches.
+    
+    Remove acentos, passa para minúsculas e reduz pontuação e espaços
+    repetidos, mantendo as vírgulas que separam as partes do endereço
+    (ex: "Rua  Principal,Maricá" -> "rua principal, marica").
+    """
+    texto = unicodedata.normalize('NFKD', endereco).encode('ascii', 'ignore').decode('ascii').lower()
+    partes = (re.sub(r'[^a-z0-9]+', ' ', parte).strip() for parte in texto.split(','))
+    return ', '.join(parte for parte in partes if parte)
+
+
+class LimitadorTaxa:
+    """
+    Limita a taxa de requisições compartilhada por várias threads.
+    
+    Cada chamada a aguardar() reserva o próximo horário livre (um intervalo
+    de 1 / requisicoes_por_segundo depois do anterior) e dorme até ele, fora
+    da trava, para que as threads saiam uma de cada vez no ritmo permitido.
+    """
+    
+    def __init__(self, requisicoes_por_segundo: float):
+        """
+        Args:
+            requisicoes_por_segundo: Taxa máxima (> 0)
+        """
+        if requisicoes_por_segundo <= 0:
+            raise ValueError("requisicoes_por_segundo deve ser positivo")
+        self.intervalo = 1.0 / requisicoes_por_segundo
+        self._proxima = 0.0
+        self._trava = threading.Lock()
+    
+    def aguardar(self) -> None:
+        """Bloqueia até o horário reservado para a próxima requisição."""
+        with self._trava:
+            agora = time.monotonic()
+            horario = max(agora, self._proxima)
+            self._proxima = horario + self.intervalo
+        if horario > agora:
+            time.sleep(horario - agora)
+
+
+# ============================================
+# BACKENDS
+# ============================================
+class BackendNominatim:
+    """Geocodificação pelo serviço Nominatim do OpenStreetMap (requer rede)."""
+    
+    def __init__(self, user_agent: str = "dijkstra_marica", timeout: float = 10):
+        """
+        Args:
+            user_agent: Identificação da aplicação exigida pelo Nominatim
+            timeout: Tempo máximo de cada requisição (segundos)
+        """
+        # Importado aqui para que os backends locais funcionem sem o geopy
+        from geopy.geocoders import Nominatim
+        
+        self.geocoder = Nominatim(user_agent=user_agent)
+        self.timeout = timeout
+    
+    def geocodificar(self, endereco: str) -> Optional[Tuple[float, float]]:
+        """
+        Consulta o Nominatim.
+        
+        Returns:
+            Tupla (lat, lon) ou None se não encontrou; erros de rede são
+            propagados (e não entram no cache)
+        """
+        location = self.geocoder.geocode(endereco, timeout=self.timeout)
+        if location:
+            return (location.latitude, location.longitude)
+        return None
+
+
+class BackendGazetteer:
+    """
+    Geocodificação a partir de um arquivo local de endereços (sem rede).
+    
+    O arquivo é um CSV com cabeçalho endereco,lat,lon. Uma consulta que não
+    esteja no arquivo é repetida sem as últimas partes (cidade, estado,
+    país), de modo que "Praça Central, Maricá, RJ, Brasil" encontra a
+    entrada "Praça Central, Maricá" ou "Praça Central".
+    """
+    
+    def __init__(self, caminho_arquivo: Optional[str] = None,
+                 enderecos: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Args:
+            caminho_arquivo: CSV de endereços (opcional)
+            enderecos: Endereços adicionais {endereco: (lat, lon)} (opcional)
+        """
+        self.enderecos: Dict[str, Tuple[float, float]] = {}
+        if caminho_arquivo is not None:
+            with open(caminho_arquivo, encoding='utf-8', newline='') as arquivo:
+                for linha in csv.DictReader(arquivo):
+                    self.enderecos[normalizar_endereco(linha['endereco'])] = (float(linha['lat']), float(linha['lon']))
+        for endereco, coordenadas in (enderecos or {}).items():
+            self.enderecos[normalizar_endereco(endereco)] = coordenadas
+    
+    def geocodificar(self, endereco: str) -> Optional[Tuple[float, float]]:
+        """Procura o endereço, e seus prefixos, no arquivo; None se não encontrou."""
+        partes = normalizar_endereco(endereco).split(', ')
+        for fim in range(len(partes), 0, -1):
+            coordenadas = self.enderecos.get(', '.join(partes[:fim]))
+            if coordenadas is not None:
+                return coordenadas
+        return None
+
+
+class BackendEmCadeia:
+    """Consulta vários backends em ordem e retorna a primeira resposta encontrada."""
+    
+    def __init__(self, backends: Sequence):
+        """
+        Args:
+            backends: Backends com o método geocodificar(endereco)
+        """
+        self.backends: List = list(backends)
+    
+    def geocodificar(self, endereco: str) -> Optional[Tuple[float, float]]:
+        """Primeiro resultado entre os backends, ou None se nenhum encontrou."""
+        for backend in self.backends:
+            coordenadas = backend.geocodificar(endereco)
+            if coordenadas is not None:
+                return coordenadas
+        return None
+
+
+# ============================================
+# CACHE
+# ============================================
+class Geocodificador:
+    """
+    Geocodificador com cache em dois níveis na frente de um backend.
+    
+    Cada endereço é procurado, pela forma normalizada, primeiro no LRU em
+    memória, depois no SQLite e só então no backend. Endereços não
+    encontrados também são guardados (cache negativo), por VALIDADE_NEGATIVA
+    segundos; erros do backend (rede, tempo esgotado) não são guardados.
+    Pode ser usado por várias threads ao mesmo tempo; só as consultas ao
+    backend passam pelo limite de requisições por segundo.
+    """
+    
+    def __init__(self, backend, caminho_cache: Optional[str] = None, tamanho_lru: int = TAMANHO_LRU,
+                 validade_negativa: float = VALIDADE_NEGATIVA,
+                 requisicoes_por_segundo: Optional[float] = None):
+        """
+        Args:
+            backend: Objeto com o método geocodificar(endereco) -> (lat, lon) ou None
+            caminho_cache: Arquivo SQLite do cache persistente (None = só memória)
+            tamanho_lru: Quantidade de endereços no cache em memória
+            validade_negativa: Segundos em que um endereço não encontrado fica no cache
+            requisicoes_por_segundo: Limite de consultas ao backend (None = sem limite)
+        """
+        self.backend = backend
+        self.caminho_cache = caminho_cache
+        self.tamanho_lru = tamanho_lru
+        self.validade_negativa = validade_negativa
+        
+        # endereço normalizado -> ((lat, lon) ou None, instante de expiração)
+        self._lru: 'OrderedDict[str, Tuple[Optional[Tuple[float, float]], float]]' = OrderedDict()
+        self._trava = threading.Lock()
+        self._conexao: Optional[sqlite3.Connection] = None
+        self._limitador: Optional[LimitadorTaxa] = None
+        if requisicoes_por_segundo is not None:
+            self._limitador = LimitadorTaxa(requisicoes_por_segundo)
+        
+        # Contadores de onde vieram as respostas
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.consultas_backend = 0
+    
+    def _banco(self) -> Optional[sqlite3.Connection]:
+        """Abre (na primeira vez) o SQLite do cache persistente."""
+        if self._conexao is None and self.caminho_cache is not None:
+            diretorio = os.path.dirname(self.caminho_cache)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            self._conexao = sqlite3.connect(self.caminho_cache, check_same_thread=False)
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS geocodificacao "
+                "(endereco TEXT PRIMARY KEY, lat REAL, lon REAL, expira REAL)"
+            )
+            self._conexao.commit()
+        return self._conexao
+    
+    def _guardar_memoria(self, chave: str, resultado: Optional[Tuple[float, float]], expira: float) -> None:
+        """Insere no LRU, descartando o endereço usado há mais tempo se estiver cheio."""
+        self._lru[chave] = (resultado, expira)
+        self._lru.move_to_end(chave)
+        if len(self._lru) > self.tamanho_lru:
+            self._lru.popitem(last=False)
+    
+    def _procurar_cache(self, chave: str) -> Tuple[bool, Optional[Tuple[float, float]]]:
+        """Procura no LRU e no SQLite; retorna (encontrado, resultado)."""
+        agora = time.time()
+        with self._trava:
+            if chave in self._lru:
+                resultado, expira = self._lru[chave]
+                if expira > agora:
+                    self._lru.move_to_end(chave)
+                    self.acertos_memoria += 1
+                    return True, resultado
+                del self._lru[chave]
+            
+            banco = self._banco()
+            if banco is None:
+                return False, None
+            linha = banco.execute("SELECT lat, lon, expira FROM geocodificacao WHERE endereco = ?",
+                                  (chave,)).fetchone()
+            if linha is None or linha[2] <= agora:
+                return False, None
+            
+            resultado = None if linha[0] is None else (linha[0], linha[1])
+            self._guardar_memoria(chave, resultado, linha[2])
+            self.acertos_disco += 1
+            return True, resultado
+    
+    def _guardar(self, chave: str, resultado: Optional[Tuple[float, float]]) -> None:
+        """Guarda a resposta do backend nos dois níveis de cache."""
+        expira = float('inf') if resultado is not None else time.time() + self.validade_negativa
+        lat, lon = resultado if resultado is not None else (None, None)
+        with self._trava:
+            self._guardar_memoria(chave, resultado, expira)
+            banco = self._banco()
+            if banco is not None:
+                banco.execute("INSERT OR REPLACE INTO geocodificacao VALUES (?, ?, ?, ?)",
+                              (chave, lat, lon, expira))
+                banco.commit()
+    
+    def geocodificar(self, endereco: str) -> Optional[Tuple[float, float]]:
+        """
+        Converte um endereço em coordenadas, consultando o backend só se o
+        endereço não estiver em nenhum cache.
+        
+        Args:
+            endereco: Endereço completo, como seria enviado ao backend
+            
+        Returns:
+            Tupla (lat, lon) ou None se não encontrou
+        """
+        chave = normalizar_endereco(endereco)
+        encontrado, resultado = self._procurar_cache(chave)
+        if encontrado:
+            return resultado
+        
+        if self._limitador is not None:
+            self._limitador.aguardar()
+        resultado = self.backend.geocodificar(endereco)
+        with self._trava:
+            self.consultas_backend += 1
+        self._guardar(chave, resultado)
+        return resultado
+    
+    def limpar(self) -> None:
+        """Esvazia os dois níveis de cache."""
+        with self._trava:
+            self._lru.clear()
+            banco = self._banco()
+            if banco is not None:
+                banco.execute("DELETE FROM geocodificacao")
+                banco.commit()
+    
+    def fechar(self) -> None:
+        """Fecha o arquivo SQLite (é reaberto se o cache voltar a ser usado)."""
+        with self._trava:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
@@ -5,14 +5,29 @@ Sistema de Grafos com Randomização
 Implementa um grafo ponderado com randomização de arestas e pesos
 """
 
+import math
 import random
-from typing import Dict, List, Tuple, Optional, Set
+from array import array
+from bisect import bisect_left
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Set
+
+import numpy as np
 
 
 class Grafo:
-    """Classe que representa um grafo ponderado não direcionado."""
+    """
+    Classe que representa um grafo ponderado não direcionado.
+    
+    As arestas ficam no dicionário `arestas`; as listas de adjacência são uma
+    visão derivada, descartada por compilar() e remontada a partir da forma
+    CSR só se alguém voltar a usá-las. Para grafos grandes, que não precisam
+    ser alterados, prefira montar diretamente GrafoCSR.de_arrays (aceito por
+    Dijkstra e AplicacoesDijkstra), sem nenhum objeto Python por aresta.
+    """
     
-    def __init__(self, num_vertices: int, densidade: float = 0.3, peso_min: int = 1, peso_max: int = 100):
+    def __init__(self, num_vertices: int, densidade: float = 0.3, peso_min: int = 1, peso_max: int = 100,
+                 gerador: str = 'padrao', semente: Optional[int] = None):
         """
         Inicializa um grafo com randomização.
         
@@ -21,22 +36,146 @@ class Grafo:
             densidade: Probabilidade de existir aresta entre dois vértices (0.0 a 1.0)
             peso_min: Peso mínimo das arestas
             peso_max: Peso máximo das arestas
+            gerador: 'padrao' (sorteia cada par de vértices), 'geometrico'
+                (tempo proporcional ao número de arestas, indicado para grafos esparsos)
+                ou 'numpy' (sorteio vetorizado em lote, indicado para grafos densos)
+            semente: Semente do gerador aleatório próprio desta instância
+                (None = aleatório). Não altera o estado global do módulo random.
         """
         self.num_vertices = num_vertices
         self.vertices = list(range(num_vertices))
         self.arestas: Dict[Tuple[int, int], int] = {}
-        self.adjacencia: Dict[int, List[Tuple[int, int]]] = {v: [] for v in self.vertices}
+        # Listas de adjacência (None = descartadas, remontadas sob demanda)
+        self._adjacencia: Optional[Dict[int, List[Tuple[int, int]]]] = {v: [] for v in self.vertices}
+        
+        # Versão incrementada a cada alteração; invalida a forma compilada (CSR)
+        self.versao = 0
+        self._csr: Optional['GrafoCSR'] = None
         
-        self._gerar_grafo_aleatorio(densidade, peso_min, peso_max)
+        # Union-Find mantido a cada aresta adicionada (componentes conexos)
+        self._pai: List[int] = list(range(num_vertices))
+        self._rank = bytearray(num_vertices)
+        self._raizes: Set[int] = set(self.vertices)
+        
+        # Geradores aleatórios próprios: grafos criados em paralelo não compartilham estado
+        self.semente = semente
+        self._rng = random.Random(semente)
+        self._rng_numpy = np.random.default_rng(semente)
+        
+        self._gerar_grafo_aleatorio(densidade, peso_min, peso_max, gerador)
     
-    def _gerar_grafo_aleatorio(self, densidade: float, peso_min: int, peso_max: int) -> None:
+    def _gerar_grafo_aleatorio(self, densidade: float, peso_min: int, peso_max: int, gerador: str = 'padrao') -> None:
         """Gera arestas aleatórias com pesos aleatórios."""
+        if gerador == 'numpy':
+            self._gerar_grafo_numpy(densidade, peso_min, peso_max)
+            return
+        if gerador == 'geometrico' and densidade < 1.0:
+            self._gerar_grafo_geometrico(densidade, peso_min, peso_max)
+            return
+        if gerador not in ('padrao', 'geometrico'):
+            raise ValueError(f"Gerador de grafo desconhecido: {gerador}")
+        
+        rng = self._rng
         for i in range(self.num_vertices):
             for j in range(i + 1, self.num_vertices):
-                if random.random() < densidade:
-                    peso = random.randint(peso_min, peso_max)
+                if rng.random() < densidade:
+                    peso = rng.randint(peso_min, peso_max)
                     self.adicionar_aresta(i, j, peso)
     
+    def _gerar_grafo_geometrico(self, densidade: float, peso_min: int, peso_max: int) -> None:
+        """
+        Gera arestas aleatórias pulando diretamente para o próximo par sorteado.
+        
+        Cada par (i, j) continua tendo probabilidade `densidade` de virar aresta,
+        mas em vez de sortear todos os n²/2 pares, sorteia o tamanho do salto até
+        o próximo sucesso (distribuição geométrica). O custo é O(n + arestas).
+        """
+        if densidade <= 0.0 or self.num_vertices < 2:
+            return
+        
+        rng = self._rng
+        log_falha = math.log(1.0 - densidade)
+        ultimo = self.num_vertices - 1
+        
+        # Par corrente (i, j); j = i significa "antes do primeiro par da linha i"
+        i, j = 0, 0
+        while True:
+            # Número de pares pulados antes do próximo sucesso
+            j += 1 + int(math.log(1.0 - rng.random()) / log_falha)
+            
+            # Avança linhas enquanto o salto ultrapassar o fim da linha i
+            while j > ultimo and i < ultimo:
+                i += 1
+                j = j - self.num_vertices + i + 1
+            
+            if i >= ultimo:
+                break
+            
+            peso = rng.randint(peso_min, peso_max)
+            self.adicionar_aresta(i, j, peso)
+    
+    def _gerar_grafo_numpy(self, densidade: float, peso_min: int, peso_max: int,
+                           pares_por_bloco: int = 4_000_000) -> None:
+        """
+        Gera arestas e pesos em lote com o numpy.random.Generator da instância.
+        
+        As linhas da matriz de adjacência são sorteadas em blocos de até
+        `pares_por_bloco` pares, limitando o uso de memória em grafos grandes.
+        """
+        n = self.num_vertices
+        rng = self._rng_numpy
+        linhas_por_bloco = max(1, pares_por_bloco // max(n, 1))
+        colunas = np.arange(n)
+        
+        blocos_origem, blocos_destino, blocos_peso = [], [], []
+        for inicio in range(0, n, linhas_por_bloco):
+            fim = min(n, inicio + linhas_por_bloco)
+            linhas = np.arange(inicio, fim)[:, None]
+            mascara = (rng.random((fim - inicio, n)) < densidade) & (colunas > linhas)
+            origens, destinos = np.nonzero(mascara)
+            blocos_origem.append(origens + inicio)
+            blocos_destino.append(destinos)
+            blocos_peso.append(rng.integers(peso_min, peso_max, size=len(origens), endpoint=True))
+        
+        if blocos_origem:
+            self._carregar_arestas(np.concatenate(blocos_origem), np.concatenate(blocos_destino),
+                                   np.concatenate(blocos_peso))
+    
+    def _carregar_arestas(self, origens: np.ndarray, destinos: np.ndarray, pesos: np.ndarray) -> None:
+        """
+        Carrega em lote arestas distintas (origens[k] < destinos[k]) em um grafo
+        sem arestas, preenchendo também a forma compilada diretamente dos arrays.
+        """
+        lista_origens, lista_destinos = origens.tolist(), destinos.tolist()
+        self.arestas.update(zip(zip(lista_origens, lista_destinos), pesos.tolist()))
+        self.versao += 1
+        
+        for v1, v2 in zip(lista_origens, lista_destinos):
+            self._unir(v1, v2)
+            # Grafos densos ficam conexos cedo; o restante das arestas não muda nada
+            if len(self._raizes) == 1:
+                break
+        
+        # As listas de adjacência só são montadas (da forma compilada) se forem usadas
+        self._csr = GrafoCSR.de_arrays(self.num_vertices, origens, destinos, pesos, versao=self.versao)
+        self._adjacencia = None
+    
+    @property
+    def adjacencia(self) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        Listas de (vizinho, peso) de cada vértice. Depois de compilar() são
+        remontadas a partir da forma CSR na primeira consulta, com os
+        vizinhos em ordem crescente.
+        """
+        if self._adjacencia is None:
+            csr = self.compilar()
+            offsets, vizinhos, pesos = csr.offsets, csr.vizinhos, csr.pesos
+            self._adjacencia = {
+                v: list(zip(vizinhos[offsets[v]:offsets[v + 1]], pesos[offsets[v]:offsets[v + 1]]))
+                for v in self.vertices
+            }
+        return self._adjacencia
+    
     def adicionar_aresta(self, v1: int, v2: int, peso: int) -> None:
         """Adiciona uma aresta entre dois vértices com um peso."""
         if v1 == v2:
@@ -46,9 +185,50 @@ class Grafo:
         aresta = (min(v1, v2), max(v1, v2))
         self.arestas[aresta] = peso
         
-        # Adiciona nas listas de adjacência
-        self.adjacencia[v1].append((v2, peso))
-        self.adjacencia[v2].append((v1, peso))
+        # Adiciona nas listas de adjacência, se não foram descartadas
+        if self._adjacencia is not None:
+            self._adjacencia[v1].append((v2, peso))
+            self._adjacencia[v2].append((v1, peso))
+        self.versao += 1
+        self._unir(v1, v2)
+    
+    def _encontrar(self, vertice: int) -> int:
+        """Retorna a raiz do conjunto do vértice (iterativo, com compressão de caminho)."""
+        pai = self._pai
+        raiz = vertice
+        while pai[raiz] != raiz:
+            raiz = pai[raiz]
+        
+        while pai[vertice] != raiz:
+            pai[vertice], vertice = raiz, pai[vertice]
+        
+        return raiz
+    
+    def _unir(self, v1: int, v2: int) -> None:
+        """Une os conjuntos de v1 e v2 (união por rank)."""
+        r1, r2 = self._encontrar(v1), self._encontrar(v2)
+        if r1 == r2:
+            return
+        
+        if self._rank[r1] < self._rank[r2]:
+            r1, r2 = r2, r1
+        self._pai[r2] = r1
+        if self._rank[r1] == self._rank[r2]:
+            self._rank[r1] += 1
+        self._raizes.discard(r2)
+    
+    def componente(self, vertice: int) -> int:
+        """Retorna o representante do componente conexo do vértice."""
+        return self._encontrar(vertice)
+    
+    def mesmo_componente(self, v1: int, v2: int) -> bool:
+        """Verifica se v1 e v2 estão no mesmo componente conexo."""
+        return self._encontrar(v1) == self._encontrar(v2)
+    
+    @property
+    def num_componentes(self) -> int:
+        """Número de componentes conexos do grafo."""
+        return len(self._raizes)
     
     def obter_peso(self, v1: int, v2: int) -> Optional[int]:
         """Retorna o peso da aresta entre v1 e v2, ou None se não existir."""
@@ -57,7 +237,9 @@ class Grafo:
     
     def obter_vizinhos(self, vertice: int) -> List[Tuple[int, int]]:
         """Retorna lista de (vizinho, peso) para um vértice."""
-        return self.adjacencia.get(vertice, [])
+        if self._adjacencia is None:
+            return self.compilar().obter_vizinhos(vertice)
+        return self._adjacencia.get(vertice, [])
     
     def tem_aresta(self, v1: int, v2: int) -> bool:
         """Verifica se existe aresta entre v1 e v2."""
@@ -68,38 +250,211 @@ class Grafo:
         """Retorna lista de todas as arestas no formato (v1, v2, peso)."""
         return [(v1, v2, peso) for (v1, v2), peso in self.arestas.items()]
     
+    @property
+    def num_arestas(self) -> int:
+        """Número de arestas (não direcionadas) do grafo."""
+        return len(self.arestas)
+    
+    def compilar(self) -> 'GrafoCSR':
+        """
+        Retorna a forma compacta e imutável (CSR) do grafo.
+        
+        A compilação é feita uma única vez por versão do grafo: enquanto
+        nenhuma aresta for adicionada, chamadas seguintes reutilizam o mesmo objeto.
+        As arestas vão direto do dicionário para arrays NumPy (GrafoCSR.de_arrays),
+        e as listas de adjacência são descartadas, já que a forma compilada
+        responde pelas mesmas consultas.
+        
+        Returns:
+            Instância de GrafoCSR equivalente ao grafo atual
+        """
+        if self._csr is None or self._csr.versao != self.versao:
+            m = len(self.arestas)
+            extremos = np.fromiter(chain.from_iterable(self.arestas), dtype=np.int64, count=2 * m).reshape(m, 2)
+            pesos = np.fromiter(self.arestas.values(), dtype=np.int64, count=m)
+            self._csr = GrafoCSR.de_arrays(self.num_vertices, extremos[:, 0], extremos[:, 1], pesos,
+                                           versao=self.versao)
+            self._adjacencia = None
+        return self._csr
+    
     def garantir_conectividade(self) -> None:
-        """Garante que o grafo seja conexo adicionando arestas mínimas se necessário."""
-        # Usa Union-Find para verificar componentes conexos
-        parent = list(range(self.num_vertices))
-        
-        def find(x: int) -> int:
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
-        
-        def union(x: int, y: int) -> None:
-            px, py = find(x), find(y)
-            if px != py:
-                parent[px] = py
-        
-        # Processa arestas existentes
-        for (v1, v2), _ in self.arestas.items():
-            union(v1, v2)
-        
-        # Adiciona arestas para conectar componentes desconexos
-        componentes = {}
-        for v in self.vertices:
-            comp = find(v)
-            if comp not in componentes:
-                componentes[comp] = []
-            componentes[comp].append(v)
-        
-        # Conecta componentes
-        comps = list(componentes.values())
-        for i in range(len(comps) - 1):
-            v1 = random.choice(comps[i])
-            v2 = random.choice(comps[i + 1])
-            peso = random.randint(1, 50)
-            self.adicionar_aresta(v1, v2, peso)
+        """
+        Garante que o grafo seja conexo adicionando arestas mínimas se necessário.
+        
+        Usa o Union-Find mantido por adicionar_aresta: liga os representantes
+        de componentes consecutivos, com custo proporcional ao número de componentes.
+        """
+        raizes = sorted(self._raizes)
+        for i in range(len(raizes) - 1):
+            peso = self._rng.randint(1, 50)
+            self.adicionar_aresta(raizes[i], raizes[i + 1], peso)
+
 
+class GrafoCSR:
+    """
+    Representação compacta e imutável (Compressed Sparse Row) de um grafo
+    ponderado não direcionado.
+    
+    Os vizinhos do vértice v ocupam as posições offsets[v] até offsets[v + 1]
+    dos arrays vizinhos e pesos, ordenados pelo índice do vizinho. Cada aresta
+    aparece duas vezes (uma por sentido), usando 8 bytes por sentido.
+    """
+    
+    __slots__ = ('num_vertices', 'offsets', 'vizinhos', 'pesos', 'versao', '_rotulos')
+    
+    def __init__(self, num_vertices: int, offsets: array, vizinhos: array, pesos: array, versao: int = 0):
+        """
+        Inicializa a estrutura a partir de arrays já montados.
+        
+        Args:
+            num_vertices: Número de vértices
+            offsets: Array com num_vertices + 1 posições de início de cada linha
+            vizinhos: Array com o vizinho de cada entrada
+            pesos: Array com o peso de cada entrada
+            versao: Versão do Grafo de origem (usada para invalidar caches)
+        """
+        self.num_vertices = num_vertices
+        self.offsets = offsets
+        self.vizinhos = vizinhos
+        self.pesos = pesos
+        self.versao = versao
+        self._rotulos: Optional[array] = None
+    
+    @classmethod
+    def de_arestas(cls, num_vertices: int, arestas: Iterable[Tuple[int, int, int]], versao: int = 0) -> 'GrafoCSR':
+        """
+        Constrói a forma CSR a partir de arestas (v1, v2, peso) distintas.
+        
+        Args:
+            num_vertices: Número de vértices
+            arestas: Iterável de arestas não direcionadas, sem pares repetidos
+            versao: Versão do Grafo de origem
+            
+        Returns:
+            Nova instância de GrafoCSR
+        """
+        # As triplas vão direto para um array, sem lista intermediária de tuplas
+        dados = np.fromiter(chain.from_iterable(arestas), dtype=np.int64).reshape(-1, 3)
+        dados = dados[dados[:, 0] != dados[:, 1]]
+        return cls.de_arrays(num_vertices, dados[:, 0], dados[:, 1], dados[:, 2], versao)
+    
+    @classmethod
+    def de_arrays(cls, num_vertices: int, origens: np.ndarray, destinos: np.ndarray, pesos: np.ndarray,
+                  versao: int = 0) -> 'GrafoCSR':
+        """
+        Constrói a forma CSR de forma vetorizada a partir de arrays NumPy de
+        arestas distintas (origens[k], destinos[k], pesos[k]).
+        
+        Args:
+            num_vertices: Número de vértices
+            origens: Array com um extremo de cada aresta
+            destinos: Array com o outro extremo de cada aresta
+            pesos: Array com o peso de cada aresta
+            versao: Versão do Grafo de origem
+            
+        Returns:
+            Nova instância de GrafoCSR
+        """
+        linhas = np.concatenate([origens, destinos])
+        colunas = np.concatenate([destinos, origens])
+        valores = np.concatenate([pesos, pesos])
+        
+        # Ordena por linha e, dentro da linha, pelo vizinho
+        ordem = np.lexsort((colunas, linhas))
+        contagem = np.bincount(linhas, minlength=num_vertices)
+        
+        offsets = array('q', np.concatenate([[0], np.cumsum(contagem)]).astype(np.int64).tobytes())
+        vizinhos = array('i', colunas[ordem].astype(np.int32).tobytes())
+        pesos_csr = array('i', valores[ordem].astype(np.int32).tobytes())
+        return cls(num_vertices, offsets, vizinhos, pesos_csr, versao)
+    
+    def compilar(self) -> 'GrafoCSR':
+        """Já está compilado; retorna o próprio objeto."""
+        return self
+    
+    @property
+    def vertices(self) -> range:
+        """Vértices do grafo (0 a num_vertices - 1)."""
+        return range(self.num_vertices)
+    
+    @property
+    def num_arestas(self) -> int:
+        """Número de arestas (não direcionadas) do grafo."""
+        return len(self.vizinhos) // 2
+    
+    def grau(self, vertice: int) -> int:
+        """Retorna o grau de um vértice."""
+        return self.offsets[vertice + 1] - self.offsets[vertice]
+    
+    def obter_vizinhos(self, vertice: int) -> List[Tuple[int, int]]:
+        """Retorna lista de (vizinho, peso) para um vértice."""
+        if vertice < 0 or vertice >= self.num_vertices:
+            return []
+        inicio, fim = self.offsets[vertice], self.offsets[vertice + 1]
+        return list(zip(self.vizinhos[inicio:fim], self.pesos[inicio:fim]))
+    
+    def _posicao(self, v1: int, v2: int) -> int:
+        """Retorna a posição da entrada v1 -> v2 nos arrays, ou -1 se não existir."""
+        if v1 < 0 or v1 >= self.num_vertices:
+            return -1
+        inicio, fim = self.offsets[v1], self.offsets[v1 + 1]
+        i = bisect_left(self.vizinhos, v2, inicio, fim)
+        if i < fim and self.vizinhos[i] == v2:
+            return i
+        return -1
+    
+    def obter_peso(self, v1: int, v2: int) -> Optional[int]:
+        """Retorna o peso da aresta entre v1 e v2, ou None se não existir."""
+        i = self._posicao(v1, v2)
+        return self.pesos[i] if i >= 0 else None
+    
+    def tem_aresta(self, v1: int, v2: int) -> bool:
+        """Verifica se existe aresta entre v1 e v2."""
+        return self._posicao(v1, v2) >= 0
+    
+    @property
+    def rotulos_componentes(self) -> array:
+        """
+        Rótulo do componente conexo de cada vértice, calculado uma única vez
+        (busca em largura sobre os arrays) na primeira consulta.
+        """
+        if self._rotulos is None:
+            offsets, vizinhos = self.offsets, self.vizinhos
+            rotulos = array('i', [-1]) * self.num_vertices
+            rotulo = 0
+            for inicio in range(self.num_vertices):
+                if rotulos[inicio] != -1:
+                    continue
+                rotulos[inicio] = rotulo
+                fronteira = [inicio]
+                while fronteira:
+                    v = fronteira.pop()
+                    for vizinho in vizinhos[offsets[v]:offsets[v + 1]]:
+                        if rotulos[vizinho] == -1:
+                            rotulos[vizinho] = rotulo
+                            fronteira.append(vizinho)
+                rotulo += 1
+            self._rotulos = rotulos
+        return self._rotulos
+    
+    def componente(self, vertice: int) -> int:
+        """Retorna o rótulo do componente conexo do vértice."""
+        return self.rotulos_componentes[vertice]
+    
+    def mesmo_componente(self, v1: int, v2: int) -> bool:
+        """Verifica se v1 e v2 estão no mesmo componente conexo."""
+        rotulos = self.rotulos_componentes
+        return rotulos[v1] == rotulos[v2]
+    
+    def iterar_arestas(self) -> Iterator[Tuple[int, int, int]]:
+        """Itera sobre as arestas no formato (v1, v2, peso), com v1 < v2."""
+        offsets, vizinhos, pesos = self.offsets, self.vizinhos, self.pesos
+        for v1 in range(self.num_vertices):
+            for i in range(offsets[v1], offsets[v1 + 1]):
+                v2 = vizinhos[i]
+                if v2 > v1:
+                    yield v1, v2, pesos[i]
+    
+    def obter_todas_arestas(self) -> List[Tuple[int, int, int]]:
+        """Retorna lista de todas as arestas no formato (v1, v2, peso)."""
+        return list(self.iterar_arestas())
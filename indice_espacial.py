@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice espacial em grade para o grafo de ruas
+Encontra o nó (ou o trecho de rua) mais próximo de coordenadas, uma a uma ou
+em lote, usando só numpy, sobre as coordenadas projetadas em metros
+"""
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Raio médio da Terra (mesmo valor usado pelo OSMnx)
+RAIO_TERRA_METROS = 6371009.0
+
+# Média de nós por célula da grade
+NOS_POR_CELULA = 2
+
+
+class _Grade:
+    """
+    Grade uniforme de células quadradas; cada célula lista os itens que a tocam.
+    
+    Os itens de cada célula ficam em itens[offsets[c]:offsets[c + 1]] (forma
+    CSR), com as células numeradas linha a linha.
+    """
+    
+    def __init__(self, x0: float, y0: float, tamanho: float, colunas: int, linhas: int,
+                 celulas: np.ndarray, itens: np.ndarray):
+        """
+        Args:
+            x0, y0: Canto inferior esquerdo da grade (metros)
+            tamanho: Lado de cada célula (metros)
+            colunas, linhas: Dimensões da grade
+            celulas: Célula de cada entrada (um item pode ter várias entradas)
+            itens: Item de cada entrada
+        """
+        self.x0 = x0
+        self.y0 = y0
+        self.tamanho = tamanho
+        self.colunas = colunas
+        self.linhas = linhas
+        
+        ordem = np.argsort(celulas, kind='stable')
+        self.itens = itens[ordem]
+        self.offsets = np.zeros(colunas * linhas + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum(np.bincount(celulas, minlength=colunas * linhas))
+    
+    def coluna_linha(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Coluna e linha da célula de cada ponto, limitadas às bordas da grade."""
+        colunas = np.clip(((xs - self.x0) // self.tamanho).astype(np.int64), 0, self.colunas - 1)
+        linhas = np.clip(((ys - self.y0) // self.tamanho).astype(np.int64), 0, self.linhas - 1)
+        return colunas, linhas
+    
+    def anel(self, coluna: int, linha: int, raio: int) -> np.ndarray:
+        """Itens das células a exatamente raio células (distância de Chebyshev) de (coluna, linha)."""
+        partes = []
+        for l in range(max(linha - raio, 0), min(linha + raio, self.linhas - 1) + 1):
+            borda = l == linha - raio or l == linha + raio
+            passo = 1 if borda else 2 * raio
+            for c in range(coluna - raio, coluna + raio + 1, max(passo, 1)):
+                if 0 <= c < self.colunas:
+                    celula = l * self.colunas + c
+                    partes.append(self.itens[self.offsets[celula]:self.offsets[celula + 1]])
+        return np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
+    
+    def raio_maximo(self) -> int:
+        """Maior anel que ainda toca a grade."""
+        return max(self.colunas, self.linhas)
+
+
+class IndiceEspacial:
+    """
+    Índice espacial dos nós e, opcionalmente, dos trechos de rua.
+    
+    As coordenadas são projetadas em metros (projeção equirretangular centrada
+    na região, com erro desprezível na escala de uma cidade) e distribuídas em
+    uma grade uniforme. A consulta examina a célula do ponto e os anéis de
+    células em volta, parando quando nenhuma célula mais distante pode ter um
+    candidato melhor; o resultado é sempre o mais próximo exato na projeção.
+    """
+    
+    def __init__(self, lats: np.ndarray, lons: np.ndarray,
+                 origens: Optional[np.ndarray] = None, destinos: Optional[np.ndarray] = None):
+        """
+        Constrói o índice.
+        
+        Args:
+            lats: Latitude de cada nó (NaN = nó sem coordenadas, fica fora do índice)
+            lons: Longitude de cada nó
+            origens: Índice do nó inicial de cada trecho de rua (opcional)
+            destinos: Índice do nó final de cada trecho de rua (opcional)
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        com_coordenadas = np.isfinite(lats) & np.isfinite(lons)
+        validos = np.flatnonzero(com_coordenadas)
+        
+        self.num_nos = len(lats)
+        self._lat0 = float(np.mean(lats[validos])) if len(validos) else 0.0
+        self._cos_lat0 = math.cos(math.radians(self._lat0))
+        self.xs, self.ys = self.projetar(lats, lons)
+        
+        self._grade_nos: Optional[_Grade] = None
+        if len(validos):
+            xs, ys = self.xs[validos], self.ys[validos]
+            area = max(float(np.ptp(xs)) * float(np.ptp(ys)), 1.0)
+            tamanho = max(math.sqrt(area * NOS_POR_CELULA / len(validos)), 1.0)
+            self._grade_nos = self._montar_grade(xs, ys, xs, ys, validos, tamanho)
+        
+        # Trechos de rua (sem sentido: u -> v e v -> u são o mesmo segmento)
+        self._grade_trechos: Optional[_Grade] = None
+        if origens is not None and self._grade_nos is not None:
+            # Par (menor, maior) codificado num inteiro, ordenado, sem repetições
+            u, v = np.asarray(origens, dtype=np.int64), np.asarray(destinos, dtype=np.int64)
+            chaves = np.sort(np.minimum(u, v) * self.num_nos + np.maximum(u, v))
+            chaves = chaves[np.concatenate(([True], chaves[1:] != chaves[:-1]))] if len(chaves) else chaves
+            pares = np.column_stack([chaves // self.num_nos, chaves % self.num_nos])
+            pares = pares[(pares[:, 0] != pares[:, 1]) & com_coordenadas[pares[:, 0]] & com_coordenadas[pares[:, 1]]]
+            # Nós distintos nas mesmas coordenadas formam trechos de comprimento
+            # zero, que não acrescentam nada aos trechos dos próprios nós
+            pares = pares[(self.xs[pares[:, 0]] != self.xs[pares[:, 1]])
+                          | (self.ys[pares[:, 0]] != self.ys[pares[:, 1]])]
+            self.trechos = pares
+            if len(pares):
+                x1, y1 = self.xs[pares[:, 0]], self.ys[pares[:, 0]]
+                x2, y2 = self.xs[pares[:, 1]], self.ys[pares[:, 1]]
+                tamanho = max(self._grade_nos.tamanho, float(np.mean(np.hypot(x2 - x1, y2 - y1))))
+                self._grade_trechos = self._montar_grade(np.minimum(x1, x2), np.minimum(y1, y2),
+                                                         np.maximum(x1, x2), np.maximum(y1, y2),
+                                                         np.arange(len(pares)), tamanho)
+    
+    def projetar(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Projeta latitudes/longitudes (graus) em coordenadas x, y em metros."""
+        xs = RAIO_TERRA_METROS * np.radians(np.asarray(lons, dtype=np.float64)) * self._cos_lat0
+        ys = RAIO_TERRA_METROS * np.radians(np.asarray(lats, dtype=np.float64))
+        return xs, ys
+    
+    def _desprojetar(self, x: float, y: float) -> Tuple[float, float]:
+        """Inverso de projetar, para um ponto."""
+        return math.degrees(y / RAIO_TERRA_METROS), math.degrees(x / (RAIO_TERRA_METROS * self._cos_lat0))
+    
+    def _montar_grade(self, x_min: np.ndarray, y_min: np.ndarray, x_max: np.ndarray, y_max: np.ndarray,
+                      itens: np.ndarray, tamanho: float) -> _Grade:
+        """Grade em que cada item entra em todas as células que sua caixa envolvente toca."""
+        x0, y0 = float(x_min.min()), float(y_min.min())
+        colunas = int((float(x_max.max()) - x0) // tamanho) + 1
+        linhas = int((float(y_max.max()) - y0) // tamanho) + 1
+        
+        c1 = ((x_min - x0) // tamanho).astype(np.int64)
+        l1 = ((y_min - y0) // tamanho).astype(np.int64)
+        largura = ((x_max - x0) // tamanho).astype(np.int64) - c1 + 1
+        altura = ((y_max - y0) // tamanho).astype(np.int64) - l1 + 1
+        
+        # Expande cada item em largura x altura entradas, uma por célula tocada
+        quantidades = largura * altura
+        entrada = np.repeat(np.arange(len(itens)), quantidades)
+        posicao = np.arange(int(quantidades.sum())) - np.repeat(np.cumsum(quantidades) - quantidades, quantidades)
+        celulas = (l1[entrada] + posicao // largura[entrada]) * colunas + c1[entrada] + posicao % largura[entrada]
+        return _Grade(x0, y0, tamanho, colunas, linhas, celulas, itens[entrada].astype(np.int64))
+    
+    # ============================================
+    # NÓ MAIS PRÓXIMO
+    # ============================================
+    def mais_proximo(self, lat: float, lon: float) -> Tuple[int, float]:
+        """
+        Nó mais próximo de uma coordenada.
+        
+        Args:
+            lat: Latitude (graus)
+            lon: Longitude (graus)
+            
+        Returns:
+            Tupla (indice_no, distancia_metros); (-1, inf) se o índice estiver vazio
+        """
+        indices, distancias = self.mais_proximos(np.array([lat]), np.array([lon]))
+        return int(indices[0]), float(distancias[0])
+    
+    def mais_proximos(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nó mais próximo de cada coordenada, em lote.
+        
+        As 3 x 3 células em volta de cada ponto são examinadas de uma vez para
+        todos os pontos; só os pontos cujo melhor candidato está mais longe que
+        uma célula (ou que não têm nenhum) seguem, um a um, para os anéis externos.
+        
+        Args:
+            lats: Latitudes (graus)
+            lons: Longitudes (graus)
+            
+        Returns:
+            Tupla (indices, distancias_metros), na ordem das coordenadas; as
+            coordenadas inválidas (NaN) ficam com (-1, inf)
+        """
+        qx, qy = self.projetar(lats, lons)
+        indices = np.full(len(qx), -1, dtype=np.int64)
+        distancias = np.full(len(qx), np.inf)
+        validas = np.isfinite(qx) & np.isfinite(qy)
+        if not validas.all():
+            indices[validas], distancias[validas] = self.mais_proximos(np.asarray(lats)[validas],
+                                                                       np.asarray(lons)[validas])
+            return indices, distancias
+        
+        n = len(qx)
+        grade = self._grade_nos
+        if grade is None or n == 0:
+            return indices, distancias
+        
+        # Intervalos dos itens das 9 células vizinhas de cada ponto
+        colunas, linhas = grade.coluna_linha(qx, qy)
+        vizinhas_c = colunas[:, None] + np.array([-1, 0, 1] * 3)
+        vizinhas_l = linhas[:, None] + np.repeat([-1, 0, 1], 3)
+        dentro = (vizinhas_c >= 0) & (vizinhas_c < grade.colunas) & (vizinhas_l >= 0) & (vizinhas_l < grade.linhas)
+        celulas = np.where(dentro, vizinhas_l * grade.colunas + vizinhas_c, 0)
+        inicios = grade.offsets[celulas]
+        quantidades = np.where(dentro, grade.offsets[celulas + 1] - inicios, 0).ravel()
+        
+        # Todos os pares (ponto, candidato) em arrays planos
+        total = int(quantidades.sum())
+        ponto = np.repeat(np.repeat(np.arange(n), 9), quantidades)
+        posicao = (np.repeat(inicios.ravel(), quantidades) + np.arange(total)
+                   - np.repeat(np.cumsum(quantidades) - quantidades, quantidades))
+        candidatos = grade.itens[posicao]
+        d2 = (self.xs[candidatos] - qx[ponto]) ** 2 + (self.ys[candidatos] - qy[ponto]) ** 2
+        
+        # Menor distância de cada ponto: ordena por (ponto, d2) e pega o primeiro de cada ponto
+        ordem = np.lexsort((d2, ponto))
+        primeiro = np.ones(total, dtype=bool)
+        primeiro[1:] = ponto[ordem][1:] != ponto[ordem][:-1]
+        escolhidos = ordem[primeiro]
+        indices[ponto[escolhidos]] = candidatos[escolhidos]
+        distancias[ponto[escolhidos]] = np.sqrt(d2[escolhidos])
+        
+        # Fora da grade ou sem candidato garantido nas 3 x 3 células: busca por anéis
+        dentro_grade = ((qx >= grade.x0) & (qy >= grade.y0)
+                        & (qx < grade.x0 + grade.colunas * grade.tamanho)
+                        & (qy < grade.y0 + grade.linhas * grade.tamanho))
+        for i in np.flatnonzero(~dentro_grade | (distancias > grade.tamanho)).tolist():
+            indices[i], distancias[i] = self._buscar_aneis(grade, qx[i], qy[i], self._distancias_nos)
+        
+        return indices, distancias
+    
+    def _distancias_nos(self, candidatos: np.ndarray, x: float, y: float) -> np.ndarray:
+        """Distância (metros) do ponto a cada nó candidato."""
+        return np.hypot(self.xs[candidatos] - x, self.ys[candidatos] - y)
+    
+    def _buscar_aneis(self, grade: _Grade, x: float, y: float, distancias) -> Tuple[int, float]:
+        """
+        Busca o item mais próximo percorrendo anéis de células cada vez maiores.
+        
+        Os itens das células do anel r ou além estão a pelo menos (r - 1)
+        células do ponto (e a pelo menos a distância do ponto até a grade); a
+        busca para quando o melhor encontrado já é menor que esse limite.
+        """
+        coluna, linha = (int(v[0]) for v in grade.coluna_linha(np.array([x]), np.array([y])))
+        # Distância do ponto até a grade (0 se estiver dentro)
+        fora = math.hypot(max(grade.x0 - x, 0.0, x - (grade.x0 + grade.colunas * grade.tamanho)),
+                          max(grade.y0 - y, 0.0, y - (grade.y0 + grade.linhas * grade.tamanho)))
+        
+        melhor, melhor_distancia = -1, math.inf
+        for raio in range(grade.raio_maximo() + 1):
+            if melhor_distancia <= max(fora, (raio - 1) * grade.tamanho):
+                break
+            candidatos = grade.anel(coluna, linha, raio)
+            if len(candidatos):
+                # Uma distância NaN não pode vencer o argmin e esconder o melhor do anel
+                d = np.nan_to_num(distancias(candidatos, x, y), nan=math.inf)
+                i = int(np.argmin(d))
+                if d[i] < melhor_distancia:
+                    melhor, melhor_distancia = int(candidatos[i]), float(d[i])
+        
+        return melhor, melhor_distancia
+    
+    # ============================================
+    # PROJEÇÃO NA RUA
+    # ============================================
+    def _projecoes(self, candidatos: np.ndarray, x: float, y: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Fração ao longo de cada trecho candidato do ponto mais próximo e sua distância."""
+        u, v = self.trechos[candidatos, 0], self.trechos[candidatos, 1]
+        x1, y1, x2, y2 = self.xs[u], self.ys[u], self.xs[v], self.ys[v]
+        dx, dy = x2 - x1, y2 - y1
+        # Trecho de comprimento zero: o ponto mais próximo é o próprio nó (fração 0)
+        comprimentos2 = dx * dx + dy * dy
+        fracoes = np.divide((x - x1) * dx + (y - y1) * dy, comprimentos2,
+                            out=np.zeros_like(comprimentos2), where=comprimentos2 > 0)
+        fracoes = np.clip(fracoes, 0.0, 1.0)
+        return fracoes, np.hypot(x1 + fracoes * dx - x, y1 + fracoes * dy - y)
+    
+    def projetar_em_rua(self, lat: float, lon: float) -> Optional[Tuple[int, int, float, float, Tuple[float, float]]]:
+        """
+        Ponto mais próximo sobre os trechos de rua (segmentos retos entre nós).
+        
+        Args:
+            lat: Latitude (graus)
+            lon: Longitude (graus)
+            
+        Returns:
+            Tupla (u, v, fracao, distancia_metros, (lat, lon) do ponto projetado),
+            com u e v índices dos nós do trecho e fracao a posição ao longo de
+            u -> v (0 = em u, 1 = em v); None se o índice não tiver trechos
+            ou a coordenada for inválida
+        """
+        (x,), (y,) = self.projetar(np.array([lat]), np.array([lon]))
+        if self._grade_trechos is None or not (math.isfinite(x) and math.isfinite(y)):
+            return None
+        
+        trecho, distancia = self._buscar_aneis(self._grade_trechos, x, y,
+                                               lambda candidatos, x, y: self._projecoes(candidatos, x, y)[1])
+        fracao = float(self._projecoes(np.array([trecho]), x, y)[0][0])
+        u, v = (int(no) for no in self.trechos[trecho])
+        ponto = self._desprojetar(self.xs[u] + fracao * (self.xs[v] - self.xs[u]),
+                                  self.ys[u] + fracao * (self.ys[v] - self.ys[u]))
+        return u, v, fracao, distancia, ponto
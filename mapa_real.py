@@ -5,13 +5,424 @@ Módulo para trabalhar com mapas reais usando OpenStreetMap
 Adapta o algoritmo de Dijkstra para grafos de ruas reais
 """
 
+import math
+import os
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 import osmnx as ox
 import networkx as nx
 import folium
-from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 import heapq
+import numpy as np
+from armazem_ruas import GrafoRuasArmazenado
+from contracao import HierarquiaContracao, assinatura_arestas
+from dijkstra import AreaDeBusca
+from filas import FilaHeapIndexado, criar_fila
+from geocodificacao import LIMITE_NOMINATIM, BackendNominatim, Geocodificador
+from indice_espacial import IndiceEspacial
+from marcos import MarcosALT
+
+
+# Diretório dos arquivos pré-processados (grafos de ruas, hierarquias, etc.)
+DIRETORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+
+# Raio médio da Terra usado pelo OSMnx para calcular o comprimento das ruas
+RAIO_TERRA_METROS = 6371009.0
+
+# Margem sobre a distância em linha reta: comprimentos calculados no elipsoide
+# (geodésica) podem ser até ~0,5% menores que no modelo esférico
+FATOR_HEURISTICA = 0.99
+
+
+def haversine_vetorizado(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Distância de grande círculo (metros) de um ponto a vários pontos de uma vez.
+    
+    Args:
+        lat: Latitude do ponto de referência (graus); com arrays em lat/lon,
+            calcula as distâncias par a par
+        lon: Longitude do ponto de referência (graus)
+        lats: Array de latitudes (graus)
+        lons: Array de longitudes (graus)
+        
+    Returns:
+        Array com as distâncias em metros
+    """
+    lat_rad, lon_rad = np.radians(lat), np.radians(lon)
+    lats_rad, lons_rad = np.radians(lats), np.radians(lons)
+    a = (np.sin((lats_rad - lat_rad) / 2) ** 2
+         + np.cos(lat_rad) * np.cos(lats_rad) * np.sin((lons_rad - lon_rad) / 2) ** 2)
+    return 2 * RAIO_TERRA_METROS * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class RuasCompiladas:
+    """
+    Grafo de ruas compilado para roteamento.
+    
+    Os nós são indexados de 0 a n - 1 (na ordem do grafo de ruas) e cada par
+    de nós ligados tem uma única rua, com o menor comprimento entre as ruas
+    paralelas. Guarda a forma CSR das ruas de saída e a das ruas de chegada
+    (grafo reverso), em listas, que são o formato mais rápido para os laços
+    de busca em Python, e as áreas de busca reutilizadas entre consultas
+    (ver dijkstra.AreaDeBusca): cada consulta só toca os nós que alcança.
+    """
+    
+    def __init__(self, ids: np.ndarray, lats: np.ndarray, lons: np.ndarray,
+                 origens: np.ndarray, destinos: np.ndarray, comprimentos: np.ndarray):
+        """
+        Inicializa a partir das ruas já deduplicadas.
+        
+        Args:
+            ids: ID OSM de cada nó, pelo índice
+            lats: Latitude de cada nó
+            lons: Longitude de cada nó
+            origens: Índice do nó de saída de cada rua
+            destinos: Índice do nó de chegada de cada rua
+            comprimentos: Comprimento de cada rua em metros
+        """
+        self.ids: List[int] = ids.tolist()
+        self.indice: Dict[int, int] = {no: i for i, no in enumerate(self.ids)}
+        self.lats = lats
+        self.lons = lons
+        self.offsets, self.destinos, self.comprimentos = self._csr(origens, destinos, comprimentos)
+        self.offsets_reverso, self.origens_reverso, self.comprimentos_reverso = \
+            self._csr(destinos, origens, comprimentos)
+        self._areas: List[AreaDeBusca] = []
+        # Heap indexado reutilizado entre buscas (posições pré-alocadas por nó)
+        self._fila_indexada: Optional[FilaHeapIndexado] = None
+        # Coordenadas em radianos, em listas (convertidas na primeira busca A*)
+        self._radianos: Optional[Tuple[List[float], List[float]]] = None
+        # Último limite montado: (alvo, todos os nós calculados?, função)
+        self._limites_alvo: Tuple[int, bool, Optional[Callable[[int], float]]] = (-1, False, None)
+    
+    def _csr(self, de: np.ndarray, para: np.ndarray,
+             comprimentos: np.ndarray) -> Tuple[List[int], List[int], List[float]]:
+        """Agrupa as ruas pelo nó de/para, no formato CSR (offsets, vizinhos, comprimentos)."""
+        ordem = np.argsort(de, kind='stable')
+        offsets = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(de, minlength=len(self.ids)))
+        return offsets.tolist(), para[ordem].tolist(), comprimentos[ordem].tolist()
+    
+    @property
+    def num_nos(self) -> int:
+        """Número de nós."""
+        return len(self.ids)
+    
+    @property
+    def num_ruas(self) -> int:
+        """Número de ruas (pares de nós ligados)."""
+        return len(self.destinos)
+    
+    @classmethod
+    def de_armazenado(cls, armazenado: GrafoRuasArmazenado) -> 'RuasCompiladas':
+        """
+        Compila o grafo em arrays (ver armazem_ruas), de forma vetorizada.
+        
+        Comprimentos ausentes ou zero vêm da distância de grande círculo entre
+        os nós, calculada de uma vez para todas essas ruas; ruas entre nós sem
+        coordenadas são descartadas.
+        
+        Args:
+            armazenado: Grafo de ruas em arrays, com as ruas paralelas
+            
+        Returns:
+            Nova instância de RuasCompiladas
+        """
+        lats = np.array(armazenado.lats, dtype=np.float64)
+        lons = np.array(armazenado.lons, dtype=np.float64)
+        origens = np.repeat(np.arange(armazenado.num_nos, dtype=np.int64), np.diff(armazenado.offsets))
+        destinos = np.array(armazenado.destinos, dtype=np.int64)
+        comprimentos = np.array(armazenado.comprimentos, dtype=np.float64)
+        
+        faltando = ~(comprimentos > 0)
+        comprimentos[faltando] = haversine_vetorizado(lats[origens[faltando]], lons[origens[faltando]],
+                                                      lats[destinos[faltando]], lons[destinos[faltando]])
+        validas = np.isfinite(comprimentos)
+        origens, destinos, comprimentos = origens[validas], destinos[validas], comprimentos[validas]
+        
+        # Ruas paralelas: ordena por (origem, destino, comprimento) e fica com a primeira de cada par
+        # (comprimento e depois o par codificado num inteiro: mais rápido que np.lexsort)
+        ordem = np.argsort(comprimentos)
+        ordem = ordem[np.argsort(origens[ordem] * len(lats) + destinos[ordem], kind='stable')]
+        origens, destinos, comprimentos = origens[ordem], destinos[ordem], comprimentos[ordem]
+        primeira = np.ones(len(origens), dtype=bool)
+        primeira[1:] = (origens[1:] != origens[:-1]) | (destinos[1:] != destinos[:-1])
+        
+        return cls(np.asarray(armazenado.ids), lats, lons,
+                   origens[primeira], destinos[primeira], comprimentos[primeira])
+    
+    @classmethod
+    def de_multidigrafo(cls, grafo: nx.MultiDiGraph) -> 'RuasCompiladas':
+        """Compila o MultiDiGraph do OSMnx (ver de_armazenado)."""
+        return cls.de_armazenado(GrafoRuasArmazenado.de_multidigrafo(grafo))
+    
+    def area(self, lado: int = 0) -> AreaDeBusca:
+        """
+        Área de busca reutilizável (alocada na primeira consulta).
+        
+        Args:
+            lado: 0 para buscas simples ou diretas, 1 para a busca reversa do
+                Dijkstra bidirecional
+        """
+        while len(self._areas) <= lado:
+            self._areas.append(AreaDeBusca(self.num_nos))
+        return self._areas[lado]
+    
+    def limite_distancia(self, alvo: int, todos: bool = False) -> Optional[Callable[[int], float]]:
+        """
+        Limite inferior (metros) da distância de cada nó até alvo, pela
+        distância de grande círculo.
+        
+        Por padrão o limite é calculado só para os nós que a busca alcança, o
+        que numa rota curta custa muito menos que percorrer todos os nós. Com
+        todos=True é calculado de uma vez (vetorizado) para todos os nós,
+        melhor para muitas buscas ao mesmo alvo, como os desvios do Yen. O
+        último limite montado fica guardado para as consultas seguintes ao
+        mesmo alvo.
+        
+        Args:
+            alvo: Índice do nó de destino
+            todos: Se True, calcula o limite de todos os nós de uma vez
+            
+        Returns:
+            Função h(v) com h(v) <= distância por ruas de v até alvo (0 para nós
+            sem coordenadas), ou None se o alvo não tiver coordenadas
+        """
+        alvo_guardado, todos_guardado, funcao = self._limites_alvo
+        if alvo_guardado == alvo and (todos_guardado or not todos):
+            return funcao
+        
+        if math.isnan(self.lats[alvo]) or math.isnan(self.lons[alvo]):
+            return None
+        
+        if todos:
+            limites = FATOR_HEURISTICA * haversine_vetorizado(self.lats[alvo], self.lons[alvo], self.lats, self.lons)
+            # Nós sem coordenadas recebem limite 0 (sempre válido)
+            funcao = np.nan_to_num(limites, nan=0.0).tolist().__getitem__
+            self._limites_alvo = (alvo, True, funcao)
+            return funcao
+        
+        if self._radianos is None:
+            self._radianos = (np.radians(self.lats).tolist(), np.radians(self.lons).tolist())
+        lats, lons = self._radianos
+        lat_alvo, lon_alvo = lats[alvo], lons[alvo]
+        cos_alvo = math.cos(lat_alvo)
+        escala = FATOR_HEURISTICA * 2 * RAIO_TERRA_METROS
+        sin, cos, asin, sqrt = math.sin, math.cos, math.asin, math.sqrt
+        limites: Dict[int, float] = {}
+        
+        def limite(v: int) -> float:
+            valor = limites.get(v)
+            if valor is None:
+                lat, lon = lats[v], lons[v]
+                if lat != lat or lon != lon:
+                    valor = 0.0
+                else:
+                    a = sin((lat - lat_alvo) / 2) ** 2 + cos_alvo * cos(lat) * sin((lon - lon_alvo) / 2) ** 2
+                    valor = escala * asin(sqrt(min(a, 1.0)))
+                limites[v] = valor
+            return valor
+        
+        self._limites_alvo = (alvo, False, limite)
+        return limite
+    
+    def comprimento(self, u: int, v: int) -> Optional[float]:
+        """Comprimento em metros da rua entre os índices u -> v, ou None se não existir."""
+        for i in range(self.offsets[u], self.offsets[u + 1]):
+            if self.destinos[i] == v:
+                return self.comprimentos[i]
+        return None
+    
+    def buscar(self, fontes: List[int], destino: int = -1, reverso: bool = False, fila: str = 'heap',
+               heuristica: Optional[Callable[[int], float]] = None, nos_proibidos: Optional[Set[int]] = None,
+               ruas_proibidas: Optional[Set[Tuple[int, int]]] = None) -> Tuple[AreaDeBusca, List[int]]:
+        """
+        Dijkstra (ou A*, com heurística) sobre os índices, a partir de uma ou mais fontes.
+        
+        Args:
+            fontes: Índices de partida (todos com distância 0)
+            destino: Índice em que a busca pode parar (-1 = explorar tudo)
+            reverso: Se True, segue as ruas de chegada (distâncias até as fontes)
+            fila: 'heap' ou 'indexado' (ver filas.criar_fila)
+            heuristica: Função com o limite inferior consistente da distância de
+                cada nó até destino (A*, ver limite_distancia); None = Dijkstra
+            nos_proibidos: Índices que a busca não pode atravessar
+            ruas_proibidas: Pares (u, v) de ruas que a busca não pode usar
+                (no sentido da rua, também na busca reversa)
+                
+        Returns:
+            Tupla (area, fechados): a área preenchida (distâncias e predecessores
+            valem só para os nós com area.alcancado(v), até a próxima consulta)
+            e os nós resolvidos, em ordem
+        """
+        if reverso:
+            offsets, vizinhos, comprimentos = self.offsets_reverso, self.origens_reverso, self.comprimentos_reverso
+        else:
+            offsets, vizinhos, comprimentos = self.offsets, self.destinos, self.comprimentos
+        nos_proibidos = nos_proibidos or set()
+        ruas_proibidas = ruas_proibidas or set()
+        
+        area = self.area()
+        geracao = area.nova_busca()
+        distancias, predecessores, marcas = area.distancias, area.predecessores, area.marcas
+        fechado = -geracao
+        fechados: List[int] = []
+        
+        if fila == 'indexado':
+            if self._fila_indexada is None:
+                self._fila_indexada = criar_fila(fila, num_itens=self.num_nos)
+            fila_nos = self._fila_indexada
+            fila_nos.esvaziar()
+        else:
+            fila_nos = criar_fila(fila)
+        inserir, remover_minimo = fila_nos.inserir, fila_nos.remover_minimo
+        for fonte in fontes:
+            distancias[fonte] = 0.0
+            predecessores[fonte] = -1
+            marcas[fonte] = geracao
+            inserir(heuristica(fonte) if heuristica else 0.0, fonte)
+        
+        while len(fila_nos):
+            _, atual = remover_minimo()
+            
+            if marcas[atual] == fechado:
+                continue
+            
+            marcas[atual] = fechado
+            fechados.append(atual)
+            dist_atual = distancias[atual]
+            
+            if atual == destino:
+                break
+            
+            inicio, fim = offsets[atual], offsets[atual + 1]
+            for vizinho, comprimento in zip(vizinhos[inicio:fim], comprimentos[inicio:fim]):
+                marca = marcas[vizinho]
+                if marca == fechado or vizinho in nos_proibidos:
+                    continue
+                if ruas_proibidas and ((vizinho, atual) if reverso else (atual, vizinho)) in ruas_proibidas:
+                    continue
+                
+                nova_distancia = dist_atual + comprimento
+                
+                if marca != geracao or nova_distancia < distancias[vizinho]:
+                    marcas[vizinho] = geracao
+                    distancias[vizinho] = nova_distancia
+                    predecessores[vizinho] = atual
+                    inserir(nova_distancia + heuristica(vizinho) if heuristica else nova_distancia, vizinho)
+        
+        return area, fechados
+    
+    def componentes(self) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Rótulos dos componentes fortemente e fracamente conexos.
+        
+        Os componentes fortemente conexos (Tarjan, iterativo) são numerados na
+        ordem topológica do grafo condensado: toda rua entre componentes vai de
+        um rótulo menor para um maior, então um nó nunca alcança outro de
+        rótulo menor. Os componentes fracamente conexos separam as partes
+        totalmente desligadas da malha.
+        
+        Returns:
+            Tupla (forte, tamanhos_fortes, fraco): rótulo forte de cada nó,
+            número de nós de cada componente forte e rótulo fraco de cada nó
+            (o menor índice do componente)
+        """
+        n = self.num_nos
+        offsets, destinos = self.offsets, self.destinos
+        ordem = [-1] * n
+        menor = [0] * n
+        na_pilha = [False] * n
+        rotulos = [-1] * n
+        pilha: List[int] = []
+        tamanhos: List[int] = []
+        contador = 0
+        
+        for raiz in range(n):
+            if ordem[raiz] != -1:
+                continue
+            ordem[raiz] = menor[raiz] = contador
+            contador += 1
+            pilha.append(raiz)
+            na_pilha[raiz] = True
+            # Pilha de chamadas: (nó, próxima rua a examinar)
+            chamadas = [(raiz, offsets[raiz])]
+            
+            while chamadas:
+                v, i = chamadas[-1]
+                fim = offsets[v + 1]
+                while i < fim:
+                    w = destinos[i]
+                    i += 1
+                    if ordem[w] == -1:
+                        chamadas[-1] = (v, i)
+                        ordem[w] = menor[w] = contador
+                        contador += 1
+                        pilha.append(w)
+                        na_pilha[w] = True
+                        chamadas.append((w, offsets[w]))
+                        break
+                    if na_pilha[w] and ordem[w] < menor[v]:
+                        menor[v] = ordem[w]
+                else:
+                    # Todas as ruas de v examinadas: retorna ao nó anterior
+                    chamadas.pop()
+                    if chamadas and menor[v] < menor[chamadas[-1][0]]:
+                        menor[chamadas[-1][0]] = menor[v]
+                    if menor[v] == ordem[v]:
+                        rotulo, tamanho = len(tamanhos), 0
+                        while True:
+                            w = pilha.pop()
+                            na_pilha[w] = False
+                            rotulos[w] = rotulo
+                            tamanho += 1
+                            if w == v:
+                                break
+                        tamanhos.append(tamanho)
+        
+        # Tarjan fecha cada componente depois dos que ele alcança: inverte a numeração
+        ultimo = len(tamanhos) - 1
+        forte = [ultimo - rotulo for rotulo in rotulos]
+        tamanhos.reverse()
+        
+        # Componentes fracos (ignorando o sentido das ruas), vetorizado: cada
+        # rua pendura a raiz de maior número na de menor, e os ponteiros são
+        # encurtados até cada nó apontar para a raiz do seu componente
+        u = np.repeat(np.arange(n), np.diff(offsets))
+        v = np.array(destinos, dtype=np.int64)
+        raiz = np.arange(n)
+        while True:
+            raiz_u, raiz_v = raiz[u], raiz[v]
+            diferentes = raiz_u != raiz_v
+            if not diferentes.any():
+                break
+            np.minimum.at(raiz, np.maximum(raiz_u, raiz_v)[diferentes], np.minimum(raiz_u, raiz_v)[diferentes])
+            while True:
+                encurtada = raiz[raiz]
+                if np.array_equal(encurtada, raiz):
+                    break
+                raiz = encurtada
+        
+        return forte, tamanhos, raiz.tolist()
+    
+    def caminho(self, predecessores: List[int], destino: int, como_ids: bool = True) -> List[int]:
+        """
+        Caminho até destino, seguindo os predecessores até a fonte.
+        
+        Returns:
+            IDs OSM dos nós do caminho (ou seus índices, se como_ids=False)
+        """
+        caminho = []
+        atual = destino
+        while atual != -1:
+            caminho.append(atual)
+            atual = predecessores[atual]
+        
+        caminho.reverse()
+        return [self.ids[v] for v in caminho] if como_ids else caminho
 
 
 class MapaReal:
@@ -20,67 +431,396 @@ class MapaReal:
         """
         Retorna até k menores caminhos (alternativas) entre origem e destino.
         Cada caminho é uma lista de nós e seu custo total (soma dos pesos).
+        
+        Usa o algoritmo de Yen no grafo compilado: cada alternativa desvia da
+        anterior a partir de um de seus nós, sem repetir os nós do trecho
+        inicial nem as ruas que as alternativas já encontradas usam ali. Os
+        desvios são buscas A* guiadas pela distância em linha reta até o destino.
         """
-        if self.grafo_ruas is None:
+        ruas = self.compilar_ruas()
+        if ruas is None or origem not in ruas.indice or destino not in ruas.indice:
             return []
-        try:
-            caminhos = []
-            # Usa shortest_simple_paths do networkx
-            for path in nx.shortest_simple_paths(self.grafo_ruas, origem, destino, weight='length'):
-                # Calcula o custo total do caminho
-                custo = 0.0
-                for i in range(len(path) - 1):
-                    aresta_data = self.grafo_ruas.get_edge_data(path[i], path[i+1])
-                    if aresta_data:
-                        primeiro_edge = list(aresta_data.values())[0]
-                        peso = primeiro_edge.get('length', 0)
-                        custo += peso
-                caminhos.append((path, custo))
-                if len(caminhos) >= k:
-                    break
-            return caminhos
-        except Exception as e:
-            print(f"Erro ao calcular rotas alternativas: {e}")
+        
+        inicio, alvo = ruas.indice[origem], ruas.indice[destino]
+        # Todos os desvios buscam o mesmo destino: limite calculado uma vez para todos os nós
+        heuristica = ruas.limite_distancia(alvo, todos=True)
+        area, _ = ruas.buscar([inicio], alvo, heuristica=heuristica)
+        if not area.alcancado(alvo):
             return []
+        
+        encontrados = [(area.distancias[alvo], ruas.caminho(area.predecessores, alvo, como_ids=False))]
+        candidatos: List[Tuple[float, List[int]]] = []
+        vistos = {tuple(encontrados[0][1])}
+        
+        while len(encontrados) < k:
+            anterior = encontrados[-1][1]
+            
+            # Custo do trecho inicial até cada posição do caminho anterior
+            acumulado = [0.0]
+            for u, v in zip(anterior, anterior[1:]):
+                acumulado.append(acumulado[-1] + ruas.comprimento(u, v))
+            
+            for i in range(len(anterior) - 1):
+                raiz = anterior[:i + 1]
+                ruas_proibidas = {(c[i], c[i + 1]) for _, c in encontrados if len(c) > i + 1 and c[:i + 1] == raiz}
+                area, _ = ruas.buscar([raiz[-1]], alvo, heuristica=heuristica,
+                                      nos_proibidos=set(raiz[:-1]), ruas_proibidas=ruas_proibidas)
+                if not area.alcancado(alvo):
+                    continue
+                
+                caminho = raiz[:-1] + ruas.caminho(area.predecessores, alvo, como_ids=False)
+                if tuple(caminho) not in vistos:
+                    vistos.add(tuple(caminho))
+                    heapq.heappush(candidatos, (acumulado[i] + area.distancias[alvo], caminho))
+            
+            if not candidatos:
+                break
+            encontrados.append(heapq.heappop(candidatos))
+        
+        return [([ruas.ids[v] for v in caminho], custo) for custo, caminho in encontrados]
     """Classe para trabalhar com mapas reais e aplicar Dijkstra."""
     
-    def __init__(self, cidade: str = "Maricá, RJ, Brasil"):
+    def __init__(self, cidade: str = "Maricá, RJ, Brasil", tipo_rede: str = 'drive',
+                 geocodificador: Optional[Geocodificador] = None):
         """
         Inicializa o mapa real da cidade.
         
         Args:
             cidade: Nome da cidade (formato: "Cidade, Estado, País")
+            tipo_rede: Tipo de rede do OSMnx ('drive', 'walk', 'bike', ...)
+            geocodificador: Geocodificador a usar (padrão: Nominatim com cache
+                em memória e em cache/, limitado a LIMITE_NOMINATIM requisições
+                por segundo; ver geocodificacao.py)
         """
         self.cidade = cidade
-        self.grafo_ruas: Optional[nx.MultiDiGraph] = None
-        self.geocoder = Nominatim(user_agent="dijkstra_marica")
+        self.tipo_rede = tipo_rede
+        
+        # Grafo de ruas: o MultiDiGraph do OSMnx ou, quando lido do disco, os
+        # arrays salvos (o MultiDiGraph só é montado se alguém usar grafo_ruas).
+        # _versao_ruas identifica o grafo carregado; os demais atributos _grafo_*
+        # guardam a versão para a qual cada estrutura derivada foi calculada.
+        self._grafo_ruas: Optional[nx.MultiDiGraph] = None
+        self._armazenado: Optional[GrafoRuasArmazenado] = None
+        self._versao_ruas: Optional[object] = None
+        
+        if geocodificador is None:
+            geocodificador = Geocodificador(BackendNominatim(user_agent="dijkstra_marica"),
+                                            caminho_cache=self._arquivo_cache("geocodificacao.sqlite"),
+                                            requisicoes_por_segundo=LIMITE_NOMINATIM)
+        self.geocodificador = geocodificador
         self.coordenadas_origem: Optional[Tuple[float, float]] = None
         self.coordenadas_destino: Optional[Tuple[float, float]] = None
         self.no_origem: Optional[int] = None
         self.no_destino: Optional[int] = None
+        
+        # Rótulos de componentes do grafo de ruas (calculados uma vez por grafo)
+        self._grafo_componentes: Optional[object] = None
+        # (listas indexadas como RuasCompiladas)
+        self._componente_forte: List[int] = []
+        self._componente_fraco: List[int] = []
+        self._tamanhos_fortes: List[int] = []
+        
+        # Coordenadas dos nós em arrays (calculadas uma vez por grafo)
+        self._grafo_coordenadas: Optional[object] = None
+        self._indice_no: Dict[int, int] = {}
+        self._lats: np.ndarray = np.empty(0)
+        self._lons: np.ndarray = np.empty(0)
+        
+        # Contraction Hierarchies (pré-processamento salvo em disco)
+        self.hierarquia: Optional[HierarquiaContracao] = None
+        self._grafo_hierarquia: Optional[object] = None
+        
+        # Grafo de ruas compilado para roteamento (uma vez por grafo carregado)
+        self._ruas: Optional[RuasCompiladas] = None
+        self._grafo_ruas_compiladas: Optional[object] = None
+        
+        # Índice espacial dos nós e trechos de rua (uma vez por grafo carregado)
+        self._indice_espacial: Optional[IndiceEspacial] = None
+        self._grafo_indice: Optional[object] = None
+        
+        # Marcos da busca ALT (tabelas de distância indexadas por self._indice_no)
+        self.marcos: Optional[MarcosALT] = None
+        self._grafo_marcos: Optional[object] = None
+    
+    @property
+    def grafo_ruas(self) -> Optional[nx.MultiDiGraph]:
+        """
+        Grafo de ruas no formato do OSMnx (MultiDiGraph).
+        
+        Quando o mapa vem do disco, é montado a partir dos arrays só no primeiro
+        acesso: o roteamento usa apenas RuasCompiladas e não precisa dele.
+        """
+        if self._grafo_ruas is None and self._armazenado is not None:
+            self._grafo_ruas = self._armazenado.para_multidigrafo()
+        return self._grafo_ruas
+    
+    @grafo_ruas.setter
+    def grafo_ruas(self, grafo: Optional[nx.MultiDiGraph]) -> None:
+        self._grafo_ruas = grafo
+        self._armazenado = None
+        self._versao_ruas = grafo
     
-    def carregar_mapa(self) -> bool:
+    def carregar_mapa(self, usar_cache: bool = True) -> bool:
         """
-        Carrega o grafo de ruas da cidade do OpenStreetMap.
+        Carrega o grafo de ruas da cidade.
+        
+        Primeiro tenta o grafo salvo em disco para a mesma cidade e tipo de
+        rede (pasta cache/ do projeto); só baixa do OpenStreetMap se não houver,
+        e então salva o grafo baixado para as próximas sessões. O grafo lido do
+        disco é compilado direto dos arrays mapeados em memória, sem montar o
+        MultiDiGraph.
         
+        Args:
+            usar_cache: Se False, sempre baixa do OpenStreetMap (e atualiza o cache)
+            
         Returns:
             True se carregou com sucesso, False caso contrário
         """
+        diretorio = self._arquivo_cache(f"ruas_{self.tipo_rede}")
+        
+        armazenado = None
+        if usar_cache:
+            try:
+                armazenado = GrafoRuasArmazenado.carregar(diretorio)
+            except Exception as e:
+                print(f"Erro ao ler grafo salvo: {e}")
+        
         try:
-            self.grafo_ruas = ox.graph_from_place(
-                self.cidade,
-                network_type='drive'
-            )
+            if armazenado is not None:
+                self._grafo_ruas = None
+                self._armazenado = armazenado
+                self._versao_ruas = armazenado
+            else:
+                self.grafo_ruas = ox.graph_from_place(
+                    self.cidade,
+                    network_type=self.tipo_rede
+                )
+                try:
+                    GrafoRuasArmazenado.de_multidigrafo(self.grafo_ruas).salvar(diretorio)
+                except OSError as e:
+                    print(f"Erro ao salvar grafo de ruas: {e}")
+            
+            self._calcular_componentes()
+            self._preparar_coordenadas()
+            self.preparar_indice_espacial()
             return True
         except Exception as e:
             self.ultimo_erro = str(e)
             print(f"Erro ao carregar mapa: {e}")
             return False
     
+    def _calcular_componentes(self) -> None:
+        """
+        Calcula os rótulos de componentes do grafo de ruas, uma vez por grafo
+        carregado (ver RuasCompiladas.componentes).
+        """
+        if self._versao_ruas is None or self._grafo_componentes is self._versao_ruas:
+            return
+        
+        self._componente_forte, self._tamanhos_fortes, self._componente_fraco = self.compilar_ruas().componentes()
+        self._grafo_componentes = self._versao_ruas
+    
+    def compilar_ruas(self) -> Optional[RuasCompiladas]:
+        """
+        Retorna o grafo de ruas compilado para roteamento (arrays CSR com o
+        menor comprimento entre ruas paralelas), compilando uma vez por grafo.
+        
+        Returns:
+            RuasCompiladas, ou None se o mapa não estiver carregado
+        """
+        if self._versao_ruas is None:
+            return None
+        
+        if self._ruas is None or self._grafo_ruas_compiladas is not self._versao_ruas:
+            if self._armazenado is not None:
+                self._ruas = RuasCompiladas.de_armazenado(self._armazenado)
+            else:
+                self._ruas = RuasCompiladas.de_multidigrafo(self._grafo_ruas)
+            self._grafo_ruas_compiladas = self._versao_ruas
+        return self._ruas
+    
+    def _preparar_coordenadas(self) -> None:
+        """Aponta, uma vez por grafo carregado, os arrays de latitude/longitude dos nós."""
+        if self._versao_ruas is None or self._grafo_coordenadas is self._versao_ruas:
+            return
+        
+        ruas = self.compilar_ruas()
+        self._indice_no = ruas.indice
+        self._lats = ruas.lats
+        self._lons = ruas.lons
+        self._grafo_coordenadas = self._versao_ruas
+    
+    def preparar_indice_espacial(self) -> Optional[IndiceEspacial]:
+        """
+        Retorna o índice espacial dos nós e trechos de rua, montando uma vez por
+        grafo carregado.
+        
+        Returns:
+            IndiceEspacial (indexado como RuasCompiladas), ou None se o mapa não
+            estiver carregado
+        """
+        if self._versao_ruas is None:
+            return None
+        
+        if self._indice_espacial is None or self._grafo_indice is not self._versao_ruas:
+            ruas = self.compilar_ruas()
+            origens = np.repeat(np.arange(ruas.num_nos), np.diff(ruas.offsets))
+            self._indice_espacial = IndiceEspacial(ruas.lats, ruas.lons, origens, np.array(ruas.destinos))
+            self._grafo_indice = self._versao_ruas
+        return self._indice_espacial
+    
+    def _heuristica_distancia(self, destino: int) -> Optional[Callable[[int], float]]:
+        """
+        Limite inferior (metros) da distância de cada nó até o destino, pela
+        distância de grande círculo, calculado sob demanda para os nós que a
+        busca alcança (ver RuasCompiladas.limite_distancia).
+        
+        Returns:
+            Função h(índice do nó), ou None se o destino não tiver coordenadas
+        """
+        ruas = self.compilar_ruas()
+        return ruas.limite_distancia(ruas.indice[destino])
+    
+    def _arquivo_cache(self, sufixo: str) -> str:
+        """Caminho de um arquivo de cache nomeado a partir da cidade (ex: marica_rj_brasil_ch.npz)."""
+        nome = unicodedata.normalize('NFKD', self.cidade).encode('ascii', 'ignore').decode('ascii')
+        nome = re.sub(r'[^A-Za-z0-9]+', '_', nome).strip('_').lower()
+        return os.path.join(DIRETORIO_CACHE, f"{nome}_{sufixo}")
+    
+    def _arestas_ruas(self) -> List[Tuple[int, int, float]]:
+        """Lista as ruas (u, v, comprimento em metros), uma por par de nós."""
+        ruas = self.compilar_ruas()
+        ids, offsets, destinos, comprimentos = ruas.ids, ruas.offsets, ruas.destinos, ruas.comprimentos
+        return [(ids[u], ids[destinos[i]], comprimentos[i])
+                for u in range(ruas.num_nos) for i in range(offsets[u], offsets[u + 1])]
+    
+    def preparar_hierarquia(self, caminho_arquivo: Optional[str] = None) -> Optional[HierarquiaContracao]:
+        """
+        Prepara a Contraction Hierarchy do grafo de ruas para consultas rápidas.
+        
+        Se existir um arquivo salvo para o mesmo grafo (mesma assinatura), apenas
+        o carrega; caso contrário, faz o pré-processamento e salva o resultado.
+        
+        Args:
+            caminho_arquivo: Arquivo .npz da hierarquia (padrão: pasta cache/ do projeto)
+            
+        Returns:
+            A hierarquia pronta, ou None se o mapa não estiver carregado
+        """
+        if self._versao_ruas is None:
+            return None
+        
+        ids = self.compilar_ruas().ids
+        arestas = self._arestas_ruas()
+        assinatura = assinatura_arestas(ids, arestas)
+        caminho_arquivo = caminho_arquivo or self._arquivo_cache('ch.npz')
+        
+        hierarquia = None
+        if os.path.exists(caminho_arquivo):
+            try:
+                hierarquia = HierarquiaContracao.carregar(caminho_arquivo)
+            except Exception as e:
+                print(f"Erro ao carregar hierarquia: {e}")
+        
+        if hierarquia is None or hierarquia.assinatura != assinatura:
+            hierarquia = HierarquiaContracao.construir(ids, arestas, assinatura=assinatura)
+            try:
+                os.makedirs(os.path.dirname(caminho_arquivo) or '.', exist_ok=True)
+                hierarquia.salvar(caminho_arquivo)
+            except OSError as e:
+                print(f"Erro ao salvar hierarquia: {e}")
+        
+        self.hierarquia = hierarquia
+        self._grafo_hierarquia = self._versao_ruas
+        return hierarquia
+    
+    def preparar_marcos(self, num_marcos: int = 16, estrategia: str = 'mais_distante',
+                        semente: Optional[int] = None) -> Optional[MarcosALT]:
+        """
+        Escolhe marcos no grafo de ruas e calcula as distâncias de e até cada um,
+        usadas como limite inferior na busca ALT (metodo='alt').
+        
+        Custa 2 x num_marcos buscas completas e ocupa 2 x num_marcos x nós
+        floats de 32 bits.
+        
+        Args:
+            num_marcos: Quantidade de marcos
+            estrategia: 'mais_distante' ou 'evitar' (ver MarcosALT.construir)
+            semente: Semente para a escolha dos marcos
+            
+        Returns:
+            Os marcos calculados, ou None se o mapa não estiver carregado
+        """
+        if self._versao_ruas is None:
+            return None
+        
+        ruas = self.compilar_ruas()
+        self._preparar_coordenadas()
+        self.marcos = MarcosALT.construir((ruas.offsets, ruas.destinos, ruas.comprimentos),
+                                          (ruas.offsets_reverso, ruas.origens_reverso, ruas.comprimentos_reverso),
+                                          num_marcos=num_marcos, estrategia=estrategia, semente=semente)
+        self._grafo_marcos = self._versao_ruas
+        return self.marcos
+    
+    def pode_existir_caminho(self, origem: int, destino: int) -> bool:
+        """
+        Verifica em O(1), pelos rótulos de componentes, se pode existir rota.
+        
+        Args:
+            origem: ID do nó de origem
+            destino: ID do nó de destino
+            
+        Returns:
+            False se com certeza não há rota; True se estão no mesmo componente
+            fortemente conexo (há rota) ou se só a busca pode decidir
+        """
+        if self._versao_ruas is None:
+            return False
+        
+        self._calcular_componentes()
+        indice = self._ruas.indice
+        if origem not in indice or destino not in indice:
+            return False
+        u, v = indice[origem], indice[destino]
+        
+        if self._componente_fraco[u] != self._componente_fraco[v]:
+            return False
+        
+        return self._componente_forte[u] <= self._componente_forte[v]
+    
+    def tamanho_componente(self, no: int) -> int:
+        """Retorna o número de nós do componente fortemente conexo do nó (0 se não existir)."""
+        if self._versao_ruas is None:
+            return 0
+        self._calcular_componentes()
+        i = self._ruas.indice.get(no)
+        return self._tamanhos_fortes[self._componente_forte[i]] if i is not None else 0
+    
+    def no_em_fragmento_isolado(self, no: int, fracao_minima: float = 0.01) -> bool:
+        """
+        Verifica se o nó está em um fragmento pequeno da malha viária, de onde
+        (ou para onde) a maior parte da cidade não é alcançável.
+        
+        Args:
+            no: ID do nó
+            fracao_minima: Fração do maior componente abaixo da qual o
+                componente do nó é considerado um fragmento
+                
+        Returns:
+            True se o componente fortemente conexo do nó é pequeno
+        """
+        tamanho = self.tamanho_componente(no)
+        if not self._tamanhos_fortes:
+            return False
+        return tamanho < fracao_minima * max(self._tamanhos_fortes)
+    
     def geocodificar_endereco(self, endereco: str) -> Optional[Tuple[float, float]]:
         """
         Converte um endereço em coordenadas (latitude, longitude).
         
+        Endereços já consultados (inclusive os não encontrados) são respondidos
+        pelo cache do geocodificador, sem acessar a rede.
+        
         Args:
             endereco: Endereço como string (ex: "Rua Principal, Maricá")
             
@@ -94,15 +834,37 @@ class MapaReal:
             else:
                 endereco_completo = endereco
             
-            location = self.geocoder.geocode(endereco_completo, timeout=10)
-            
-            if location:
-                return (location.latitude, location.longitude)
-            return None
+            return self.geocodificador.geocodificar(endereco_completo)
         except Exception as e:
             print(f"Erro ao geocodificar: {e}")
             return None
     
+    def geocodificar_enderecos(self, enderecos: List[str],
+                               max_threads: int = 4) -> List[Optional[Tuple[float, float]]]:
+        """
+        Converte vários endereços em coordenadas, consultando em paralelo.
+        
+        As consultas rodam em um pool de threads; o geocodificador limita as
+        requisições por segundo à rede, e endereços repetidos são consultados
+        uma única vez.
+        
+        Args:
+            enderecos: Endereços como strings
+            max_threads: Número máximo de consultas simultâneas
+            
+        Returns:
+            Lista de (lat, lon) ou None, na ordem dos endereços
+        """
+        unicos = list(dict.fromkeys(enderecos))
+        if len(unicos) <= 1:
+            resultados = [self.geocodificar_endereco(endereco) for endereco in unicos]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_threads, len(unicos))) as executor:
+                resultados = list(executor.map(self.geocodificar_endereco, unicos))
+        
+        por_endereco = dict(zip(unicos, resultados))
+        return [por_endereco[endereco] for endereco in enderecos]
+    
     def encontrar_no_mais_proximo(self, lat: float, lon: float) -> Optional[int]:
         """
         Encontra o nó do grafo mais próximo de uma coordenada.
@@ -114,39 +876,80 @@ class MapaReal:
         Returns:
             ID do nó mais próximo ou None
         """
-        if self.grafo_ruas is None:
+        indice = self.preparar_indice_espacial()
+        if indice is None:
             return None
         
-        try:
-            # OSMnx nearest_nodes espera (lon, lat) e grafo em EPSG:4326
-            no_proximo = ox.distance.nearest_nodes(self.grafo_ruas, lon, lat)
-            return no_proximo
-        except Exception:
-            # Método alternativo: busca manual
-            if len(self.grafo_ruas.nodes()) == 0:
-                return None
+        i, _ = indice.mais_proximo(lat, lon)
+        return self._ruas.ids[i] if i >= 0 else None
+    
+    def encontrar_nos_mais_proximos(self, lats: List[float],
+                                    lons: List[float]) -> Tuple[List[Optional[int]], np.ndarray]:
+        """
+        Encontra o nó mais próximo de cada coordenada, em lote.
+        
+        Args:
+            lats: Latitudes
+            lons: Longitudes
             
-            menor_distancia = float('inf')
-            no_mais_proximo = None
+        Returns:
+            Tupla (ids, distancias_metros), na ordem das coordenadas; o ID é None
+            quando não há nó (mapa não carregado ou coordenada inválida)
+        """
+        indice = self.preparar_indice_espacial()
+        if indice is None:
+            return [None] * len(lats), np.full(len(lats), np.inf)
+        
+        indices, distancias = indice.mais_proximos(np.asarray(lats, dtype=np.float64),
+                                                   np.asarray(lons, dtype=np.float64))
+        ids = self._ruas.ids
+        return [ids[i] if i >= 0 else None for i in indices.tolist()], distancias
+    
+    def projetar_em_rua(self, lat: float,
+                        lon: float) -> Optional[Tuple[int, int, float, float, Tuple[float, float]]]:
+        """
+        Projeta uma coordenada no trecho de rua mais próximo (segmento reto
+        entre os nós, já que a geometria das ruas não é guardada).
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
             
-            for no in self.grafo_ruas.nodes():
-                no_lat = self.grafo_ruas.nodes[no].get('y')
-                no_lon = self.grafo_ruas.nodes[no].get('x')
-                
-                if no_lat is None or no_lon is None:
-                    continue
-                
-                try:
-                    distancia = geodesic((lat, lon), (no_lat, no_lon)).meters
-                    if distancia < menor_distancia:
-                        menor_distancia = distancia
-                        no_mais_proximo = no
-                except Exception:
-                    continue
+        Returns:
+            Tupla (u, v, fracao, distancia_metros, (lat, lon) do ponto projetado),
+            com u e v IDs dos nós do trecho e fracao a posição ao longo de u -> v
+            (0 = em u, 1 = em v); None se não houver trecho
+        """
+        indice = self.preparar_indice_espacial()
+        if indice is None:
+            return None
+        
+        projecao = indice.projetar_em_rua(lat, lon)
+        if projecao is None:
+            return None
+        
+        u, v, fracao, distancia, ponto = projecao
+        return self._ruas.ids[u], self._ruas.ids[v], fracao, distancia, ponto
+    
+    def comprimento_rua(self, origem: int, destino: int) -> Optional[float]:
+        """
+        Comprimento em metros da rua origem -> destino (a menor, se houver ruas
+        paralelas; a distância entre os nós, se o OSM não informar).
+        
+        Args:
+            origem: ID do nó de saída
+            destino: ID do nó de chegada
             
-            return no_mais_proximo
+        Returns:
+            Comprimento em metros, ou None se não houver rua entre os nós
+        """
+        ruas = self.compilar_ruas()
+        if ruas is None or origem not in ruas.indice or destino not in ruas.indice:
+            return None
+        return ruas.comprimento(ruas.indice[origem], ruas.indice[destino])
     
-    def dijkstra_ruas(self, origem: int, destino: int) -> Tuple[Optional[List[int]], Optional[float]]:
+    def dijkstra_ruas(self, origem: int, destino: int, metodo: str = 'dijkstra',
+                      fila: str = 'heap') -> Tuple[Optional[List[int]], Optional[float]]:
         """
         Aplica algoritmo de Dijkstra no grafo de ruas.
         Usa distância real em metros como peso.
@@ -154,113 +957,236 @@ class MapaReal:
         Args:
             origem: ID do nó de origem
             destino: ID do nó de destino
-            
+            metodo: 'dijkstra' (busca a partir da origem), 'bidirecional'
+                (busca direta da origem e reversa, pelas ruas de chegada, do destino)
+                'astar' (A*, guiado pela distância em linha reta até o destino)
+                'ch' (Contraction Hierarchies; pré-processa o grafo na primeira consulta)
+                ou 'alt' (A* com limites dos marcos; calcula os marcos na primeira consulta)
+            fila: Fila de prioridade do método 'dijkstra': 'heap' (heap binário com
+                remoção preguiçosa) ou 'indexado' (heap d-ário com diminuição de
+                chave, no máximo uma entrada por nó)
+                
         Returns:
             Tupla (caminho, distancia_metros)
         """
-        if self.grafo_ruas is None:
+        if fila not in ('heap', 'indexado'):
+            raise ValueError(f"Fila não suportada para distâncias em metros: {fila}")
+        
+        if self._versao_ruas is None:
             return None, None
         
         if origem == destino:
             return [origem], 0.0
         
-        # Inicialização
-        distancias: Dict[int, float] = {no: float('inf') for no in self.grafo_ruas.nodes()}
-        distancias[origem] = 0.0
+        # Rótulos de componentes descartam rotas impossíveis sem explorar o grafo
+        if not self.pode_existir_caminho(origem, destino):
+            return None, None
         
-        fila: List[Tuple[float, int]] = [(0.0, origem)]
-        heapq.heapify(fila)
+        if metodo == 'bidirecional':
+            return self._dijkstra_ruas_bidirecional(origem, destino)
+        if metodo == 'astar':
+            return self._astar_ruas(origem, destino)
+        if metodo == 'ch':
+            if self.hierarquia is None or self._grafo_hierarquia is not self._versao_ruas:
+                self.preparar_hierarquia()
+            return self.hierarquia.consultar(origem, destino)
+        if metodo == 'alt':
+            return self._alt_ruas(origem, destino)
+        if metodo != 'dijkstra':
+            raise ValueError(f"Método de busca desconhecido: {metodo}")
         
-        predecessores: Dict[int, Optional[int]] = {no: None for no in self.grafo_ruas.nodes()}
-        visitados: set = set()
+        ruas = self.compilar_ruas()
+        alvo = ruas.indice[destino]
+        area, _ = ruas.buscar([ruas.indice[origem]], alvo, fila=fila)
         
-        while fila:
-            dist_atual, no_atual = heapq.heappop(fila)
+        if not area.alcancado(alvo):
+            return None, None
+        
+        return ruas.caminho(area.predecessores, alvo), area.distancias[alvo]
+    
+    def _dijkstra_ruas_bidirecional(self, origem: int, destino: int) -> Tuple[Optional[List[int]], Optional[float]]:
+        """
+        Dijkstra bidirecional no grafo de ruas (dirigido).
+        
+        A busca direta segue as ruas de saída (successors) a partir da origem e a
+        reversa segue as ruas de chegada (predecessors) a partir do destino,
+        respeitando as mãos de direção. Para quando a soma dos topos das filas
+        não puder mais melhorar o melhor caminho encontrado.
+        """
+        ruas = self.compilar_ruas()
+        inicio, alvo = ruas.indice[origem], ruas.indice[destino]
+        
+        areas = (ruas.area(0), ruas.area(1))
+        geracoes = (areas[0].nova_busca(), areas[1].nova_busca())
+        for area, geracao, no in zip(areas, geracoes, (inicio, alvo)):
+            area.distancias[no] = 0.0
+            area.predecessores[no] = -1
+            area.marcas[no] = geracao
+        filas: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0.0, inicio)], [(0.0, alvo)])
+        # Busca direta pelas ruas de saída, reversa pelas de chegada
+        adjacencias = ((ruas.offsets, ruas.destinos, ruas.comprimentos),
+                       (ruas.offsets_reverso, ruas.origens_reverso, ruas.comprimentos_reverso))
+        
+        melhor = float('inf')
+        encontro = -1
+        
+        while filas[0] and filas[1]:
+            if filas[0][0][0] + filas[1][0][0] >= melhor:
+                break
             
-            if no_atual in visitados:
-                continue
+            # Avança o lado com menor chave no topo da fila
+            lado = 0 if filas[0][0][0] <= filas[1][0][0] else 1
+            dist_atual, atual = heapq.heappop(filas[lado])
             
-            visitados.add(no_atual)
+            geracao = geracoes[lado]
+            fechado = -geracao
+            marcas, dist_lado, pred_lado = areas[lado].marcas, areas[lado].distancias, areas[lado].predecessores
+            if marcas[atual] == fechado:
+                continue
             
-            if no_atual == destino:
-                break
+            marcas[atual] = fechado
+            outra = areas[1 - lado]
+            marcas_outra, dist_outra, geracao_outra = outra.marcas, outra.distancias, geracoes[1 - lado]
+            offsets, vizinhos, comprimentos = adjacencias[lado]
             
-            # Explora vizinhos
-            for vizinho in self.grafo_ruas.successors(no_atual):
-                if vizinho in visitados:
+            for i in range(offsets[atual], offsets[atual + 1]):
+                vizinho = vizinhos[i]
+                marca = marcas[vizinho]
+                if marca == fechado:
                     continue
                 
-                # Obtém o comprimento da aresta do OSMnx (já está em metros)
-                try:
-                    # Tenta pegar o comprimento da aresta diretamente
-                    aresta_data = self.grafo_ruas.get_edge_data(no_atual, vizinho)
-                    if aresta_data:
-                        # Pega o primeiro edge (pode haver múltiplos)
-                        primeiro_edge = list(aresta_data.values())[0]
-                        distancia = primeiro_edge.get('length', 0)
-                        
-                        # Se não tiver 'length', calcula geodésica
-                        if distancia == 0 or distancia is None:
-                            lat1 = self.grafo_ruas.nodes[no_atual].get('y')
-                            lon1 = self.grafo_ruas.nodes[no_atual].get('x')
-                            lat2 = self.grafo_ruas.nodes[vizinho].get('y')
-                            lon2 = self.grafo_ruas.nodes[vizinho].get('x')
-                            
-                            if lat1 and lon1 and lat2 and lon2:
-                                distancia = geodesic((lat1, lon1), (lat2, lon2)).meters
-                            else:
-                                continue
-                    else:
-                        # Fallback: calcula geodésica
-                        lat1 = self.grafo_ruas.nodes[no_atual].get('y')
-                        lon1 = self.grafo_ruas.nodes[no_atual].get('x')
-                        lat2 = self.grafo_ruas.nodes[vizinho].get('y')
-                        lon2 = self.grafo_ruas.nodes[vizinho].get('x')
-                        
-                        if lat1 and lon1 and lat2 and lon2:
-                            distancia = geodesic((lat1, lon1), (lat2, lon2)).meters
-                        else:
-                            continue
-                    
-                    nova_distancia = dist_atual + distancia
-                    
-                    if nova_distancia < distancias[vizinho]:
-                        distancias[vizinho] = nova_distancia
-                        predecessores[vizinho] = no_atual
-                        heapq.heappush(fila, (nova_distancia, vizinho))
-                except Exception as e:
-                    # Em caso de erro, tenta calcular geodésica
-                    try:
-                        lat1 = self.grafo_ruas.nodes[no_atual].get('y')
-                        lon1 = self.grafo_ruas.nodes[no_atual].get('x')
-                        lat2 = self.grafo_ruas.nodes[vizinho].get('y')
-                        lon2 = self.grafo_ruas.nodes[vizinho].get('x')
-                        
-                        if lat1 and lon1 and lat2 and lon2:
-                            distancia = geodesic((lat1, lon1), (lat2, lon2)).meters
-                            nova_distancia = dist_atual + distancia
-                            
-                            if nova_distancia < distancias[vizinho]:
-                                distancias[vizinho] = nova_distancia
-                                predecessores[vizinho] = no_atual
-                                heapq.heappush(fila, (nova_distancia, vizinho))
-                    except Exception:
-                        continue
-        
-        # Reconstruir caminho
-        if distancias[destino] == float('inf'):
+                nova_distancia = dist_atual + comprimentos[i]
+                
+                if marca != geracao or nova_distancia < dist_lado[vizinho]:
+                    marcas[vizinho] = geracao
+                    dist_lado[vizinho] = nova_distancia
+                    pred_lado[vizinho] = atual
+                    heapq.heappush(filas[lado], (nova_distancia, vizinho))
+                
+                # Vizinho já alcançado pela outra busca: caminho candidato completo
+                if abs(marcas_outra[vizinho]) == geracao_outra:
+                    candidato = dist_lado[vizinho] + dist_outra[vizinho]
+                    if candidato < melhor:
+                        melhor = candidato
+                        encontro = vizinho
+        
+        if encontro == -1:
             return None, None
         
-        caminho = []
-        atual = destino
-        while atual is not None:
+        # Origem -> encontro pela busca direta, encontro -> destino pela reversa
+        caminho = ruas.caminho(areas[0].predecessores, encontro, como_ids=False)
+        atual = areas[1].predecessores[encontro]
+        while atual != -1:
             caminho.append(atual)
-            atual = predecessores[atual]
+            atual = areas[1].predecessores[atual]
         
-        caminho.reverse()
-        distancia_total = distancias[destino]
+        return [ruas.ids[v] for v in caminho], melhor
+    
+    def _astar_ruas(self, origem: int, destino: int) -> Tuple[Optional[List[int]], Optional[float]]:
+        """
+        A* no grafo de ruas, com a distância de grande círculo até o destino como
+        heurística.
+        
+        A heurística nunca supera o comprimento real por ruas (limite inferior) e
+        respeita a desigualdade triangular, então o primeiro fechamento do destino
+        é a rota ótima, a mesma do Dijkstra, explorando só os nós na direção do destino.
+        """
+        heuristica = self._heuristica_distancia(destino)
+        if heuristica is None:
+            return self.dijkstra_ruas(origem, destino)
+        
+        ruas = self.compilar_ruas()
+        alvo = ruas.indice[destino]
+        area, _ = ruas.buscar([ruas.indice[origem]], alvo, heuristica=heuristica)
+        
+        if not area.alcancado(alvo):
+            return None, None
+        
+        return ruas.caminho(area.predecessores, alvo), area.distancias[alvo]
+    
+    def _alt_ruas(self, origem: int, destino: int) -> Tuple[Optional[List[int]], Optional[float]]:
+        """
+        A* no grafo de ruas com os limites inferiores dos marcos (ALT).
+        
+        As tabelas em float32 deixam os limites levemente inconsistentes, então
+        um nó pode ser reaberto se for alcançado depois por um caminho mais curto.
+        """
+        if self.marcos is None or self._grafo_marcos is not self._versao_ruas:
+            self.preparar_marcos()
+        
+        ruas = self.compilar_ruas()
+        offsets, vizinhos, comprimentos = ruas.offsets, ruas.destinos, ruas.comprimentos
+        inicio, alvo = ruas.indice[origem], ruas.indice[destino]
+        heuristica = self.marcos.heuristica(inicio, alvo)
+        
+        area = ruas.area()
+        geracao = area.nova_busca()
+        distancias, predecessores, marcas = area.distancias, area.predecessores, area.marcas
+        distancias[inicio] = 0.0
+        predecessores[inicio] = -1
+        marcas[inicio] = geracao
+        
+        # Fila de prioridade: (distancia + heuristica, distancia, no)
+        fila: List[Tuple[float, float, int]] = [(heuristica(inicio), 0.0, inicio)]
+        
+        while fila:
+            _, dist_atual, atual = heapq.heappop(fila)
+            
+            # Entrada desatualizada (o nó já foi alcançado por um caminho mais curto)
+            if dist_atual > distancias[atual]:
+                continue
+            
+            if atual == alvo:
+                break
+            
+            for i in range(offsets[atual], offsets[atual + 1]):
+                vizinho = vizinhos[i]
+                nova_distancia = dist_atual + comprimentos[i]
+                
+                if marcas[vizinho] != geracao or nova_distancia < distancias[vizinho]:
+                    marcas[vizinho] = geracao
+                    distancias[vizinho] = nova_distancia
+                    predecessores[vizinho] = atual
+                    heapq.heappush(fila, (nova_distancia + heuristica(vizinho), nova_distancia, vizinho))
+        
+        if not area.alcancado(alvo):
+            return None, None
+        
+        return ruas.caminho(predecessores, alvo), distancias[alvo]
+    
+    def dijkstra_multiplas_fontes(self, fontes: List[int],
+                                  reverso: bool = False) -> Tuple[Dict[int, float], Dict[int, int]]:
+        """
+        Calcula, com uma única busca, a distância por ruas de cada nó até a
+        fonte mais próxima e qual é essa fonte (partição de Voronoi das ruas).
+        
+        Args:
+            fontes: IDs dos nós das fontes (depósitos, hospitais...); nós que
+                não estão no grafo são ignorados
+            reverso: False mede da fonte até o nó (ruas de saída, ex.: entregas
+                a partir do depósito); True mede do nó até a fonte (ruas de
+                chegada, ex.: ir ao hospital mais próximo)
+                
+        Returns:
+            Tupla (distancias, fonte_mais_proxima): distância em metros e a
+            fonte de cada nó alcançado (nós não alcançados ficam de fora)
+        """
+        ruas = self.compilar_ruas()
+        if ruas is None:
+            return {}, {}
+        
+        fontes = [ruas.indice[no] for no in dict.fromkeys(fontes) if no in ruas.indice]
+        area, fechados = ruas.buscar(fontes, reverso=reverso)
+        distancias, predecessores = area.distancias, area.predecessores
+        
+        # O predecessor sai da fila antes do nó: seu rótulo já está definido
+        rotulos: Dict[int, int] = {}
+        for v in fechados:
+            anterior = predecessores[v]
+            rotulos[v] = v if anterior == -1 else rotulos[anterior]
         
-        return caminho, distancia_total
+        ids = ruas.ids
+        return {ids[v]: distancias[v] for v in fechados}, {ids[v]: ids[rotulos[v]] for v in fechados}
     
     def criar_mapa_folium(self, caminho: Optional[List[int]] = None) -> folium.Map:
         """
@@ -272,7 +1198,7 @@ class MapaReal:
         Returns:
             Mapa Folium
         """
-        if self.grafo_ruas is None:
+        if self._versao_ruas is None:
             # Mapa vazio centrado em Maricá
             mapa = folium.Map(location=[-22.9194, -42.8186], zoom_start=13)
             return mapa
@@ -289,15 +1215,12 @@ class MapaReal:
         
         # Desenha o caminho se fornecido, mostrando segmentos e pesos
         if caminho and len(caminho) > 1:
-            coordenadas_caminho = []
-            for i in range(len(caminho) - 1):
-                no_atual = caminho[i]
-                no_prox = caminho[i + 1]
-                lat1 = self.grafo_ruas.nodes[no_atual].get('y')
-                lon1 = self.grafo_ruas.nodes[no_atual].get('x')
-                lat2 = self.grafo_ruas.nodes[no_prox].get('y')
-                lon2 = self.grafo_ruas.nodes[no_prox].get('x')
-                if lat1 and lon1 and lat2 and lon2:
+            ruas = self.compilar_ruas()
+            indices = [ruas.indice[no] for no in caminho]
+            for no_atual, no_prox, u, v in zip(caminho, caminho[1:], indices, indices[1:]):
+                lat1, lon1 = float(ruas.lats[u]), float(ruas.lons[u])
+                lat2, lon2 = float(ruas.lats[v]), float(ruas.lons[v])
+                if np.isfinite([lat1, lon1, lat2, lon2]).all():
                     # Adiciona segmento
                     folium.PolyLine(
                         [[lat1, lon1], [lat2, lon2]],
@@ -306,11 +1229,7 @@ class MapaReal:
                         opacity=0.7
                     ).add_to(mapa)
                     # Obtém peso (distância)
-                    aresta_data = self.grafo_ruas.get_edge_data(no_atual, no_prox)
-                    peso = None
-                    if aresta_data:
-                        primeiro_edge = list(aresta_data.values())[0]
-                        peso = primeiro_edge.get('length', None)
+                    peso = ruas.comprimento(u, v)
                     # Adiciona popup no meio do segmento
                     latm = (lat1 + lat2) / 2
                     lonm = (lon1 + lon2) / 2
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Marcos (landmarks) para busca ALT: A*, marcos e desigualdade triangular
+Pré-calcula distâncias de/para alguns vértices escolhidos e as usa como
+limite inferior da distância até o destino, sem depender de coordenadas
+"""
+
+import heapq
+import random
+from array import array
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Estrutura CSR: (offsets, destinos, pesos)
+CSR = Tuple[Sequence[int], Sequence[int], Sequence[float]]
+
+# Distância gravada nas tabelas inteiras para vértices não alcançados
+INALCANCAVEL = 2 ** 31 - 1
+
+
+def _distancias_a_partir(origem: int, offsets: List[int], destinos: List[int],
+                         pesos: List[float]) -> Tuple[List[float], List[int], List[int]]:
+    """
+    Dijkstra completo a partir de origem sobre uma estrutura CSR em listas.
+    
+    Returns:
+        Tupla (distancias, predecessores, ordem): distâncias (inf se não
+        alcançado), predecessor na árvore de caminhos mínimos (-1 na raiz e nos
+        não alcançados) e vértices na ordem em que foram resolvidos
+    """
+    infinito = float('inf')
+    distancias = [infinito] * (len(offsets) - 1)
+    predecessores = [-1] * (len(offsets) - 1)
+    ordem: List[int] = []
+    
+    distancias[origem] = 0
+    fila: List[Tuple[float, int]] = [(0, origem)]
+    
+    while fila:
+        dist_atual, vertice = heapq.heappop(fila)
+        if dist_atual > distancias[vertice]:
+            continue
+        ordem.append(vertice)
+        
+        for i in range(offsets[vertice], offsets[vertice + 1]):
+            vizinho = destinos[i]
+            nova_distancia = dist_atual + pesos[i]
+            if nova_distancia < distancias[vizinho]:
+                distancias[vizinho] = nova_distancia
+                predecessores[vizinho] = vertice
+                heapq.heappush(fila, (nova_distancia, vizinho))
+    
+    return distancias, predecessores, ordem
+
+
+class MarcosALT:
+    """
+    Tabelas de distância de um conjunto de marcos para a busca ALT.
+    
+    Para um marco L e quaisquer v, t, a desigualdade triangular dá
+    d(v, t) >= d(L, t) - d(L, v) e d(v, t) >= d(v, L) - d(t, L). O maior desses
+    valores entre os marcos é um limite inferior consistente da distância até o
+    destino, usado como heurística do A*. A memória é de num_marcos x vértices
+    posições por tabela (uma tabela só, se o grafo for não direcionado).
+    """
+    
+    def __init__(self, marcos: List[int], tabelas_de: List[array], tabelas_ate: List[array], folga: float = 0.0):
+        """
+        Inicializa a partir das tabelas já calculadas.
+        
+        Args:
+            marcos: Vértices escolhidos como marcos
+            tabelas_de: tabelas_de[i][v] = d(marcos[i], v)
+            tabelas_ate: tabelas_ate[i][v] = d(v, marcos[i]); pode ser a mesma
+                lista de tabelas_de em grafos não direcionados
+            folga: Margem descontada dos limites para cobrir o arredondamento
+                das tabelas em float32 (0 para pesos inteiros)
+        """
+        self.marcos = marcos
+        self.tabelas_de = tabelas_de
+        self.tabelas_ate = tabelas_ate
+        self.folga = folga
+    
+    @property
+    def num_marcos(self) -> int:
+        """Número de marcos."""
+        return len(self.marcos)
+    
+    @property
+    def memoria_bytes(self) -> int:
+        """Memória ocupada pelas tabelas de distância."""
+        tabelas = list({id(t): t for t in self.tabelas_de + self.tabelas_ate}.values())
+        return sum(t.itemsize * len(t) for t in tabelas)
+    
+    # ============================================
+    # PRÉ-PROCESSAMENTO
+    # ============================================
+    @classmethod
+    def construir(cls, saida: CSR, entrada: Optional[CSR] = None, num_marcos: int = 8,
+                  estrategia: str = 'mais_distante', semente: Optional[int] = None) -> 'MarcosALT':
+        """
+        Escolhe os marcos e calcula suas tabelas de distância.
+        
+        Args:
+            saida: CSR das arestas de saída de cada vértice
+            entrada: CSR das arestas de chegada (grafo reverso); None se o grafo
+                for não direcionado (saida já contém os dois sentidos)
+            num_marcos: Quantidade de marcos (mais marcos = limites melhores e
+                mais memória)
+            estrategia: 'mais_distante' (cada marco é o vértice mais longe dos já
+                escolhidos) ou 'evitar' (marco na região da árvore de caminhos
+                mínimos que os marcos atuais cobrem pior)
+            semente: Semente para a escolha do vértice inicial
+        
+        Returns:
+            Nova instância de MarcosALT
+        """
+        if estrategia not in ('mais_distante', 'evitar'):
+            raise ValueError(f"Estratégia de escolha de marcos desconhecida: {estrategia}")
+        
+        saida_listas = tuple(list(x) for x in saida)
+        entrada_listas = tuple(list(x) for x in entrada) if entrada is not None else None
+        n = len(saida_listas[0]) - 1
+        num_marcos = min(num_marcos, n)
+        rng = random.Random(semente)
+        
+        marcos: List[int] = []
+        linhas_de: List[np.ndarray] = []
+        linhas_ate: List[np.ndarray] = []
+        # Distância (ida + volta) de cada vértice até o marco mais próximo
+        mais_proximo = np.full(n, np.inf)
+        
+        for _ in range(num_marcos):
+            if estrategia == 'evitar':
+                marco = cls._escolher_evitando(rng.randrange(n), saida_listas, marcos, linhas_de, linhas_ate)
+            elif marcos:
+                # Vértices em partes que nenhum marco alcança (inf) vêm primeiro
+                marco = int(np.argmax(mais_proximo))
+            else:
+                # O primeiro marco é o vértice mais distante de um vértice qualquer
+                distancias = np.array(_distancias_a_partir(rng.randrange(n), *saida_listas)[0])
+                distancias[np.isinf(distancias)] = -1
+                marco = int(np.argmax(distancias))
+            
+            if marco in marcos:
+                break
+            
+            marcos.append(marco)
+            linha_de = np.array(_distancias_a_partir(marco, *saida_listas)[0])
+            linha_ate = linha_de if entrada_listas is None else \
+                np.array(_distancias_a_partir(marco, *entrada_listas)[0])
+            linhas_de.append(linha_de)
+            linhas_ate.append(linha_ate)
+            mais_proximo = np.minimum(mais_proximo, linha_de + linha_ate)
+            mais_proximo[marcos] = -1
+        
+        return cls._compactar(marcos, linhas_de, linhas_ate, entrada_listas is None)
+    
+    @staticmethod
+    def _escolher_evitando(raiz: int, saida: Tuple[List[int], List[int], List[float]], marcos: List[int],
+                           linhas_de: List[np.ndarray], linhas_ate: List[np.ndarray]) -> int:
+        """
+        Heurística "avoid": na árvore de caminhos mínimos a partir de raiz, pesa
+        cada vértice pela diferença entre a distância real e o limite dado pelos
+        marcos atuais, soma os pesos por subárvore (zerando as que já contêm um
+        marco) e desce pelos filhos mais pesados até uma folha.
+        """
+        distancias, predecessores, ordem = _distancias_a_partir(raiz, *saida)
+        ordem_array = np.array(ordem, dtype=np.int64)
+        
+        limite = np.zeros(len(ordem))
+        with np.errstate(invalid='ignore'):
+            for linha_de, linha_ate in zip(linhas_de, linhas_ate):
+                for termo in (linha_de[ordem_array] - linha_de[raiz], linha_ate[raiz] - linha_ate[ordem_array]):
+                    # Termos com distâncias infinitas não dão limite útil
+                    limite = np.maximum(limite, np.where(np.isfinite(termo), termo, 0))
+        tamanho = dict(zip(ordem, (np.array(distancias)[ordem_array] - limite).tolist()))
+        
+        contem_marco = set(marcos)
+        filhos: dict = {}
+        for vertice in reversed(ordem):
+            pai = predecessores[vertice]
+            if pai == -1:
+                continue
+            filhos.setdefault(pai, []).append(vertice)
+            tamanho[pai] += tamanho[vertice]
+            if vertice in contem_marco:
+                contem_marco.add(pai)
+        for vertice in contem_marco:
+            if vertice in tamanho:
+                tamanho[vertice] = 0
+        
+        atual = max(tamanho, key=tamanho.get)
+        while atual in filhos:
+            atual = max(filhos[atual], key=tamanho.get)
+        return atual
+    
+    @classmethod
+    def _compactar(cls, marcos: List[int], linhas_de: List[np.ndarray], linhas_ate: List[np.ndarray],
+                   simetrico: bool) -> 'MarcosALT':
+        """Converte as distâncias em tabelas array('i') (pesos inteiros) ou array('f') (float32)."""
+        finitos = [linha[np.isfinite(linha)] for linha in linhas_de + linhas_ate]
+        maior = max((float(f.max()) for f in finitos if f.size), default=0.0)
+        inteiro = all(np.array_equal(f, np.floor(f)) for f in finitos) and maior < INALCANCAVEL
+        
+        def compactar(linha: np.ndarray) -> array:
+            if inteiro:
+                return array('i', np.where(np.isinf(linha), INALCANCAVEL, linha).astype(np.int32).tobytes())
+            return array('f', linha.astype(np.float32).tobytes())
+        
+        tabelas_de = [compactar(linha) for linha in linhas_de]
+        tabelas_ate = tabelas_de if simetrico else [compactar(linha) for linha in linhas_ate]
+        # Cada valor em float32 erra no máximo meio ulp; dois valores por limite
+        folga = 0.0 if inteiro else 2 * maior * float(np.finfo(np.float32).eps)
+        return cls(marcos, tabelas_de, tabelas_ate, folga)
+    
+    # ============================================
+    # CONSULTA
+    # ============================================
+    def heuristica(self, origem: int, destino: int, num_ativos: int = 4) -> Callable[[int], float]:
+        """
+        Monta a função de limite inferior da distância de cada vértice até destino.
+        
+        Só os num_ativos marcos que dão o melhor limite para o par
+        (origem, destino) são usados, o que mantém cada avaliação barata.
+        
+        Args:
+            origem: Vértice de partida da consulta
+            destino: Vértice de destino da consulta
+            num_ativos: Número de marcos consultados por avaliação
+        
+        Returns:
+            Função h(v) com h(v) <= d(v, destino)
+        """
+        termos = []
+        for tabela_de, tabela_ate in zip(self.tabelas_de, self.tabelas_ate):
+            de_destino, ate_destino = tabela_de[destino], tabela_ate[destino]
+            # Só vale o termo cujo valor no destino é conhecido (marco alcança/é alcançado)
+            if de_destino == INALCANCAVEL or de_destino == float('inf'):
+                de_destino = None
+            if ate_destino == INALCANCAVEL or ate_destino == float('inf'):
+                ate_destino = None
+            if de_destino is None and ate_destino is None:
+                continue
+            
+            limite = 0
+            if de_destino is not None and tabela_de[origem] < INALCANCAVEL:
+                limite = max(limite, de_destino - tabela_de[origem])
+            if ate_destino is not None:
+                limite = max(limite, tabela_ate[origem] - ate_destino)
+            termos.append((limite, tabela_de, de_destino, tabela_ate, ate_destino))
+        
+        termos.sort(key=lambda termo: termo[0], reverse=True)
+        ativos = [termo[1:] for termo in termos[:num_ativos]]
+        folga = self.folga
+        
+        def h(vertice: int) -> float:
+            melhor = 0
+            for tabela_de, de_destino, tabela_ate, ate_destino in ativos:
+                if de_destino is not None:
+                    limite = de_destino - tabela_de[vertice]
+                    if limite > melhor:
+                        melhor = limite
+                if ate_destino is not None:
+                    limite = tabela_ate[vertice] - ate_destino
+                    if limite > melhor:
+                        melhor = limite
+            return melhor - folga if melhor > folga else 0
+        
+        return h
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cálculo de distâncias entre todos os pares em vários processos
+Divide os vértices de origem entre os processos de um ProcessPoolExecutor;
+o grafo e a matriz de resultado ficam em memória compartilhada
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from dijkstra import Dijkstra, SEM_CAMINHO
+from grafo import Grafo, GrafoCSR
+
+# Estado de cada processo trabalhador (grafo anexado uma única vez, no início)
+_trabalhador: Dict = {}
+
+
+def _criar_compartilhado(dados: np.ndarray) -> shared_memory.SharedMemory:
+    """Copia um array para um novo bloco de memória compartilhada."""
+    bloco = shared_memory.SharedMemory(create=True, size=max(dados.nbytes, 1))
+    np.ndarray(dados.shape, dtype=dados.dtype, buffer=bloco.buf)[...] = dados
+    return bloco
+
+
+def _iniciar_trabalhador(num_vertices: int, nomes: Tuple[str, str, str, Optional[str]], num_arestas: int,
+                         fila: str) -> None:
+    """
+    Anexa os blocos compartilhados e monta o grafo do processo.
+    
+    O CSR é copiado para arrays locais (o laço do Dijkstra é mais rápido
+    com eles) e seus blocos são fechados logo em seguida; só o bloco da
+    matriz de resultado, se houver, fica anexado para ser escrito diretamente.
+    """
+    offsets, vizinhos, pesos = array('q'), array('i'), array('i')
+    blocos = [shared_memory.SharedMemory(name=nome) for nome in nomes[:3]]
+    try:
+        offsets.frombytes(blocos[0].buf[:(num_vertices + 1) * offsets.itemsize])
+        vizinhos.frombytes(blocos[1].buf[:num_arestas * vizinhos.itemsize])
+        pesos.frombytes(blocos[2].buf[:num_arestas * pesos.itemsize])
+    finally:
+        for bloco in blocos:
+            bloco.close()
+    
+    _trabalhador['dijkstra'] = Dijkstra(GrafoCSR(num_vertices, offsets, vizinhos, pesos), fila=fila)
+    _trabalhador['bloco_matriz'] = None
+    _trabalhador['matriz'] = None
+    if nomes[3] is not None:
+        bloco_matriz = shared_memory.SharedMemory(name=nomes[3])
+        _trabalhador['bloco_matriz'] = bloco_matriz
+        _trabalhador['matriz'] = np.ndarray((num_vertices, num_vertices), dtype=np.int32, buffer=bloco_matriz.buf)
+
+
+def _calcular_linhas(inicio: int, fim: int) -> None:
+    """Preenche as linhas inicio..fim-1 da matriz compartilhada."""
+    _trabalhador['matriz'][inicio:fim] = _trabalhador['dijkstra'].matriz_todos_pares(range(inicio, fim))
+
+
+def _calcular_resumos(inicio: int, fim: int) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+    """Calcula soma, quantidade de alcançáveis e excentricidade das origens inicio..fim-1."""
+    somas, contagens, maximas = _trabalhador['dijkstra'].resumo_distancias(range(inicio, fim))
+    return inicio, somas, contagens, maximas
+
+
+def _calcular_intermediacao(origens: List[int]) -> np.ndarray:
+    """Soma as dependências de Brandes a partir das origens dadas."""
+    return _trabalhador['dijkstra'].acumular_intermediacao(origens)
+
+
+def _executar(grafo: Union[Grafo, GrafoCSR], num_processos: Optional[int], tarefa: Callable,
+              argumentos: List[Tuple], com_matriz: bool = False,
+              fila: str = 'auto') -> Tuple[Optional[np.ndarray], List]:
+    """
+    Distribui as tarefas entre os processos e reúne os resultados, na ordem
+    dos argumentos; cada processo usa um Dijkstra com a fila dada.
+    """
+    csr = grafo.compilar()
+    n = csr.num_vertices
+    num_processos = num_processos or os.cpu_count() or 1
+    
+    blocos = [
+        _criar_compartilhado(np.frombuffer(csr.offsets, dtype=np.int64)),
+        _criar_compartilhado(np.frombuffer(csr.vizinhos, dtype=np.int32)),
+        _criar_compartilhado(np.frombuffer(csr.pesos, dtype=np.int32)),
+    ]
+    try:
+        if com_matriz:
+            blocos.append(shared_memory.SharedMemory(create=True, size=max(n * n * 4, 1)))
+            np.ndarray((n, n), dtype=np.int32, buffer=blocos[3].buf)[...] = SEM_CAMINHO
+        nomes = tuple(b.name for b in blocos[:3]) + (blocos[3].name if com_matriz else None,)
+        
+        with ProcessPoolExecutor(max_workers=num_processos, initializer=_iniciar_trabalhador,
+                                 initargs=(n, nomes, len(csr.vizinhos), fila)) as executor:
+            resultados = list(executor.map(tarefa, *zip(*argumentos))) if argumentos else []
+        
+        # Copia a matriz para memória comum antes de liberar o bloco compartilhado
+        matriz = np.ndarray((n, n), dtype=np.int32, buffer=blocos[3].buf).copy() if com_matriz else None
+        return matriz, resultados
+    finally:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+
+
+def _intervalos(n: int, tamanho_bloco: int) -> List[Tuple[int, int]]:
+    """Divide os vértices 0..n-1 em intervalos (inicio, fim) de até tamanho_bloco origens."""
+    return [(i, min(i + tamanho_bloco, n)) for i in range(0, n, tamanho_bloco)]
+
+
+def matriz_todos_pares_paralela(grafo: Union[Grafo, GrafoCSR], num_processos: Optional[int] = None,
+                                tamanho_bloco: int = 64, fila: str = 'auto') -> np.ndarray:
+    """
+    Calcula a matriz V x V de distâncias mínimas usando vários processos.
+    
+    Args:
+        grafo: Instância de Grafo ou GrafoCSR
+        num_processos: Número de processos (padrão: número de CPUs)
+        tamanho_bloco: Quantidade de origens por tarefa
+        fila: Fila de prioridade do Dijkstra de cada processo (ver Dijkstra)
+        
+    Returns:
+        Matriz int32 igual à de Dijkstra.matriz_todos_pares()
+    """
+    matriz, _ = _executar(grafo, num_processos, _calcular_linhas,
+                          _intervalos(grafo.num_vertices, tamanho_bloco), com_matriz=True, fila=fila)
+    return matriz
+
+
+def resumo_distancias_paralelo(grafo: Union[Grafo, GrafoCSR], num_processos: Optional[int] = None,
+                               tamanho_bloco: int = 64,
+                               fila: str = 'auto') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcula, para cada vértice, a soma das distâncias aos alcançáveis, quantos
+    são alcançáveis e a excentricidade, sem montar a matriz V x V.
+    
+    Args:
+        grafo: Instância de Grafo ou GrafoCSR
+        num_processos: Número de processos (padrão: número de CPUs)
+        tamanho_bloco: Quantidade de origens por tarefa
+        fila: Fila de prioridade do Dijkstra de cada processo (ver Dijkstra)
+        
+    Returns:
+        Tupla (somas, contagens, excentricidades), arrays indexados pelo vértice
+    """
+    n = grafo.num_vertices
+    somas = np.zeros(n, dtype=np.int64)
+    contagens = np.zeros(n, dtype=np.int64)
+    excentricidades = np.zeros(n, dtype=np.int64)
+    
+    _, resultados = _executar(grafo, num_processos, _calcular_resumos, _intervalos(n, tamanho_bloco), fila=fila)
+    for inicio, somas_bloco, contagens_bloco, maximas_bloco in resultados:
+        fim = inicio + len(somas_bloco)
+        somas[inicio:fim] = somas_bloco
+        contagens[inicio:fim] = contagens_bloco
+        excentricidades[inicio:fim] = maximas_bloco
+    
+    return somas, contagens, excentricidades
+
+
+def intermediacao_paralela(grafo: Union[Grafo, GrafoCSR], origens: Sequence[int],
+                           num_processos: Optional[int] = None, tamanho_bloco: int = 64,
+                           fila: str = 'auto') -> np.ndarray:
+    """
+    Soma as dependências de Brandes das origens dadas usando vários processos.
+    
+    Args:
+        grafo: Instância de Grafo ou GrafoCSR
+        origens: Vértices de partida
+        num_processos: Número de processos (padrão: número de CPUs)
+        tamanho_bloco: Quantidade de origens por tarefa
+        fila: Fila de prioridade do Dijkstra de cada processo (ver Dijkstra)
+        
+    Returns:
+        Array igual ao de Dijkstra.acumular_intermediacao(origens)
+    """
+    origens = list(origens)
+    blocos = [(origens[i:i + tamanho_bloco],) for i in range(0, len(origens), tamanho_bloco)]
+    _, resultados = _executar(grafo, num_processos, _calcular_intermediacao, blocos, fila=fila)
+    return np.sum(resultados, axis=0) if resultados else np.zeros(grafo.num_vertices)
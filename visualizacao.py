@@ -13,19 +13,19 @@ plt.rcParams['font.family'] = 'sans-serif'
 plt.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'Liberation Sans', 'Bitstream Vera Sans', 'sans-serif']
 plt.rcParams['axes.unicode_minus'] = False
 import networkx as nx
-from typing import List, Optional, Tuple
-from grafo import Grafo
+from typing import List, Optional, Tuple, Union
+from grafo import Grafo, GrafoCSR
 
 
 class VisualizadorGrafo:
     """Classe para visualizar grafos usando NetworkX e matplotlib."""
     
-    def __init__(self, grafo: Grafo):
+    def __init__(self, grafo: Union[Grafo, GrafoCSR]):
         """
         Inicializa o visualizador com um grafo.
         
         Args:
-            grafo: Instância da classe Grafo
+            grafo: Instância da classe Grafo (ou sua forma compilada GrafoCSR)
         """
         self.grafo = grafo
         self.nx_grafo = self._criar_nx_grafo()
@@ -37,9 +37,8 @@ class VisualizadorGrafo:
         # Adiciona vértices
         G.add_nodes_from(self.grafo.vertices)
         
-        # Adiciona arestas com pesos
-        for (v1, v2), peso in self.grafo.arestas.items():
-            G.add_edge(v1, v2, weight=peso)
+        # Adiciona arestas com pesos (a partir da forma compilada)
+        G.add_weighted_edges_from(self.grafo.compilar().iterar_arestas())
         
         return G
     
@@ -145,9 +144,7 @@ class VisualizadorGrafo:
         )
         
         # Labels dos pesos das arestas
-        edge_labels = {}
-        for (v1, v2), peso in self.grafo.arestas.items():
-            edge_labels[(v1, v2)] = str(peso)
+        edge_labels = {(v1, v2): str(peso) for v1, v2, peso in self.nx_grafo.edges(data='weight')}
         
         nx.draw_networkx_edge_labels(
             self.nx_grafo,
@@ -297,9 +294,7 @@ class VisualizadorGrafo:
         )
         
         # Labels dos pesos
-        edge_labels = {}
-        for (v1, v2), peso in self.grafo.arestas.items():
-            edge_labels[(v1, v2)] = str(peso)
+        edge_labels = {(v1, v2): str(peso) for v1, v2, peso in self.nx_grafo.edges(data='weight')}
         
         nx.draw_networkx_edge_labels(
             self.nx_grafo,